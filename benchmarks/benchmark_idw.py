@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark do interpolador IDW.
+
+Mede o tempo de `IDW.interpolar` para diferentes números de threads
+(`IDWConfig.n_jobs`) e reporta o speedup em relação à execução sequencial.
+
+Exemplos de uso:
+    python benchmarks/benchmark_idw.py
+    python benchmarks/benchmark_idw.py --grade 2000 --pontos 3000 --vizinhos 16
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from interpoladores.config import IDWConfig  # noqa: E402
+from interpoladores.idw import IDW  # noqa: E402
+
+
+def cronometrar(funcao, repeticoes=3):
+    """Retorna o menor tempo (em segundos) entre as repetições de `funcao`."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Benchmark do IDW")
+    parser.add_argument("--grade", type=int, default=1000, help="Células por lado da grade")
+    parser.add_argument("--pontos", type=int, default=2000, help="Número de pontos amostrais")
+    parser.add_argument("--vizinhos", type=int, default=12, help="n_neighbors (0 = todos)")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Repetições por medição")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    pontos = rng.random((args.pontos, 2)) * 1000
+    valores = rng.random(args.pontos)
+    eixo = np.linspace(0, 1000, args.grade)
+    grid_x, grid_y = np.meshgrid(eixo, eixo)
+
+    n_nucleos = os.cpu_count() or 1
+    n_jobs_lista = sorted({1, 2, 4, 8, 16, 32, n_nucleos} & set(range(1, n_nucleos + 1)))
+
+    print(
+        f"Grade {args.grade}x{args.grade}, {args.pontos} pontos, "
+        f"vizinhos={args.vizinhos or 'todos'}, {n_nucleos} núcleo(s)"
+    )
+    referencia = None
+    for n_jobs in n_jobs_lista:
+        config = IDWConfig(n_neighbors=args.vizinhos or None, n_jobs=n_jobs)
+        idw = IDW(config).ajustar(pontos, valores)
+        tempo = cronometrar(lambda: idw.prever(grid_x, grid_y), args.repeticoes)
+        referencia = referencia or tempo
+        print(f"  n_jobs={n_jobs:>2}: {tempo:8.3f} s  speedup {referencia / tempo:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -33,12 +33,40 @@ class IDWConfig:
                                        Se None, não há limite. Default é None.
         default_value (float, optional): Valor padrão para células sem vizinhos válidos.
                                         Se None, usa NaN. Default é None.
+        max_memory_mb (float, optional): Orçamento de memória (em MB) para os arrays
+                                        temporários da interpolação. Se definido, a grade
+                                        é processada em blocos dimensionados para caber no
+                                        orçamento, com resultado idêntico ao processamento
+                                        integral. Se None, processa a grade inteira de uma
+                                        vez. Default é None.
+        engine (str, optional): Estratégia de cálculo das distâncias.
+                               'kdtree' consulta os vizinhos em uma árvore KD (a busca
+                               é limitada ao raio se max_distance estiver definido);
+                               'brute' calcula as distâncias a todos os pontos em
+                               tiles vetorizados (exige n_neighbors None ou >= N);
+                               'radius' usa todos os pontos dentro de max_distance,
+                               buscando apenas os pares próximos (exige max_distance
+                               e n_neighbors None ou >= N);
+                               'auto' usa 'radius' ou 'brute' quando todos os pontos
+                               são vizinhos (com ou sem max_distance) e 'kdtree' caso
+                               contrário. Default é 'auto'.
+        tree_cache_size (int, optional): Número de árvores KD mantidas em um cache LRU
+                                        compartilhado, indexado pelas coordenadas dos
+                                        pontos. Se 0, não usa cache. Default é 0.
+        n_jobs (int, optional): Número de threads usadas na busca de vizinhos e no
+                               cálculo dos pesos, distribuindo blocos da grade entre
+                               elas. O resultado é idêntico ao sequencial. Se -1 (ou
+                               qualquer valor <= 0), usa todos os núcleos. Default é 1.
     """
 
     power: float = 2.0
     n_neighbors: Optional[int] = None
     max_distance: Optional[float] = None
     default_value: Optional[float] = None
+    max_memory_mb: Optional[float] = None
+    engine: str = "auto"
+    tree_cache_size: int = 0
+    n_jobs: int = 1
 
 
 @dataclass
@@ -70,6 +98,44 @@ class KrigagemConfig:
             Útil para depuração. Default é False.
         enable_statistics (bool, optional): Se True, calcula e retorna estatísticas de erro.
             Permite avaliar a incerteza da interpolação. Default é False.
+        n_neighbors (int, optional): Número máximo de vizinhos da vizinhança de busca.
+            Se definido (ou se max_distance for definido), cada célula resolve um sistema
+            local com os vizinhos mais próximos em vez de um sistema global com todos os
+            pontos. Se None, não há limite de vizinhos. Default é None.
+        max_distance (float, optional): Raio da vizinhança de busca. Pontos além desta
+            distância são ignorados; células sem vizinhos recebem NaN. Se None, não há
+            limite de distância. Default é None.
+        anisotropic_search (bool, optional): Se True, a vizinhança de busca é a elipse
+            alinhada a anisotropy_angle, com eixo menor max_distance / anisotropy_ratio.
+            Se False, a busca é circular. Default é False.
+        backend (str, optional): Backend de execução da Krigagem global no PyKrige:
+            'vectorized' (rápido, memória O(G x N)), 'loop' ou 'C' (memória menor, um
+            sistema por célula). 'auto' estima a memória a partir de N e do tamanho da
+            grade e escolhe o backend e a divisão da grade em blocos que cabem no
+            orçamento. Default é 'auto'.
+        max_memory_mb (float, optional): Orçamento de memória (em MB) da execução. A
+            grade é processada em blocos que cabem no orçamento (também na Krigagem
+            local). Se None, 'auto' usa 1024 MB e os demais backends processam a grade
+            inteira de uma vez. Default é None.
+        n_jobs (int, optional): Número de processos. Com n_jobs > 1, o variograma é
+            ajustado uma vez e faixas da grade são distribuídas entre os processos,
+            com resultado igual ao de um único processo até o arredondamento (não bit
+            a bit); o orçamento max_memory_mb é dividido entre eles. Se -1 (ou
+            qualquer valor <= 0), usa todos os núcleos. Default é 1.
+        engine (str, optional): Motor da Krigagem global. 'pykrige' usa o
+            `OrdinaryKriging.execute` do PyKrige (com o backend escolhido em backend);
+            'numpy' fatora por LU a matriz de Krigagem uma única vez e resolve os lados
+            direitos de blocos de células com a fatoração reaproveitada entre previsões;
+            'sparse' (apenas para o modelo 'spherical', de suporte compacto) monta a
+            matriz de covariância esparsa com os pares dentro do alcance e a fatora por
+            LU esparsa, em memória proporcional aos pares e não a N² (redes com
+            centenas de milhares de pontos); a variância exige uma resolução esparsa por
+            célula. Não se aplica à Krigagem com vizinhança de busca. Default é 'pykrige'.
+        saida (str, optional): Saídas da previsão: 'estimativa' (apenas a grade
+            interpolada), 'variancia' (apenas a variância de estimativa, por exemplo
+            para o desenho amostral) ou 'ambos'. A saída dispensada não é alocada e,
+            no motor NumPy e na Krigagem local, não é calculada (o PyKrige sempre
+            calcula ambas). Se None, segue enable_statistics. Default é None.
     """
 
     modelo_variograma: str = "spherical"
@@ -79,3 +145,11 @@ class KrigagemConfig:
     anisotropy_ratio: float = 1.0
     verbose: bool = False
     enable_statistics: bool = False
+    n_neighbors: Optional[int] = None
+    max_distance: Optional[float] = None
+    anisotropic_search: bool = False
+    backend: str = "auto"
+    max_memory_mb: Optional[float] = None
+    n_jobs: int = 1
+    engine: str = "pykrige"
+    saida: Optional[str] = None
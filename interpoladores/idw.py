@@ -10,6 +10,15 @@ Características principais:
 - Controle do número de vizinhos considerados
 - Definição de distância máxima de influência
 - Tratamento de casos extremos com valores padrão
+- Processamento em blocos com orçamento de memória configurável
+- Kernel exato de força bruta quando todos os pontos são vizinhos
+- Separação entre ajuste e previsão, com cache LRU de árvores KD
+- Processamento paralelo dos blocos da grade em várias threads
+- Busca de vizinhos limitada ao raio de `max_distance`
+- Interpolação de vários atributos com uma única busca de vizinhos
+- Exportação dos pesos como operador esparso reutilizável
+- Atualização incremental da superfície ao adicionar ou corrigir pontos
+- Grades regulares descritas por origem e resolução (`GradeRegular`), sem meshgrid
 
 Classes:
     - IDW: Classe responsável pela interpolação IDW.
@@ -17,17 +26,120 @@ Classes:
 Dependências:
     - numpy: Para operações numéricas eficientes
     - scipy.spatial.cKDTree: Para busca eficiente de vizinhos próximos
+    - scipy.sparse: Para o operador esparso de pesos
 """
 
+import hashlib
 import logging
-from typing import Optional
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Optional, Tuple
 
 import numpy as np  # noqa: F401
+from scipy import sparse
 from scipy.spatial import cKDTree  # noqa: F401
 
 from interpoladores.config import IDWConfig
+from interpoladores.operador import OperadorPesos
+from utils.grid_utils import Celulas, coordenadas_grade
 from utils.logging_utils import InterpoladorLogger
 
+# Engines de busca de vizinhos aceitos em IDWConfig.engine
+_ENGINES = ("auto", "kdtree", "brute", "radius")
+
+# Número aproximado de arrays temporários (de n_neighbors elementos de 8 bytes)
+# alocados por célula da grade durante o cálculo dos pesos.
+_ARRAYS_POR_VIZINHO = 8
+
+# Arrays de 8 bytes alocados por célula no kernel de força bruta (coordenadas,
+# numerador, denominador e máscaras), independente do número de pontos.
+_ARRAYS_POR_CELULA_GLOBAL = 6
+
+# Bytes por par (célula, ponto) no engine 'radius': registro (i, j, d) de 24
+# bytes mais índices de ordenação, pesos e produtos intermediários.
+_BYTES_POR_PAR = 64
+
+# Divisão da grade entre threads: blocos por thread (equilíbrio de carga) e
+# tamanho mínimo de bloco (para diluir o custo de despacho).
+_BLOCOS_POR_THREAD = 4
+_CELULAS_MINIMAS_POR_BLOCO = 1024
+
+# Lado (em células) dos tiles da grade usados para localizar as células
+# afetadas por pontos alterados na atualização incremental.
+_LADO_TILE_ATUALIZACAO = 16
+
+# Número de pares (célula, ponto) por tile do kernel de força bruta; cada array
+# temporário do tile ocupa 128 KB e cabe na cache L2.
+_ELEMENTOS_TILE = 16384
+
+
+class _CacheArvores:
+    """
+    Cache LRU de árvores KD indexado por um hash das coordenadas dos pontos.
+
+    Compartilhado entre instâncias de IDW, permite que interpolações repetidas
+    sobre a mesma rede de pontos não reconstruam a árvore.
+    """
+
+    def __init__(self):
+        self._arvores: "OrderedDict[bytes, cKDTree]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def chave(pontos: np.ndarray) -> bytes:
+        """
+        Calcula a chave do cache para um array de coordenadas.
+
+        Args:
+            pontos (np.ndarray): Array (N, 2) de coordenadas em float64 contíguo.
+
+        Returns:
+            bytes: Digest das coordenadas e do formato do array.
+        """
+        h = hashlib.blake2b(digest_size=20)
+        h.update(str(pontos.shape).encode())
+        h.update(pontos.tobytes())
+        return h.digest()
+
+    def obter(self, pontos: np.ndarray, capacidade: int) -> cKDTree:
+        """
+        Retorna a árvore KD dos pontos, construindo-a em caso de falta no cache.
+
+        Args:
+            pontos (np.ndarray): Array (N, 2) de coordenadas em float64 contíguo.
+            capacidade (int): Número máximo de árvores mantidas no cache.
+
+        Returns:
+            cKDTree: Árvore KD sobre os pontos.
+        """
+        chave = self.chave(pontos)
+        with self._lock:
+            tree = self._arvores.get(chave)
+            if tree is not None:
+                self._arvores.move_to_end(chave)
+                return tree
+
+        tree = cKDTree(pontos)
+        with self._lock:
+            self._arvores[chave] = tree
+            while len(self._arvores) > capacidade:
+                self._arvores.popitem(last=False)
+        return tree
+
+    def limpar(self) -> None:
+        """Remove todas as árvores do cache."""
+        with self._lock:
+            self._arvores.clear()
+
+    def __len__(self) -> int:
+        return len(self._arvores)
+
+
+_cache_arvores = _CacheArvores()
+
 
 class IDW:
     """
@@ -70,6 +182,11 @@ class IDW:
         >>> # Interpolação
         >>> idw = IDW(config)
         >>> z = idw.interpolar(pontos, valores, grid_x, grid_y)
+        >>>
+        >>> # Ajuste único e previsão em várias grades
+        >>> idw.ajustar(pontos, valores)
+        >>> z1 = idw.prever(grid_x, grid_y)
+        >>> z2 = idw.prever(grid_x[::2, ::2], grid_y[::2, ::2])
     """
 
     def __init__(
@@ -90,32 +207,45 @@ class IDW:
         """
         self.config = config
 
+        # Estado ajustado (ver `ajustar`)
+        self._pontos: Optional[np.ndarray] = None
+        self._valores: Optional[np.ndarray] = None
+        self._multiatributo = False
+        self._tree: Optional[cKDTree] = None
+
         # Configura o logger
         nivel_log = logging.DEBUG if verbose else logging.INFO
         self.logger = InterpoladorLogger(
             "IDW", nivel=nivel_log, arquivo_log=arquivo_log, console=verbose
         )
 
-    def interpolar(self, pontos, valores, grid_x, grid_y):
+    def interpolar(self, pontos, valores, grid_x, grid_y=None):
         """
         Realiza interpolação IDW sobre uma grade regular.
 
+        Equivale a `ajustar(pontos, valores)` seguido de `prever(grid_x, grid_y)`.
+
         O algoritmo:
         1. Valida as dimensões dos dados de entrada
-        2. Constrói uma árvore KD para busca eficiente de vizinhos
-        3. Para cada ponto da grade, encontra os vizinhos mais próximos
-        4. Aplica a distância máxima se configurada
-        5. Calcula os pesos baseados no inverso da distância elevada à potência
-        6. Calcula a média ponderada dos valores dos vizinhos
+        2. Constrói (ou reaproveita do cache) uma árvore KD para busca de vizinhos
+        3. Percorre a grade em blocos (limitados por `max_memory_mb`, se configurado)
+        4. Para cada ponto do bloco, encontra os vizinhos mais próximos
+        5. Aplica a distância máxima se configurada
+        6. Calcula os pesos baseados no inverso da distância elevada à potência
+        7. Calcula a média ponderada dos valores dos vizinhos e escreve na saída
 
         Args:
             pontos (np.ndarray): Array de shape (N, 2) com coordenadas XY dos pontos amostrados.
-            valores (np.ndarray): Array de shape (N,) com os valores correspondentes aos pontos.
-            grid_x (np.ndarray): Meshgrid com coordenadas X da grade.
-            grid_y (np.ndarray): Meshgrid com coordenadas Y da grade.
+            valores (np.ndarray): Array de shape (N,) com os valores correspondentes aos pontos,
+                ou (N, M) com M atributos medidos nos mesmos pontos.
+            grid_x (np.ndarray or GradeRegular): Meshgrid com coordenadas X da grade, ou
+                `GradeRegular` cujas coordenadas são geradas sob demanda por bloco.
+            grid_y (np.ndarray, optional): Meshgrid com coordenadas Y da grade (None se
+                `grid_x` for uma GradeRegular).
 
         Returns:
-            np.ndarray: Array 2D (mesmo shape de grid_x) com os valores interpolados.
+            np.ndarray: Array 2D (mesmo shape da grade) com os valores interpolados,
+                ou pilha (M, *shape) se `valores` tiver M atributos.
                 Se não houver vizinhos válidos para alguns pontos e default_value
                 não estiver configurado, esses pontos terão valor NaN.
 
@@ -125,136 +255,889 @@ class IDW:
             ValueError: Se as grades X e Y tiverem formatos diferentes.
             ValueError: Se não houver pontos válidos para interpolação.
         """
-        # Inicia o logging
-        self.logger.iniciar_interpolacao(f"Pontos: {pontos.shape[0]}, Grade: {grid_x.shape}")
+        return self.ajustar(pontos, valores).prever(grid_x, grid_y)
+
+    def ajustar(self, pontos, valores=None) -> "IDW":
+        """
+        Valida e armazena os pontos amostrados para interpolações posteriores.
+
+        A árvore KD é construída sob demanda na primeira chamada de `prever` que
+        precisar dela e mantida na instância. Com `IDWConfig.tree_cache_size` > 0,
+        árvores de geometrias já vistas são reaproveitadas de um cache LRU
+        compartilhado, indexado por um hash das coordenadas.
 
+        Vários atributos medidos nos mesmos pontos (carga hidráulica, temperatura,
+        campanhas de monitoramento) podem ser passados como colunas de `valores`:
+        a busca de vizinhos e os pesos são calculados uma única vez e aplicados a
+        todos os atributos em uma só contração.
+
+        Args:
+            pontos (np.ndarray): Array de shape (N, 2) com coordenadas XY dos pontos amostrados.
+            valores (np.ndarray, optional): Array de shape (N,) com os valores correspondentes
+                aos pontos, ou (N, M) com M atributos por ponto. Se None, apenas a geometria
+                é ajustada (suficiente para `operador_pesos`). Default é None.
+
+        Returns:
+            IDW: A própria instância, para encadeamento com `prever`.
+
+        Raises:
+            ValueError: Se o número de pontos não for compatível com os valores.
+            ValueError: Se os pontos não tiverem formato (N, 2).
+            ValueError: Se os valores não tiverem formato (N,) ou (N, M).
+            ValueError: Se o engine configurado for inválido.
+        """
         try:
+            pontos = np.asarray(pontos)
+            sem_valores = valores is None
+            valores = np.zeros(len(pontos)) if sem_valores else np.asarray(valores)
+
             # Validação de entrada
             if pontos.shape[0] != valores.shape[0]:
                 raise ValueError(
                     f"Número de pontos ({pontos.shape[0]}) não corresponde ao número de valores ({valores.shape[0]})"
                 )
 
-            if pontos.shape[1] != 2:
+            if pontos.ndim != 2 or pontos.shape[1] != 2:
                 raise ValueError(f"Pontos devem ter formato (N, 2), mas têm formato {pontos.shape}")
 
-            if grid_x.shape != grid_y.shape:
+            if valores.ndim not in (1, 2):
                 raise ValueError(
-                    f"Grades X e Y devem ter o mesmo formato, mas têm formatos {grid_x.shape} e {grid_y.shape}"
+                    f"Valores devem ter formato (N,) ou (N, M), mas têm formato {valores.shape}"
                 )
 
+            if self.config.engine not in _ENGINES:
+                raise ValueError(
+                    f"Engine '{self.config.engine}' inválido. Opções: {', '.join(_ENGINES)}"
+                )
+
+            self._pontos = np.ascontiguousarray(pontos, dtype=float)
+            self._tree = None
+            self._multiatributo = valores.ndim == 2
+            self._valores = None
+            if not sem_valores:
+                self._valores = np.asarray(valores, dtype=float).reshape(len(pontos), -1)
+            return self
+
+        except Exception as e:
+            self.logger.registrar_erro(e)
+            raise
+
+    def prever(self, grid_x, grid_y=None):
+        """
+        Interpola os pontos ajustados sobre uma grade regular.
+
+        Args:
+            grid_x (np.ndarray or GradeRegular): Meshgrid com coordenadas X da grade, ou
+                `GradeRegular` cujas coordenadas são geradas sob demanda por bloco.
+            grid_y (np.ndarray, optional): Meshgrid com coordenadas Y da grade (None se
+                `grid_x` for uma GradeRegular).
+
+        Returns:
+            np.ndarray: Array 2D (mesmo shape da grade) com os valores interpolados,
+                ou pilha (M, *shape) se foram ajustados M atributos.
+                Se não houver vizinhos válidos para alguns pontos e default_value
+                não estiver configurado, esses pontos terão valor NaN.
+
+        Raises:
+            RuntimeError: Se `ajustar` não tiver sido chamado antes.
+            ValueError: Se as grades X e Y tiverem formatos diferentes.
+            ValueError: Se não houver pontos válidos para interpolação.
+        """
+        if self._valores is None:
+            raise RuntimeError("IDW não ajustado: chame ajustar() com valores antes de prever()")
+
+        # Inicia o logging
+        self.logger.iniciar_interpolacao(
+            f"Pontos: {self._pontos.shape[0]}, Grade: {np.shape(grid_x)}"
+        )
+
+        try:
+            shape, coordenadas = coordenadas_grade(grid_x, grid_y)
+            n_celulas = int(np.prod(shape))
+
             self.logger.registrar_progresso(10, "Validação concluída")
 
-            # Construção da árvore KD para busca eficiente de vizinhos
-            tree = cKDTree(pontos)
-            xi = np.column_stack((grid_x.ravel(), grid_y.ravel()))
+            nucleo, bytes_por_celula = self._preparar_nucleo()
 
-            self.logger.registrar_progresso(20, "Árvore KD construída")
+            z_interp, n_validos = self._executar_blocos(
+                nucleo, coordenadas, n_celulas, bytes_por_celula
+            )
 
-            # Busca de vizinhos
-            if self.config.n_neighbors:
-                # Limita ao número de vizinhos especificado
-                n_neighbors = min(self.config.n_neighbors, len(pontos))
+            self.logger.registrar_progresso(
+                80, f"Pesos calculados com expoente {self.config.power}"
+            )
+
+            n_invalidos = n_celulas - n_validos
+            if n_invalidos:
                 self.logger.registrar_progresso(
-                    30, f"Buscando {n_neighbors} vizinhos para cada ponto da grade"
+                    85, f"{n_invalidos} pontos da grade sem vizinhos válidos"
                 )
-                dist, idx = tree.query(xi, k=n_neighbors)
+                if n_validos == 0:
+                    raise ValueError(
+                        "Nenhum ponto tem vizinhos dentro da distância máxima configurada"
+                    )
+
+            if self._multiatributo:
+                result = z_interp.reshape((-1,) + shape)
             else:
-                # Usa todos os pontos disponíveis
-                self.logger.registrar_progresso(
-                    30,
-                    f"Buscando todos os {len(pontos)} pontos para cada ponto da grade",
-                )
-                dist, idx = tree.query(xi, k=len(pontos))
+                result = z_interp.reshape(shape)
 
-            self.logger.registrar_progresso(50, "Busca de vizinhos concluída")
+            self.logger.registrar_progresso(100, "Interpolação concluída")
 
-            # Aplicação da distância máxima, se configurada
-            if self.config.max_distance:
-                self.logger.registrar_progresso(
-                    60, f"Aplicando distância máxima: {self.config.max_distance}"
+            if n_invalidos:
+                self.logger.concluir_interpolacao(
+                    f"Grade interpolada: {result.shape}, "
+                    f"Valores NaN: {np.sum(np.isnan(result))}"
                 )
-                dist = np.where(dist > self.config.max_distance, np.inf, dist)
-
-                # Verifica se há pontos sem vizinhos válidos
-                no_valid_neighbors = np.all(np.isinf(dist), axis=1)
-                if np.any(no_valid_neighbors):
-                    n_invalid = np.sum(no_valid_neighbors)
-                    self.logger.registrar_progresso(
-                        70, f"{n_invalid} pontos da grade sem vizinhos válidos"
-                    )
+            else:
+                self.logger.concluir_interpolacao(f"Grade interpolada: {result.shape}")
+            return result
 
-                    if (
-                        hasattr(self.config, "default_value")
-                        and self.config.default_value is not None
-                    ):
-                        # Se um valor padrão foi configurado, usa-o para pontos sem vizinhos
-                        z_interp = np.full(xi.shape[0], self.config.default_value, dtype=float)
-                        self.logger.registrar_progresso(
-                            75,
-                            f"Usando valor padrão {self.config.default_value} para pontos sem vizinhos",
-                        )
-                    else:
-                        # Caso contrário, usa NaN para pontos sem vizinhos
-                        z_interp = np.full(xi.shape[0], np.nan, dtype=float)
-                        self.logger.registrar_progresso(75, "Usando NaN para pontos sem vizinhos")
-
-                    # Processa apenas pontos com vizinhos válidos
-                    has_valid_neighbors = ~no_valid_neighbors
-                    if not np.any(has_valid_neighbors):
-                        raise ValueError(
-                            "Nenhum ponto tem vizinhos dentro da distância máxima configurada"
-                        )
-
-                    # Continua o processamento apenas para pontos com vizinhos válidos
-                    xi_valid = xi[has_valid_neighbors]
-                    dist_valid = dist[has_valid_neighbors]
-                    idx_valid = idx[has_valid_neighbors]
-
-                    # Recalcula para pontos válidos
-                    dist = dist_valid
-                    idx = idx_valid
-
-                    # Evita divisão por zero substituindo zeros por valor muito pequeno
-                    dist = np.where(dist == 0, 1e-10, dist)
-
-                    # Calcula pesos e interpolação
-                    self.logger.registrar_progresso(
-                        80, f"Calculando pesos com expoente {self.config.power}"
-                    )
-                    weights = 1.0 / dist**self.config.power
-                    weights /= weights.sum(axis=1, keepdims=True)
+        except Exception as e:
+            self.logger.registrar_erro(e)
+            raise
 
-                    z_valid = np.sum(weights * valores[idx], axis=1)
-                    z_interp[has_valid_neighbors] = z_valid
+    def _preparar_nucleo(self) -> Tuple[Callable[[np.ndarray, np.ndarray], int], int]:
+        """
+        Escolhe o kernel de interpolação por bloco conforme a configuração.
 
-                    self.logger.registrar_progresso(90, "Interpolação concluída")
-                    result = z_interp.reshape(grid_x.shape)
+        Returns:
+            Tuple[Callable, int]:
+                - nucleo: Função `nucleo(xi, saida)` que interpola um bloco de células
+                  e retorna o número de células com vizinhos válidos.
+                - bytes_por_celula: Memória temporária estimada por célula do bloco.
 
-                    self.logger.concluir_interpolacao(
-                        f"Grade interpolada: {result.shape}, "
-                        f"Valores NaN: {np.sum(np.isnan(result))}"
-                    )
-                    return result
+        Raises:
+            ValueError: Se o engine 'brute' for combinado com n_neighbors < N.
+        """
+        pontos = self._pontos
+        valores = self._valores
+        n_atributos = valores.shape[1]
+
+        # Número de vizinhos (todos os pontos se n_neighbors não configurado)
+        if self.config.n_neighbors:
+            n_neighbors = min(self.config.n_neighbors, len(pontos))
+        else:
+            n_neighbors = len(pontos)
 
-            # Evita divisão por zero substituindo zeros por valor muito pequeno
-            dist = np.where(dist == 0, 1e-10, dist)
+        engine = self.config.engine
+        todos = n_neighbors == len(pontos)
+        if engine == "auto":
+            # Com todos os pontos como vizinhos, evita a travessia da árvore e a
+            # ordenação das listas de vizinhos; com raio, busca apenas pares próximos
+            if todos and self.config.max_distance:
+                engine = "radius"
+            elif todos:
+                engine = "brute"
+            else:
+                engine = "kdtree"
+
+        if engine in ("brute", "radius") and not todos:
+            raise ValueError(
+                f"Engine '{engine}' considera todos os pontos e não é compatível "
+                f"com n_neighbors={self.config.n_neighbors}"
+            )
+        if engine == "radius" and not self.config.max_distance:
+            raise ValueError("Engine 'radius' requer max_distance configurado")
 
-            # Calcula pesos e interpolação
+        if engine == "brute":
             self.logger.registrar_progresso(
-                80, f"Calculando pesos com expoente {self.config.power}"
+                30,
+                f"Calculando distâncias a todos os {len(pontos)} pontos por força bruta",
             )
-            weights = 1.0 / dist**self.config.power
-            weights /= weights.sum(axis=1, keepdims=True)
+            nucleo = partial(self._interpolar_bloco_global, pontos, valores)
+            return nucleo, 8 * (_ARRAYS_POR_CELULA_GLOBAL + 2 * n_atributos)
 
-            z_interp = np.sum(weights * valores[idx], axis=1)
-            result = z_interp.reshape(grid_x.shape)
+        tree = self._arvore()
+        self.logger.registrar_progresso(20, "Árvore KD disponível")
 
-            self.logger.registrar_progresso(100, "Interpolação concluída")
+        if engine == "radius":
+            self.logger.registrar_progresso(
+                30, f"Buscando pares dentro do raio {self.config.max_distance}"
+            )
+            nucleo = partial(self._interpolar_bloco_raio, tree, valores)
+            return nucleo, self._pares_por_celula() * (_BYTES_POR_PAR + 8 * n_atributos)
 
-            self.logger.concluir_interpolacao(f"Grade interpolada: {result.shape}")
-            return result
+        self.logger.registrar_progresso(
+            30, f"Buscando {n_neighbors} vizinhos para cada ponto da grade"
+        )
+        if self.config.max_distance:
+            # Índice N (vizinho ausente na busca limitada) aponta para este valor
+            valores = np.vstack((valores, np.zeros((1, n_atributos))))
+        nucleo = partial(self._interpolar_bloco, tree, valores, n_neighbors)
+        return nucleo, n_neighbors * 8 * (_ARRAYS_POR_VIZINHO + n_atributos)
+
+    def _pares_por_celula(self) -> int:
+        """
+        Estima o número médio de pontos dentro de `max_distance` de cada célula.
+
+        Usa a densidade média dos pontos no seu retângulo envolvente; serve apenas
+        para dimensionar os blocos do engine 'radius'.
+
+        Returns:
+            int: Estimativa entre 1 e N.
+        """
+        pontos = self._pontos
+        extensao = np.ptp(pontos, axis=0) + 2 * self.config.max_distance
+        area_raio = np.pi * self.config.max_distance**2
+        estimativa = len(pontos) * area_raio / float(np.prod(extensao))
+        return int(min(len(pontos), max(1, np.ceil(estimativa))))
+
+    def _arvore(self) -> cKDTree:
+        """
+        Retorna a árvore KD dos pontos ajustados, construindo-a se necessário.
+
+        Returns:
+            cKDTree: Árvore KD sobre os pontos ajustados.
+        """
+        if self._tree is None:
+            if self.config.tree_cache_size > 0:
+                self._tree = _cache_arvores.obter(self._pontos, self.config.tree_cache_size)
+            else:
+                self._tree = cKDTree(self._pontos)
+        return self._tree
+
+    def atualizar(
+        self,
+        z_anterior: np.ndarray,
+        grid_x,
+        grid_y=None,
+        novos_pontos: Optional[np.ndarray] = None,
+        novos_valores: Optional[np.ndarray] = None,
+        indices: Optional[np.ndarray] = None,
+        valores_corrigidos: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Atualiza uma superfície após adicionar pontos ou corrigir valores.
+
+        Com `n_neighbors` ou `max_distance` configurados, apenas as células ao alcance
+        dos pontos alterados podem mudar: uma célula g é afetada por um ponto p somente
+        se d(g, p) <= min(max_distance, d_k(g)), onde d_k é a distância ao k-ésimo
+        vizinho. A grade é dividida em tiles e, como d_k varia no máximo uma unidade
+        por unidade de deslocamento, o teste no centro de cada tile (com margem do
+        raio do tile) seleciona um superconjunto das células afetadas. Só essas
+        células são recalculadas, com o mesmo kernel de `prever`; o resultado é o de
+        um recálculo integral. O estado ajustado passa a incluir as alterações.
+
+        Args:
+            z_anterior (np.ndarray): Superfície calculada por `prever` com os pontos e a
+                configuração atuais, sobre a mesma grade.
+            grid_x (np.ndarray or GradeRegular): Meshgrid com coordenadas X da grade, ou
+                `GradeRegular` cujas coordenadas são geradas sob demanda por bloco.
+            grid_y (np.ndarray, optional): Meshgrid com coordenadas Y da grade (None se
+                `grid_x` for uma GradeRegular).
+            novos_pontos (np.ndarray, optional): Array (K, 2) com pontos a adicionar.
+            novos_valores (np.ndarray, optional): Valores (K,) ou (K, M) dos novos pontos.
+            indices (np.ndarray, optional): Índices dos pontos com valores corrigidos.
+            valores_corrigidos (np.ndarray, optional): Novos valores desses pontos.
+
+        Returns:
+            np.ndarray: Superfície atualizada, com o mesmo formato de `z_anterior`.
+
+        Raises:
+            RuntimeError: Se `ajustar` não tiver sido chamado com valores antes.
+            ValueError: Se as grades, a superfície ou as alterações tiverem formatos
+                incompatíveis.
+
+        Example:
+            >>> z = idw.ajustar(pontos, valores).prever(grid_x, grid_y)
+            >>> z = idw.atualizar(z, grid_x, grid_y, novos_pontos=[[12.0, 30.5]],
+            ...                   novos_valores=[104.2])
+        """
+        if self._valores is None:
+            raise RuntimeError("IDW não ajustado: chame ajustar() com valores antes de atualizar()")
+
+        self.logger.iniciar_interpolacao(
+            f"Atualização incremental - Pontos: {self._pontos.shape[0]}, "
+            f"Grade: {np.shape(grid_x)}"
+        )
+
+        try:
+            shape, coordenadas = coordenadas_grade(grid_x, grid_y)
+            n_atributos = self._valores.shape[1]
+            shape_saida = ((n_atributos,) if self._multiatributo else ()) + shape
+            z_anterior = np.asarray(z_anterior, dtype=float)
+            if z_anterior.shape != shape_saida:
+                raise ValueError(
+                    f"Superfície anterior deve ter formato {shape_saida}, "
+                    f"mas tem formato {z_anterior.shape}"
+                )
+
+            novos_pontos, novos_valores, indices, valores_corrigidos = self._validar_alteracoes(
+                novos_pontos, novos_valores, indices, valores_corrigidos
+            )
+            alterados = np.vstack((novos_pontos, self._pontos[indices]))
+            z = z_anterior.reshape(n_atributos, -1).copy()
+            if len(alterados) == 0:
+                self.logger.concluir_interpolacao("Nenhuma alteração")
+                return z.reshape(shape_saida)
+
+            # Células afetadas, avaliadas com os pontos anteriores às alterações
+            afetadas = self._celulas_afetadas(shape, coordenadas, alterados)
+            self.logger.registrar_progresso(
+                30, f"{int(afetadas.sum())} de {afetadas.size} células a recalcular"
+            )
+
+            valores = self._valores.copy()
+            valores[indices] = valores_corrigidos
+            if len(novos_pontos):
+                self._pontos = np.ascontiguousarray(np.vstack((self._pontos, novos_pontos)))
+                self._tree = None
+            self._valores = np.vstack((valores, novos_valores))
+
+            if np.any(afetadas):
+                xi = coordenadas(afetadas)
+                nucleo, bytes_por_celula = self._preparar_nucleo()
+                z[:, afetadas], _ = self._executar_blocos(
+                    nucleo, xi.__getitem__, len(xi), bytes_por_celula
+                )
+
+            self.logger.registrar_progresso(100, "Atualização concluída")
+            self.logger.concluir_interpolacao(f"Grade atualizada: {shape_saida}")
+            return z.reshape(shape_saida)
+
+        except Exception as e:
+            self.logger.registrar_erro(e)
+            raise
+
+    def _validar_alteracoes(
+        self,
+        novos_pontos: Optional[np.ndarray],
+        novos_valores: Optional[np.ndarray],
+        indices: Optional[np.ndarray],
+        valores_corrigidos: Optional[np.ndarray],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Normaliza e valida os pontos adicionados e os valores corrigidos.
+
+        Args:
+            novos_pontos (np.ndarray, optional): Pontos a adicionar.
+            novos_valores (np.ndarray, optional): Valores dos novos pontos.
+            indices (np.ndarray, optional): Índices dos pontos corrigidos.
+            valores_corrigidos (np.ndarray, optional): Novos valores desses pontos.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Novos pontos (K, 2),
+                novos valores (K, M), índices (C,) e valores corrigidos (C, M).
+
+        Raises:
+            ValueError: Se os formatos forem incompatíveis ou os índices inválidos.
+        """
+        n_pontos, n_atributos = self._valores.shape
+
+        novos_pontos = np.zeros((0, 2)) if novos_pontos is None else np.asarray(novos_pontos)
+        novos_pontos = novos_pontos.astype(float).reshape(-1, 2)
+        novos_valores = np.zeros(0) if novos_valores is None else np.asarray(novos_valores)
+        indices = np.zeros(0, dtype=int) if indices is None else np.asarray(indices)
+        indices = indices.astype(int).ravel()
+        valores_corrigidos = (
+            np.zeros(0) if valores_corrigidos is None else np.asarray(valores_corrigidos)
+        )
+
+        if novos_valores.size != len(novos_pontos) * n_atributos:
+            raise ValueError(
+                f"Número de novos pontos ({len(novos_pontos)}) não corresponde ao número "
+                f"de novos valores ({novos_valores.shape})"
+            )
+        if valores_corrigidos.size != len(indices) * n_atributos:
+            raise ValueError(
+                f"Número de índices ({len(indices)}) não corresponde ao número "
+                f"de valores corrigidos ({valores_corrigidos.shape})"
+            )
+        if np.any((indices < 0) | (indices >= n_pontos)):
+            raise ValueError(f"Índices devem estar entre 0 e {n_pontos - 1}")
+
+        return (
+            novos_pontos,
+            novos_valores.astype(float).reshape(-1, n_atributos),
+            indices,
+            valores_corrigidos.astype(float).reshape(-1, n_atributos),
+        )
+
+    def _celulas_afetadas(
+        self,
+        shape: Tuple[int, ...],
+        coordenadas: Callable[[Celulas], np.ndarray],
+        alterados: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Seleciona as células que podem mudar quando os pontos `alterados` mudam.
+
+        Args:
+            shape (Tuple[int, ...]): Formato da grade.
+            coordenadas (Callable): Gerador de coordenadas retornado por `coordenadas_grade`.
+            alterados (np.ndarray): Array (K, 2) com os pontos adicionados ou corrigidos.
+
+        Returns:
+            np.ndarray: Máscara booleana (G,) das células a recalcular (superconjunto
+                das células afetadas).
+        """
+        # Tiles de lado T no plano (linhas, colunas) da grade, percorrido em faixas
+        # de T linhas; o preenchimento replica a borda e não altera os retângulos
+        # envolventes
+        lado = _LADO_TILE_ATUALIZACAO
+        colunas = shape[-1] if len(shape) >= 2 else int(np.prod(shape))
+        linhas = int(np.prod(shape)) // max(colunas, 1)
+        n_ty, n_tx = -(-linhas // lado), -(-colunas // lado)
+
+        minimos = np.empty((n_ty, n_tx, 2))
+        maximos = np.empty((n_ty, n_tx, 2))
+        for ty in range(n_ty):
+            faixa = coordenadas(slice(ty * lado * colunas, min((ty + 1) * lado, linhas) * colunas))
+            faixa = np.pad(
+                faixa.reshape(-1, colunas, 2), ((0, 0), (0, n_tx * lado - colunas), (0, 0)), "edge"
+            ).reshape(-1, n_tx, lado, 2)
+            minimos[ty] = faixa.min(axis=(0, 2))
+            maximos[ty] = faixa.max(axis=(0, 2))
+        xmin, ymin = minimos.reshape(-1, 2).T
+        xmax, ymax = maximos.reshape(-1, 2).T
+        centros = np.column_stack(((xmin + xmax) / 2, (ymin + ymax) / 2))
+        raio_tile = 0.5 * np.hypot(xmax - xmin, ymax - ymin)
+
+        # Alcance de influência no centro do tile, com margem para todo o tile
+        alcance = np.full(len(centros), np.inf)
+        if self.config.max_distance:
+            alcance = self.config.max_distance + raio_tile
+        if self.config.n_neighbors:
+            d_k = self._arvore().query(centros, k=[self.config.n_neighbors])[0][:, 0]
+            alcance = np.minimum(alcance, d_k + 2 * raio_tile)
+
+        distancia, _ = cKDTree(alterados).query(centros)
+        tiles = distancia <= alcance * (1 + 1e-9)
+        tiles = tiles.reshape(n_ty, n_tx).repeat(lado, axis=0).repeat(lado, axis=1)
+        return tiles[:linhas, :colunas].ravel()
+
+    def operador_pesos(self, grid_x, grid_y=None) -> OperadorPesos:
+        """
+        Exporta os pesos IDW da grade como um operador esparso (CSR).
+
+        Para uma rede de pontos e uma grade fixas, os pesos não dependem dos valores
+        medidos; o operador retornado interpola novos valores (ou pilhas de valores)
+        com um único produto matriz-vetor e pode ser salvo em disco.
+
+        Args:
+            grid_x (np.ndarray or GradeRegular): Meshgrid com coordenadas X da grade, ou
+                `GradeRegular` cujas coordenadas são geradas sob demanda por bloco.
+            grid_y (np.ndarray, optional): Meshgrid com coordenadas Y da grade (None se
+                `grid_x` for uma GradeRegular).
+
+        Returns:
+            OperadorPesos: Operador (G, N) com os pesos normalizados de cada célula.
+
+        Raises:
+            RuntimeError: Se `ajustar` não tiver sido chamado antes.
+            ValueError: Se as grades X e Y tiverem formatos diferentes.
+            ValueError: Se não houver pontos válidos para interpolação.
+
+        Example:
+            >>> idw = IDW(IDWConfig(n_neighbors=8)).ajustar(pontos)
+            >>> operador = idw.operador_pesos(grid_x, grid_y)
+            >>> z = operador.aplicar(valores)
+        """
+        if self._pontos is None:
+            raise RuntimeError("IDW não ajustado: chame ajustar() antes de operador_pesos()")
+
+        self.logger.iniciar_interpolacao(
+            f"Operador de pesos - Pontos: {self._pontos.shape[0]}, Grade: {np.shape(grid_x)}"
+        )
+
+        try:
+            shape, coordenadas = coordenadas_grade(grid_x, grid_y)
+            n_celulas = int(np.prod(shape))
+            n_pontos = self._pontos.shape[0]
+            if self.config.n_neighbors:
+                n_neighbors = min(self.config.n_neighbors, n_pontos)
+            else:
+                n_neighbors = n_pontos
+
+            # Blocos limitados pelo orçamento de memória (índices, distâncias e pesos)
+            if n_neighbors == n_pontos and self.config.max_distance:
+                bytes_por_celula = self._pares_por_celula() * _BYTES_POR_PAR
+            else:
+                bytes_por_celula = n_neighbors * 8 * _ARRAYS_POR_VIZINHO
+            tamanho_bloco = self._tamanho_bloco(bytes_por_celula, n_celulas)
+
+            contagens, indices, pesos = [], [], []
+            for inicio in range(0, n_celulas, tamanho_bloco):
+                fim = min(inicio + tamanho_bloco, n_celulas)
+                contagem, indice, peso = self._pesos_bloco(
+                    coordenadas(slice(inicio, fim)), n_neighbors
+                )
+                contagens.append(contagem)
+                indices.append(indice)
+                pesos.append(peso)
+
+            contagens = np.concatenate(contagens)
+            indptr = np.concatenate(([0], np.cumsum(contagens)))
+            matriz = sparse.csr_matrix(
+                (np.concatenate(pesos), np.concatenate(indices), indptr),
+                shape=(n_celulas, n_pontos),
+            )
+
+            validos = contagens > 0
+            if not np.any(validos):
+                raise ValueError("Nenhum ponto tem vizinhos dentro da distância máxima configurada")
+
+            self.logger.concluir_interpolacao(
+                f"Operador ({n_celulas}, {n_pontos}) com {matriz.nnz} pesos não nulos"
+            )
+            return OperadorPesos(matriz, shape, validos, self.config.default_value)
 
         except Exception as e:
             self.logger.registrar_erro(e)
             raise
+
+    def _pesos_bloco(
+        self, xi: np.ndarray, n_neighbors: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calcula os pesos normalizados de um bloco de células, linha a linha.
+
+        Args:
+            xi (np.ndarray): Array (B, 2) com as coordenadas das células do bloco.
+            n_neighbors (int): Número de vizinhos por célula.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Número de pesos de cada célula (B,)
+                e, concatenados célula a célula, os índices dos pontos e os pesos.
+        """
+        pontos = self._pontos
+        n_pontos = pontos.shape[0]
+
+        if n_neighbors == n_pontos and self.config.max_distance:
+            # Todos os pontos dentro do raio: pares esparsos
+            celula, indices, dist = self._pares_no_raio(self._arvore(), xi)
+            dist[dist == 0] = 1e-10
+            weights = 1.0 / dist**self.config.power
+            contagens = np.bincount(celula, minlength=xi.shape[0])
+            if weights.size:
+                inicios = np.flatnonzero(np.diff(celula, prepend=-1))
+                weights /= np.repeat(np.add.reduceat(weights, inicios), contagens[contagens > 0])
+            return contagens, indices, weights
+
+        if n_neighbors == n_pontos:
+            # Todos os pontos: linhas densas
+            d2 = (xi[:, 0:1] - pontos[:, 0]) ** 2 + (xi[:, 1:2] - pontos[:, 1]) ** 2
+            d2[d2 == 0] = 1e-20
+            weights = d2 ** (-0.5 * self.config.power)
+            weights /= weights.sum(axis=1, keepdims=True)
+            indices = np.broadcast_to(np.arange(n_pontos), weights.shape)
+            return np.full(xi.shape[0], n_pontos), indices.ravel(), weights.ravel()
+
+        # k vizinhos mais próximos (limitados ao raio, se configurado)
+        limite = np.inf
+        if self.config.max_distance:
+            limite = np.nextafter(self.config.max_distance, np.inf)
+        dist, idx = self._arvore().query(xi, k=n_neighbors, distance_upper_bound=limite)
+        dist = dist.reshape(xi.shape[0], n_neighbors)
+        idx = idx.reshape(xi.shape[0], n_neighbors)
+
+        encontrados = np.isfinite(dist)
+        dist = np.where(dist == 0, 1e-10, dist)
+        weights = 1.0 / dist**self.config.power
+        soma = weights.sum(axis=1, keepdims=True)
+        np.divide(weights, soma, out=weights, where=soma > 0)
+        return encontrados.sum(axis=1), idx[encontrados], weights[encontrados]
+
+    def _executar_blocos(
+        self,
+        nucleo: Callable[[np.ndarray, np.ndarray], int],
+        coordenadas: Callable[[Celulas], np.ndarray],
+        n_celulas: int,
+        bytes_por_celula: int,
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Aplica o kernel de interpolação à grade, bloco a bloco.
+
+        Args:
+            nucleo (Callable): Kernel `nucleo(xi, saida)` retornado por `_preparar_nucleo`.
+            coordenadas (Callable): Função que retorna as coordenadas (B, 2) de uma fatia
+                de células; cada bloco gera apenas as suas.
+            n_celulas (int): Número de células da grade.
+            bytes_por_celula (int): Memória temporária estimada por célula.
+
+        Returns:
+            Tuple[np.ndarray, int]:
+                - z_interp (np.ndarray): Array (M, G) com os valores interpolados.
+                - n_validos (int): Número de células com pelo menos um vizinho válido.
+        """
+        # Processamento em blocos limitados pelo orçamento de memória
+        n_jobs = self._n_jobs()
+        tamanho_bloco = self._tamanho_bloco(bytes_por_celula, n_celulas, n_jobs)
+        blocos = [
+            (inicio, min(inicio + tamanho_bloco, n_celulas))
+            for inicio in range(0, n_celulas, tamanho_bloco)
+        ]
+        if len(blocos) > 1:
+            self.logger.registrar_progresso(
+                40,
+                f"Processando grade em {len(blocos)} blocos de até {tamanho_bloco} células "
+                f"com {n_jobs} thread(s)",
+            )
+
+        # Saída (M, G): cada bloco recebe a visão transposta (B, M) da sua fatia
+        z_interp = np.empty((self._valores.shape[1], n_celulas), dtype=float)
+
+        def processar(bloco):
+            inicio, fim = bloco
+            return nucleo(coordenadas(slice(inicio, fim)), z_interp[:, inicio:fim].T)
+
+        # Cada bloco escreve em sua própria fatia da saída; como NumPy e SciPy
+        # liberam o GIL, threads bastam para ocupar vários núcleos
+        if n_jobs > 1 and len(blocos) > 1:
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                n_validos = sum(executor.map(processar, blocos))
+        else:
+            n_validos = sum(map(processar, blocos))
+
+        return z_interp, n_validos
+
+    def _n_jobs(self) -> int:
+        """
+        Resolve o número de threads configurado.
+
+        Returns:
+            int: Número de threads (todos os núcleos disponíveis se n_jobs <= 0).
+        """
+        if self.config.n_jobs is None or self.config.n_jobs == 1:
+            return 1
+        if self.config.n_jobs <= 0:
+            return os.cpu_count() or 1
+        return int(self.config.n_jobs)
+
+    def _tamanho_bloco(self, bytes_por_celula: int, n_celulas: int, n_jobs: int = 1) -> int:
+        """
+        Calcula quantas células da grade podem ser processadas por bloco.
+
+        Com várias threads, o orçamento de memória é dividido entre os blocos
+        processados simultaneamente e a grade é dividida em pelo menos
+        `_BLOCOS_POR_THREAD` blocos por thread, para equilibrar a carga.
+
+        Args:
+            bytes_por_celula (int): Memória temporária estimada por célula da grade.
+            n_celulas (int): Número total de células da grade.
+            n_jobs (int, optional): Número de threads. Default é 1.
+
+        Returns:
+            int: Número de células por bloco (a grade inteira se não houver orçamento
+                nem paralelismo).
+        """
+        tamanho = max(n_celulas, 1)
+
+        if self.config.max_memory_mb is not None:
+            orcamento = self.config.max_memory_mb * 1024 * 1024 / n_jobs
+            tamanho = min(tamanho, int(orcamento // bytes_por_celula))
+
+        if n_jobs > 1:
+            divisao = -(-n_celulas // (n_jobs * _BLOCOS_POR_THREAD))
+            tamanho = min(tamanho, max(divisao, _CELULAS_MINIMAS_POR_BLOCO))
+
+        return max(1, tamanho)
+
+    def _interpolar_bloco(
+        self,
+        tree: cKDTree,
+        valores: np.ndarray,
+        n_neighbors: int,
+        xi: np.ndarray,
+        saida: np.ndarray,
+    ) -> int:
+        """
+        Interpola um bloco de células da grade, escrevendo o resultado em `saida`.
+
+        O cálculo de cada célula depende apenas dos seus próprios vizinhos, de modo
+        que o resultado independe da divisão da grade em blocos.
+
+        Args:
+            tree (cKDTree): Árvore KD construída sobre os pontos amostrados.
+            valores (np.ndarray): Array (N, M) com os valores dos pontos amostrados,
+                seguidos de uma linha de preenchimento (índice N) para vizinhos fora do raio.
+            n_neighbors (int): Número de vizinhos a consultar.
+            xi (np.ndarray): Array (B, 2) com as coordenadas das células do bloco.
+            saida (np.ndarray): Array (B, M) onde os valores interpolados são escritos.
+
+        Returns:
+            int: Número de células do bloco com pelo menos um vizinho válido.
+        """
+        # Com distância máxima, a própria busca é limitada ao raio: vizinhos
+        # ausentes retornam distância infinita e índice N (valor de preenchimento)
+        limite = np.inf
+        if self.config.max_distance:
+            limite = np.nextafter(self.config.max_distance, np.inf)
+
+        dist, idx = tree.query(xi, k=n_neighbors, distance_upper_bound=limite)
+        dist = dist.reshape(xi.shape[0], n_neighbors)
+        idx = idx.reshape(xi.shape[0], n_neighbors)
+
+        if self.config.max_distance:
+            has_valid_neighbors = ~np.all(np.isinf(dist), axis=1)
+            if not np.all(has_valid_neighbors):
+                self._preencher_sem_vizinhos(saida, ~has_valid_neighbors)
+                dist = dist[has_valid_neighbors]
+                idx = idx[has_valid_neighbors]
+        else:
+            has_valid_neighbors = np.ones(xi.shape[0], dtype=bool)
+
+        # Evita divisão por zero substituindo zeros por valor muito pequeno
+        dist = np.where(dist == 0, 1e-10, dist)
+
+        weights = 1.0 / dist**self.config.power
+        weights /= weights.sum(axis=1, keepdims=True)
+
+        # Produtos em (B, M, k) contíguo: cada coluna é somada sobre os k vizinhos
+        # contíguos, na mesma ordem da interpolação de um único atributo
+        ponderados = np.multiply(
+            valores[idx].transpose(0, 2, 1), weights[:, np.newaxis, :], order="C"
+        )
+        saida[has_valid_neighbors] = ponderados.sum(axis=2)
+        return int(np.count_nonzero(has_valid_neighbors))
+
+    def _interpolar_bloco_raio(
+        self,
+        tree: cKDTree,
+        valores: np.ndarray,
+        xi: np.ndarray,
+        saida: np.ndarray,
+    ) -> int:
+        """
+        Interpola um bloco usando todos os pontos dentro de `max_distance`.
+
+        Os pares (célula, ponto) dentro do raio são obtidos por uma busca dual entre
+        as árvores KD do bloco e dos pontos, em uma representação esparsa (listas
+        concatenadas de índices e distâncias), de modo que o custo e a memória são
+        proporcionais ao número de pares próximos e não a B x N.
+
+        Args:
+            tree (cKDTree): Árvore KD construída sobre os pontos amostrados.
+            valores (np.ndarray): Array (N, M) com os valores dos pontos amostrados.
+            xi (np.ndarray): Array (B, 2) com as coordenadas das células do bloco.
+            saida (np.ndarray): Array (B, M) onde os valores interpolados são escritos.
+
+        Returns:
+            int: Número de células do bloco com pelo menos um vizinho válido.
+        """
+        n_celulas = xi.shape[0]
+        celula, vizinho, dist = self._pares_no_raio(tree, xi)
+
+        # Evita divisão por zero substituindo zeros por valor muito pequeno
+        dist[dist == 0] = 1e-10
+        weights = 1.0 / dist**self.config.power
+
+        has_valid_neighbors = np.bincount(celula, minlength=n_celulas) > 0
+        if not np.all(has_valid_neighbors):
+            self._preencher_sem_vizinhos(saida, ~has_valid_neighbors)
+        if celula.size == 0:
+            return 0
+
+        # Somas por segmento (pares consecutivos da mesma célula)
+        inicios = np.flatnonzero(np.diff(celula, prepend=-1))
+        denominador = np.add.reduceat(weights, inicios)
+        numerador = np.add.reduceat(weights[:, None] * valores[vizinho], inicios, axis=0)
+        saida[has_valid_neighbors] = numerador / denominador[:, None]
+        return int(np.count_nonzero(has_valid_neighbors))
+
+    def _pares_no_raio(
+        self, tree: cKDTree, xi: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Lista os pares (célula, ponto) a até `max_distance` por busca dual entre árvores.
+
+        Args:
+            tree (cKDTree): Árvore KD construída sobre os pontos amostrados.
+            xi (np.ndarray): Array (B, 2) com as coordenadas das células do bloco.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Índices das células, índices dos
+                pontos e distâncias dos pares, ordenados por célula e ponto.
+        """
+        pares = cKDTree(xi).sparse_distance_matrix(
+            tree, self.config.max_distance, output_type="ndarray"
+        )
+
+        # Ordena os pares por célula e ponto: a ordem das somas passa a depender
+        # apenas da célula, e não da divisão da grade em blocos
+        ordem = np.lexsort((pares["j"], pares["i"]))
+        return pares["i"][ordem], pares["j"][ordem], pares["v"][ordem]
+
+    def _interpolar_bloco_global(
+        self,
+        pontos: np.ndarray,
+        valores: np.ndarray,
+        xi: np.ndarray,
+        saida: np.ndarray,
+    ) -> int:
+        """
+        Interpola um bloco de células usando todos os pontos, por força bruta.
+
+        As distâncias quadradas são calculadas de forma vetorizada em tiles de
+        `_ELEMENTOS_TILE` pares (célula, ponto), que cabem na cache, e as somas
+        ponderadas são acumuladas tile a tile, sem ordenar vizinhos.
+
+        Args:
+            pontos (np.ndarray): Array (N, 2) com as coordenadas dos pontos amostrados.
+            valores (np.ndarray): Array (N, M) com os valores dos pontos amostrados.
+            xi (np.ndarray): Array (B, 2) com as coordenadas das células do bloco.
+            saida (np.ndarray): Array (B, M) onde os valores interpolados são escritos.
+
+        Returns:
+            int: Número de células do bloco com pelo menos um vizinho válido.
+        """
+        n_pontos = pontos.shape[0]
+        colunas = min(n_pontos, _ELEMENTOS_TILE)
+        linhas = max(1, _ELEMENTOS_TILE // colunas)
+        expoente = -0.5 * self.config.power
+        max_dist2 = self.config.max_distance**2 if self.config.max_distance else None
+
+        colunas_valores = np.ascontiguousarray(valores.T)
+        numerador = np.zeros((xi.shape[0], valores.shape[1]))
+        denominador = np.zeros(xi.shape[0])
+        for i0 in range(0, xi.shape[0], linhas):
+            i1 = min(i0 + linhas, xi.shape[0])
+            gx = xi[i0:i1, 0:1]
+            gy = xi[i0:i1, 1:2]
+            for j0 in range(0, n_pontos, colunas):
+                j1 = min(j0 + colunas, n_pontos)
+
+                # Distância quadrada calculada sem raiz: w = (d²)^(-p/2)
+                d2 = gx - pontos[j0:j1, 0]
+                d2 *= d2
+                dy = gy - pontos[j0:j1, 1]
+                dy *= dy
+                d2 += dy
+
+                fora_do_raio = d2 > max_dist2 if max_dist2 is not None else None
+
+                # Evita divisão por zero como no caminho por árvore KD (d = 1e-10)
+                d2[d2 == 0] = 1e-20
+                weights = np.power(d2, expoente, out=d2)
+                if fora_do_raio is not None:
+                    weights[fora_do_raio] = 0.0
+
+                # Contração por einsum (em vez de BLAS) mantém o resultado de cada
+                # célula independente da divisão da grade em blocos; uma coluna
+                # contígua por vez, na mesma ordem da interpolação de um atributo
+                denominador[i0:i1] += weights.sum(axis=1)
+                for m in range(valores.shape[1]):
+                    numerador[i0:i1, m] += np.einsum("ij,j->i", weights, colunas_valores[m, j0:j1])
+
+        has_valid_neighbors = denominador > 0
+        if not np.all(has_valid_neighbors):
+            self._preencher_sem_vizinhos(saida, ~has_valid_neighbors)
+
+        saida[has_valid_neighbors] = (
+            numerador[has_valid_neighbors] / denominador[has_valid_neighbors, None]
+        )
+        return int(np.count_nonzero(has_valid_neighbors))
+
+    def _preencher_sem_vizinhos(self, saida: np.ndarray, mascara: np.ndarray) -> None:
+        """
+        Atribui o valor padrão (ou NaN) às células sem vizinhos válidos.
+
+        Args:
+            saida (np.ndarray): Array (B, M) de saída do bloco.
+            mascara (np.ndarray): Máscara booleana (B,) das células sem vizinhos.
+        """
+        if self.config.default_value is not None:
+            saida[mascara] = self.config.default_value
+        else:
+            saida[mascara] = np.nan
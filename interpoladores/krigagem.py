@@ -10,26 +10,218 @@ Características principais:
 - Configuração de anisotropia
 - Cálculo de variância de estimativa
 - Personalização avançada de parâmetros
+- Vizinhança de busca local (número de vizinhos, raio e elipse de anisotropia)
+- Ajuste do variograma separado da previsão, com persistência em disco
+- Escolha do backend de execução conforme um orçamento de memória
+- Execução em faixas da grade distribuídas entre vários processos
+- Motor próprio em NumPy que fatora o sistema global uma única vez
+- Validação cruzada leave-one-out em forma fechada (atalho de Dubrule)
+- Seleção das saídas (estimativa, variância ou ambas), sem calcular a dispensada
+- Motor esparso para variogramas de suporte compacto (esférico), em memória limitada
+- Inclusão e remoção de amostras com atualização de posto baixo do sistema global
+- Ordenação de locais candidatos a novas amostras pela redução da variância
+- Exportação dos pesos da grade como operador linear (`OperadorPesos`)
 
 Classes:
+    - VariogramaAjustado: Modelo de variograma com parâmetros ajustados.
     - Krigagem: Interpolador por Krigagem Ordinária.
 
 Dependências:
     - numpy: Para operações numéricas eficientes
     - pykrige: Implementação de algoritmos de Krigagem
+    - scipy.spatial.cKDTree: Para a busca de vizinhos da Krigagem local
+    - scipy.linalg: Para a fatoração LU do sistema global no motor NumPy
+    - scipy.sparse: Para a montagem e a fatoração do sistema no motor esparso
 """
 
+import json
 import logging
-from typing import Any, Dict, Optional, Tuple, Union
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np  # noqa: F401
+from pykrige.core import _make_variogram_parameter_list
 from pykrige.ok import OrdinaryKriging
+from scipy import sparse
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import splu
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import cdist
 
 from interpoladores.config import KrigagemConfig
+from interpoladores.operador import OperadorPesos
+from utils.grid_utils import GradeRegular
 from utils.logging_utils import InterpoladorLogger
 
 from .base import InterpoladorBase
 
+# Distâncias abaixo deste limite são tratadas como nulas (mesmo corte do PyKrige)
+_EPS = 1e-10
+
+# Número máximo de pontos usados para ajustar o variograma na Krigagem local
+_AMOSTRAS_VARIOGRAMA = 2000
+
+# Elementos das matrizes (B, k + 1, k + 1) de um bloco da Krigagem local (8 MB),
+# usado quando max_memory_mb não está configurado
+_ELEMENTOS_BLOCO_LOCAL = 2**20
+
+# Arrays (B, k + 1, k + 1) de 8 bytes alocados por bloco na Krigagem local
+_ARRAYS_POR_SISTEMA_LOCAL = 5
+
+# Backends de execução da Krigagem global aceitos em KrigagemConfig.backend
+_BACKENDS = ("auto", "vectorized", "loop", "C")
+
+# Orçamento de memória (MB) da política automática quando max_memory_mb é None
+_MEMORIA_PADRAO_MB = 1024.0
+
+# Arrays (G, N + 1) de 8 bytes alocados pelo backend vetorizado do PyKrige
+# (distâncias, lado direito, solução e produtos intermediários) e pelos
+# backends em laço (apenas a matriz de distâncias e sua máscara).
+_ARRAYS_POR_CELULA_VETORIZADO = 6
+_ARRAYS_POR_CELULA_LACO = 2
+
+# Saídas aceitas em KrigagemConfig.saida
+_SAIDAS = ("estimativa", "variancia", "ambos")
+
+# Motores da Krigagem global aceitos em KrigagemConfig.engine
+_ENGINES = ("pykrige", "numpy", "sparse")
+
+# Modelos de variograma com suporte compacto (covariância nula além do alcance),
+# aceitos pelo motor esparso
+_MODELOS_SUPORTE_COMPACTO = ("spherical",)
+
+# Arrays de 8 bytes por par célula-amostra dentro do alcance no motor esparso
+# (índices, distâncias, covariâncias e produtos)
+_ARRAYS_POR_PAR_ESPARSO = 5
+
+# Arrays (G, N + 1) de 8 bytes alocados por bloco no motor NumPy (distâncias,
+# variograma, lado direito e o produto pela inversa da variância)
+_ARRAYS_POR_CELULA_NUMPY = 4
+
+# Menor bloco para o qual o backend vetorizado compensa frente ao laço
+_CELULAS_MINIMAS_VETORIZADO = 256
+
+# Faixas da grade por processo na execução paralela (equilíbrio de carga)
+_FAIXAS_POR_PROCESSO = 4
+
+# Interpolador de cada processo da execução paralela, criado uma única vez por
+# `_inicializar_processo` com as amostras e o variograma já ajustado
+_krigagem_processo = None
+
+# Células por consulta ao contar vizinhos dentro do raio
+_CELULAS_CONTAGEM = 65536
+
+# Nomes dos parâmetros de cada modelo no PyKrige ([psill, range, nugget] nos demais)
+_NOMES_PARAMETROS = {"linear": ("slope", "nugget"), "power": ("scale", "exponent", "nugget")}
+
+
+@dataclass
+class VariogramaAjustado:
+    """
+    Modelo de variograma com os parâmetros ajustados aos dados.
+
+    Attributes:
+        modelo (str): Nome do modelo de variograma (ver `KrigagemConfig.modelo_variograma`).
+        parametros (List[float]): Parâmetros na ordem do PyKrige, por exemplo
+            [psill, range, nugget] para 'spherical', 'exponential' e 'gaussian',
+            [slope, nugget] para 'linear' e [scale, exponent, nugget] para 'power'.
+    """
+
+    modelo: str
+    parametros: List[float]
+
+    @property
+    def funcao(self) -> Callable:
+        """Função `gamma(parametros, distancias)` do modelo no PyKrige."""
+        return OrdinaryKriging.variogram_dict[self.modelo]
+
+    def gamma(self, distancias: np.ndarray) -> np.ndarray:
+        """
+        Avalia o variograma nas distâncias fornecidas.
+
+        Args:
+            distancias (np.ndarray): Distâncias (no espaço isotrópico).
+
+        Returns:
+            np.ndarray: Semivariâncias, com o mesmo formato de `distancias`.
+        """
+        return self.funcao(self.parametros, distancias)
+
+    def como_dict(self) -> Dict[str, float]:
+        """
+        Parâmetros nomeados, no formato de `KrigagemConfig.variogram_model_parameters`.
+
+        O PyKrige interpreta uma lista de parâmetros com o patamar total (sill) no
+        lugar do parcial (psill); o dicionário evita essa ambiguidade.
+
+        Returns:
+            Dict[str, float]: Por exemplo {'psill': ..., 'range': ..., 'nugget': ...}.
+        """
+        nomes = _NOMES_PARAMETROS.get(self.modelo, ("psill", "range", "nugget"))
+        return dict(zip(nomes, self.parametros))
+
+
+@dataclass
+class _SistemaFatorado:
+    """
+    Sistema de Krigagem Ordinária global fatorado (motor NumPy).
+
+    Attributes:
+        lu (Tuple[np.ndarray, np.ndarray], optional): Fatoração `(lu, piv)` de
+            `scipy.linalg.lu_factor`, ou None após a atualização incremental das
+            amostras (`Krigagem.adicionar_amostras`), que mantém apenas a inversa.
+        pesos_duais (np.ndarray): Solução (N + 1,) de `A x = [z, 0]` (forma dual).
+        inversa (np.ndarray, optional): Inversa (N + 1, N + 1) da matriz, calculada
+            apenas quando é necessária (validação cruzada, operador de pesos e
+            atualização incremental das amostras).
+    """
+
+    lu: Optional[Tuple[np.ndarray, np.ndarray]]
+    pesos_duais: np.ndarray
+    inversa: Optional[np.ndarray] = None
+
+    def resolver(self, b: np.ndarray) -> np.ndarray:
+        """
+        Resolve `A x = b` para um bloco de lados direitos.
+
+        Args:
+            b (np.ndarray): Lados direitos (N + 1, G).
+
+        Returns:
+            np.ndarray: Soluções (N + 1, G), pela fatoração LU ou, na sua ausência,
+                pela inversa mantida pela atualização incremental.
+        """
+        if self.lu is None:
+            return self.inversa @ b
+        return lu_solve(self.lu, b, check_finite=False)
+
+
+@dataclass
+class _SistemaEsparso:
+    """
+    Matriz de covariância esparsa fatorada (motor esparso).
+
+    Attributes:
+        lu (scipy.sparse.linalg.SuperLU): Fatoração esparsa da matriz de covariância C (N, N).
+        arvore (cKDTree): Árvore KD dos pontos no espaço isotrópico.
+        pesos_duais (np.ndarray): Solução (N,) de `C a = z`.
+        pesos_media (np.ndarray): Solução (N,) de `C u = 1`.
+        soma_pesos_media (float): `1ᵀ u`.
+        media (float): Estimativa da média, `uᵀ z / 1ᵀ u`.
+        vizinhos_por_ponto (float): Número médio de pontos dentro do alcance de cada ponto.
+    """
+
+    lu: Any
+    arvore: cKDTree
+    pesos_duais: np.ndarray
+    pesos_media: np.ndarray
+    soma_pesos_media: float
+    media: float
+    vizinhos_por_ponto: float
+
 
 class Krigagem(InterpoladorBase):
     """
@@ -45,6 +237,8 @@ class Krigagem(InterpoladorBase):
     - Parâmetros de anisotropia
     - Configurações avançadas do variograma
     - Opção de retornar estatísticas de erro
+    - Vizinhança de busca (`n_neighbors`, `max_distance`, `anisotropic_search`), que
+      resolve um sistema local por célula e escala para dezenas de milhares de pontos
 
     Args:
         x (list or np.ndarray): Coordenadas X dos pontos amostrados.
@@ -80,6 +274,11 @@ class Krigagem(InterpoladorBase):
         >>> # Interpolação
         >>> krig = Krigagem(x, y, z, config=config)
         >>> z_interp, variancia = krig.interpolar(gridx, gridy)
+        >>>
+        >>> # Ajuste único, previsão em várias grades e persistência do modelo
+        >>> krig.ajustar().salvar("modelo.npz")
+        >>> krig = Krigagem.carregar("modelo.npz")
+        >>> z_fina, _ = krig.prever(np.linspace(0, 10, 200), np.linspace(0, 10, 200))
     """
 
     def __init__(
@@ -117,6 +316,14 @@ class Krigagem(InterpoladorBase):
         self.z = np.asarray(z)
         self.config = config if config is not None else KrigagemConfig()
 
+        # Estado ajustado: variograma e, na Krigagem global, o objeto do PyKrige
+        self.variograma: Optional[VariogramaAjustado] = None
+        self._ok: Optional[OrdinaryKriging] = None
+
+        # Sistema global fatorado (motores NumPy e esparso), calculado na primeira previsão
+        self._sistema: Optional[_SistemaFatorado] = None
+        self._sistema_esparso: Optional[_SistemaEsparso] = None
+
         # Configura o logger
         nivel_log = logging.DEBUG if verbose else logging.INFO
         self.logger = InterpoladorLogger(
@@ -124,23 +331,123 @@ class Krigagem(InterpoladorBase):
         )
 
     def interpolar(
-        self, gridx: np.ndarray, gridy: np.ndarray
+        self, gridx: Union[np.ndarray, GradeRegular], gridy: Optional[np.ndarray] = None
     ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
         """
         Executa a Krigagem Ordinária sobre a grade fornecida.
 
+        Equivale a `ajustar()` (apenas na primeira chamada) seguido de `prever`;
+        chamadas seguintes reaproveitam o variograma ajustado.
+
         Args:
-            gridx (np.ndarray): Meshgrid das coordenadas X da grade.
-            gridy (np.ndarray): Meshgrid das coordenadas Y da grade.
+            gridx (np.ndarray or GradeRegular): Meshgrid das coordenadas X da grade, ou
+                `GradeRegular` (cujos eixos são usados diretamente).
+            gridy (np.ndarray, optional): Meshgrid das coordenadas Y da grade (None se
+                `gridx` for uma GradeRegular).
 
         Returns:
             Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
                 Se enable_statistics=False (padrão): Grade 2D com os valores interpolados.
                 Se enable_statistics=True: Tupla com (grade interpolada, variância de estimativa).
+                Com `KrigagemConfig.saida`, 'estimativa' retorna a grade interpolada,
+                'variancia' apenas a variância e 'ambos' a tupla.
 
         Raises:
             ValueError: Se houver problema na execução da Krigagem (e.g. pontos insuficientes).
         """
+        if self.variograma is None:
+            self.ajustar()
+        return self.prever(gridx, gridy)
+
+    def ajustar(self) -> "Krigagem":
+        """
+        Ajusta o variograma e prepara o estado da Krigagem para previsões.
+
+        Na Krigagem global, o objeto `OrdinaryKriging` do PyKrige é construído uma
+        única vez e reaproveitado por `prever`. Na Krigagem com vizinhança de busca
+        e no motor esparso, o variograma é ajustado sobre uma subamostra de até
+        `_AMOSTRAS_VARIOGRAMA` pontos, evitando o variograma experimental O(N²) sobre
+        todos os pontos. Com `variogram_model_parameters` definidos (por exemplo, por
+        `VariogramaExperimental.config_krigagem`), os parâmetros são usados
+        diretamente, sem o variograma experimental do PyKrige. Após alterar a
+        configuração, chame `ajustar` novamente.
+
+        Returns:
+            Krigagem: A própria instância, para encadeamento com `prever`.
+
+        Raises:
+            ValueError: Se o PyKrige não conseguir ajustar o variograma.
+        """
+        self.logger.iniciar_interpolacao(
+            f"Ajuste do variograma - Pontos: {len(self.x)}, "
+            f"Modelo: {self.config.modelo_variograma}"
+        )
+
+        try:
+            parametros = self.config.variogram_model_parameters
+            if parametros is not None:
+                # Parâmetros fixos: o PyKrige só é construído se for usado na previsão
+                lista = _make_variogram_parameter_list(self.config.modelo_variograma, parametros)
+                self.variograma = VariogramaAjustado(
+                    self.config.modelo_variograma, [float(p) for p in lista]
+                )
+                self._ok = None
+                self._sistema = None
+                self._sistema_esparso = None
+                self.logger.concluir_interpolacao(f"Parâmetros fixos: {self.variograma.parametros}")
+                return self
+
+            # O variograma experimental O(N²) do PyKrige usa uma subamostra quando a
+            # previsão não depende do objeto do PyKrige (vizinhança ou motor esparso)
+            local = self._usa_vizinhanca() or self.config.engine == "sparse"
+            n_pontos = len(self.x)
+            amostra = np.arange(n_pontos)
+            if local and n_pontos > _AMOSTRAS_VARIOGRAMA:
+                rng = np.random.default_rng(0)
+                amostra = np.sort(rng.choice(n_pontos, _AMOSTRAS_VARIOGRAMA, replace=False))
+
+            self.logger.registrar_progresso(30, "Iniciando cálculo do variograma")
+            ok = self._construir_pykrige(amostra, None)
+
+            self.variograma = VariogramaAjustado(
+                self.config.modelo_variograma,
+                [float(p) for p in ok.variogram_model_parameters],
+            )
+            self._ok = None if local else ok
+            self._sistema = None
+            self._sistema_esparso = None
+
+            self.logger.concluir_interpolacao(f"Parâmetros: {self.variograma.parametros}")
+            return self
+
+        except Exception as e:
+            self.logger.registrar_erro(e)
+            raise
+
+    def prever(
+        self, gridx: Union[np.ndarray, GradeRegular], gridy: Optional[np.ndarray] = None
+    ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Executa a Krigagem sobre a grade com o variograma já ajustado.
+
+        Args:
+            gridx (np.ndarray or GradeRegular): Coordenadas X da grade, ou `GradeRegular`.
+            gridy (np.ndarray, optional): Coordenadas Y da grade (None se `gridx` for uma
+                GradeRegular).
+
+        Returns:
+            Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]: Conforme a saída
+                configurada (ver `KrigagemConfig.saida`): grade interpolada, variância
+                de estimativa ou a tupla (grade interpolada, variância de estimativa).
+
+        Raises:
+            RuntimeError: Se `ajustar` não tiver sido chamado antes.
+            ValueError: Se houver problema na execução da Krigagem.
+        """
+        if self.variograma is None:
+            raise RuntimeError("Krigagem não ajustada: chame ajustar() antes de prever()")
+        saida = self._saida()
+
         # Inicia o logging
         self.logger.iniciar_interpolacao(
             f"Pontos: {len(self.x)}, Grade: {gridx.shape}, "
@@ -148,56 +455,1391 @@ class Krigagem(InterpoladorBase):
         )
 
         try:
-            # Validação da grade
-            if gridx.shape != gridy.shape:
-                raise ValueError(
-                    f"Grades X e Y devem ter o mesmo formato, mas têm formatos {gridx.shape} e {gridy.shape}"
-                )
+            # Validação da grade (uma GradeRegular é convertida nos seus eixos)
+            gridx, gridy = _eixos_grade(gridx, gridy)
 
             self.logger.registrar_progresso(10, "Validação concluída")
 
-            # Preparação dos parâmetros para o PyKrige
-            kwargs = {
-                "variogram_model": self.config.modelo_variograma,
-                "verbose": self.config.verbose,
-                "anisotropy_angle": self.config.anisotropy_angle,
-                "anisotropy_scaling": self.config.anisotropy_ratio,
-            }
+            n_jobs = self._n_jobs()
+            if n_jobs > 1 and np.size(gridy) > 1:
+                z_interp, ss = self._krigagem_em_processos(gridx, gridy, n_jobs)
+            else:
+                z_interp, ss = self._executar(gridx, gridy)
+
+            self.logger.registrar_progresso(90, "Interpolação concluída")
+
+            # Retorna apenas as saídas configuradas
+            if saida == "ambos":
+                self.logger.concluir_interpolacao(
+                    f"Grade interpolada: {z_interp.shape}, com estatísticas"
+                )
+                return z_interp, ss
+            elif saida == "variancia":
+                self.logger.concluir_interpolacao(f"Variância de estimativa: {ss.shape}")
+                return ss
+            else:
+                self.logger.concluir_interpolacao(f"Grade interpolada: {z_interp.shape}")
+                return z_interp
+
+        except Exception as e:
+            self.logger.registrar_erro(e)
+            raise
+
+    def salvar(self, caminho: str) -> None:
+        """
+        Salva o modelo ajustado (amostras, configuração e variograma) em disco.
+
+        O formato é escolhido pela extensão: `.json` gera um arquivo de texto legível;
+        qualquer outra extensão gera um `.npz` comprimido.
+
+        Args:
+            caminho (str): Caminho do arquivo de saída.
+
+        Raises:
+            RuntimeError: Se `ajustar` não tiver sido chamado antes.
+        """
+        if self.variograma is None:
+            raise RuntimeError("Krigagem não ajustada: chame ajustar() antes de salvar()")
+
+        metadados = {"config": asdict(self.config), "variograma": asdict(self.variograma)}
+        if str(caminho).endswith(".json"):
+            metadados.update(x=self.x.tolist(), y=self.y.tolist(), z=self.z.tolist())
+            with open(caminho, "w", encoding="utf-8") as arquivo:
+                json.dump(metadados, arquivo, ensure_ascii=False, indent=2)
+        else:
+            np.savez_compressed(
+                caminho, x=self.x, y=self.y, z=self.z, metadados=np.array(json.dumps(metadados))
+            )
+
+    @classmethod
+    def carregar(
+        cls, caminho: str, verbose: bool = False, arquivo_log: Optional[str] = None
+    ) -> "Krigagem":
+        """
+        Carrega um modelo salvo com `salvar`, pronto para `prever` sem novo ajuste.
+
+        Args:
+            caminho (str): Caminho do arquivo `.json` ou `.npz`.
+            verbose (bool, optional): Se True, exibe logs detalhados. Default é False.
+            arquivo_log (str, optional): Caminho para arquivo de log. Se None, não salva logs.
+                Default é None.
+
+        Returns:
+            Krigagem: Interpolador com o variograma ajustado.
+        """
+        if str(caminho).endswith(".json"):
+            with open(caminho, encoding="utf-8") as arquivo:
+                metadados = json.load(arquivo)
+            x, y, z = metadados.pop("x"), metadados.pop("y"), metadados.pop("z")
+        else:
+            with np.load(caminho, allow_pickle=False) as arquivo:
+                metadados = json.loads(str(arquivo["metadados"]))
+                x, y, z = arquivo["x"], arquivo["y"], arquivo["z"]
+
+        krig = cls(
+            x,
+            y,
+            z,
+            config=KrigagemConfig(**metadados["config"]),
+            verbose=verbose,
+            arquivo_log=arquivo_log,
+        )
+        krig.variograma = VariogramaAjustado(**metadados["variograma"])
+        return krig
+
+    def _executar(self, gridx: np.ndarray, gridy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Executa a Krigagem local ou global sobre a grade no processo atual.
+
+        Args:
+            gridx (np.ndarray): Coordenadas X da grade.
+            gridy (np.ndarray): Coordenadas Y da grade.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Grade interpolada e variância de estimativa;
+                a saída dispensada por `KrigagemConfig.saida` é None.
+        """
+        if self._usa_vizinhanca():
+            return self._krigagem_local(gridx, gridy)
+        if self.config.engine not in _ENGINES:
+            raise ValueError(
+                f"Engine '{self.config.engine}' inválido. Opções: {', '.join(_ENGINES)}"
+            )
+        if self.config.engine == "numpy":
+            return self._krigagem_numpy(gridx, gridy)
+        if self.config.engine == "sparse":
+            return self._krigagem_esparsa(gridx, gridy)
+        return self._krigagem_global(gridx, gridy)
+
+    def _krigagem_em_processos(
+        self, gridx: np.ndarray, gridy: np.ndarray, n_jobs: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Divide a grade em faixas de linhas e as distribui entre processos.
+
+        As amostras, a configuração e o variograma ajustado são enviados uma única
+        vez a cada processo (no inicializador do pool); cada tarefa recebe apenas os
+        eixos da sua faixa, e as faixas são costuradas na ordem da grade. Cada faixa
+        é resolvida como um lote de tamanho diferente dos blocos do processo único,
+        e as reduções do BLAS mudam de ordem: o resultado coincide com o sequencial
+        até o arredondamento (diferenças da ordem de 1e-13), não bit a bit.
+
+        Args:
+            gridx (np.ndarray): Coordenadas X da grade (nx,).
+            gridy (np.ndarray): Coordenadas Y da grade (ny,).
+            n_jobs (int): Número de processos.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Grade interpolada e variância (ny, nx).
+        """
+        gridx, gridy = np.ravel(gridx), np.ravel(gridy)
+        n_faixas = min(gridy.size, n_jobs * _FAIXAS_POR_PROCESSO)
+        limites = np.linspace(0, gridy.size, n_faixas + 1).astype(int)
+        faixas = [gridy[inicio:fim] for inicio, fim in zip(limites[:-1], limites[1:])]
+        self.logger.registrar_progresso(
+            40, f"Processando grade em {len(faixas)} faixas com {n_jobs} processo(s)"
+        )
+
+        # Cada processo recebe uma fração do orçamento de memória e não paraleliza
+        config = replace(self.config, n_jobs=1)
+        if config.max_memory_mb is not None:
+            config = replace(config, max_memory_mb=config.max_memory_mb / n_jobs)
+
+        z_interp, ss = _alocar_saidas((gridy.size, gridx.size), self._saida())
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_inicializar_processo,
+            initargs=(self.x, self.y, self.z, config, self.variograma),
+        ) as executor:
+            resultados = executor.map(_krigar_faixa, [gridx] * len(faixas), faixas)
+            for inicio, fim, (z_faixa, ss_faixa) in zip(limites[:-1], limites[1:], resultados):
+                if z_interp is not None:
+                    z_interp[inicio:fim] = z_faixa
+                if ss is not None:
+                    ss[inicio:fim] = ss_faixa
+        return z_interp, ss
+
+    def _saida(self) -> str:
+        """
+        Resolve as saídas da previsão.
+
+        Returns:
+            str: 'estimativa', 'variancia' ou 'ambos' (se `saida` for None, segue
+                enable_statistics).
+
+        Raises:
+            ValueError: Se a saída configurada for inválida.
+        """
+        saida = self.config.saida
+        if saida is None:
+            return "ambos" if self.config.enable_statistics else "estimativa"
+        if saida not in _SAIDAS:
+            raise ValueError(f"Saída '{saida}' inválida. Opções: {', '.join(_SAIDAS)}")
+        return saida
+
+    def _n_jobs(self) -> int:
+        """
+        Resolve o número de processos configurado.
+
+        Returns:
+            int: Número de processos (todos os núcleos disponíveis se n_jobs <= 0).
+        """
+        if self.config.n_jobs is None or self.config.n_jobs == 1:
+            return 1
+        if self.config.n_jobs <= 0:
+            return os.cpu_count() or 1
+        return int(self.config.n_jobs)
+
+    def _usa_vizinhanca(self) -> bool:
+        """True se a configuração define uma vizinhança de busca local."""
+        return self.config.n_neighbors is not None or self.config.max_distance is not None
+
+    def _construir_pykrige(
+        self, amostra: np.ndarray, parametros: Optional[Union[Dict[str, Any], List[float]]]
+    ) -> OrdinaryKriging:
+        """
+        Constrói o `OrdinaryKriging` do PyKrige sobre uma seleção de pontos.
+
+        Args:
+            amostra (np.ndarray): Índices dos pontos usados.
+            parametros (dict or list, optional): Parâmetros do variograma; se None, o
+                PyKrige ajusta o variograma aos dados.
+
+        Returns:
+            OrdinaryKriging: Objeto do PyKrige.
+
+        Raises:
+            ValueError: Se o PyKrige falhar.
+        """
+        kwargs = {
+            "variogram_model": self.config.modelo_variograma,
+            "verbose": self.config.verbose,
+            "anisotropy_angle": self.config.anisotropy_angle,
+            "anisotropy_scaling": self.config.anisotropy_ratio,
+        }
+
+        # Adiciona parâmetros opcionais se fornecidos
+        if self.config.nlags is not None:
+            kwargs["nlags"] = self.config.nlags
+
+        if parametros is not None:
+            kwargs["variogram_parameters"] = parametros
+
+        try:
+            return OrdinaryKriging(self.x[amostra], self.y[amostra], self.z[amostra], **kwargs)
+        except Exception as e:
+            raise ValueError(f"Erro na execução da Krigagem: {str(e)}")
+
+    def _krigagem_global(
+        self, gridx: np.ndarray, gridy: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Resolve um único sistema de Krigagem com todos os pontos (PyKrige).
+
+        O PyKrige sempre calcula estimativa e variância; a saída dispensada apenas
+        não é alocada nem retornada.
+
+        Args:
+            gridx (np.ndarray): Coordenadas X da grade.
+            gridy (np.ndarray): Coordenadas Y da grade.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Grade interpolada e variância de estimativa.
+
+        Raises:
+            ValueError: Se houver problema na execução da Krigagem.
+        """
+        if self._ok is None:
+            # Parâmetros fixos ou modelo carregado do disco: sem novo ajuste
+            self._ok = self._construir_pykrige(np.arange(len(self.x)), self.variograma.como_dict())
+
+        n_celulas = gridx.size * gridy.size
+        backend, tamanho_bloco = self._plano_execucao(n_celulas)
+        self.logger.registrar_progresso(
+            60, f"Backend '{backend}' em blocos de até {tamanho_bloco} células"
+        )
+
+        saida = self._saida()
+        try:
+            if tamanho_bloco >= n_celulas:
+                z_interp, ss = self._ok.execute("grid", gridx, gridy, backend=backend)
+                return _selecionar_saidas(z_interp, ss, saida)
+
+            # Blocos de células em ordem achatada, avaliados como pontos
+            shape = (gridy.size, gridx.size)
+            z_interp, ss = _alocar_saidas(shape, saida)
+            for inicio in range(0, n_celulas, tamanho_bloco):
+                fim = min(inicio + tamanho_bloco, n_celulas)
+                xi = _coordenadas_eixos(gridx, gridy, inicio, fim)
+                z_bloco, ss_bloco = self._ok.execute("points", xi[:, 0], xi[:, 1], backend=backend)
+                if z_interp is not None:
+                    z_interp.ravel()[inicio:fim] = z_bloco
+                if ss is not None:
+                    ss.ravel()[inicio:fim] = ss_bloco
+            return z_interp, ss
+
+        except Exception as e:
+            raise ValueError(f"Erro na execução da Krigagem: {str(e)}")
+
+    def _krigagem_numpy(
+        self, gridx: np.ndarray, gridy: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Krigagem global com o sistema fatorado uma única vez (motor NumPy).
 
-            # Adiciona parâmetros opcionais se fornecidos
-            if self.config.nlags is not None:
-                kwargs["nlags"] = self.config.nlags
+        A matriz (N + 1) x (N + 1) de Krigagem depende apenas da geometria dos
+        pontos e do variograma. Ela é fatorada por LU na primeira previsão (a
+        matriz é simétrica, mas indefinida, o que exclui Cholesky) e reaproveitada
+        pelas previsões seguintes. A estimativa usa a forma dual: os pesos
+        `A⁻¹ [z, 0]` são resolvidos uma vez e cada célula custa um produto escalar
+        O(N). A variância `bᵀ A⁻¹ b` resolve os lados direitos de cada bloco com a
+        mesma fatoração, sem formar a inversa, e só é calculada quando pedida (ver
+        `KrigagemConfig.saida`).
+        Segue as mesmas convenções do PyKrige (anisotropia, distância nula à
+        amostra, variância), com resultados iguais a menos de arredondamento.
 
-            if self.config.variogram_model_parameters is not None:
-                kwargs["variogram_model_parameters"] = self.config.variogram_model_parameters
+        Args:
+            gridx (np.ndarray): Coordenadas X da grade (nx,).
+            gridy (np.ndarray): Coordenadas Y da grade (ny,).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Grade interpolada e variância de estimativa,
+                shape (ny, nx); a saída dispensada é None.
+
+        Raises:
+            ValueError: Se o sistema de Krigagem for singular.
+        """
+        gridx, gridy = np.ravel(gridx), np.ravel(gridy)
+        n_celulas = gridx.size * gridy.size
+        n_pontos = len(self.x)
+
+        pontos_ajustados, centro = self._pontos_isotropicos()
+        z_interp, ss = _alocar_saidas((gridy.size, gridx.size), self._saida())
+        sistema = self._sistema_fatorado(pontos_ajustados, inversa=False)
+
+        memoria_mb = self.config.max_memory_mb
+        orcamento = (memoria_mb if memoria_mb is not None else _MEMORIA_PADRAO_MB) * 2**20
+        por_celula = _ARRAYS_POR_CELULA_NUMPY * 8 * (n_pontos + 1)
+        tamanho_bloco = int(min(n_celulas, max(1, orcamento // por_celula)))
+        self.logger.registrar_progresso(60, f"Motor NumPy em blocos de até {tamanho_bloco} células")
+
+        for inicio in range(0, n_celulas, tamanho_bloco):
+            fim = min(inicio + tamanho_bloco, n_celulas)
+            xi = self._ajustar_anisotropia(_coordenadas_eixos(gridx, gridy, inicio, fim), centro)
+
+            b = self._lado_direito(pontos_ajustados, xi)
+
+            if z_interp is not None:
+                z_interp.ravel()[inicio:fim] = sistema.pesos_duais @ b
+            if ss is not None:
+                ss.ravel()[inicio:fim] = -np.einsum("ij,ij->j", sistema.resolver(b), b)
+
+        return z_interp, ss
+
+    def _krigagem_esparsa(
+        self, gridx: np.ndarray, gridy: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Krigagem global com a matriz de covariância esparsa (motor esparso).
+
+        Com um variograma de suporte compacto, a covariância `C(h) = patamar - γ(h)`
+        é nula além do alcance: a matriz C (N, N) tem apenas os pares de pontos a
+        menos de um alcance um do outro, montados pela árvore KD sem a matriz de
+        distâncias completa, e é fatorada uma única vez por LU esparsa (SuperLU,
+        com reordenação de grau mínimo). A restrição da Krigagem Ordinária é
+        eliminada pelo complemento de Schur: com `a = C⁻¹ z` e `u = C⁻¹ 1`, a
+        estimativa em cada célula é `c0ᵀ a - (c0ᵀ u - 1) uᵀ z / 1ᵀ u` e custa apenas
+        os pontos dentro do alcance da célula (células sem pontos recebem a média
+        estimada). A variância `patamar - c0ᵀ C⁻¹ c0 + (c0ᵀ u - 1)² / 1ᵀ u` exige uma
+        resolução esparsa por célula e só é calculada quando pedida (ver `KrigagemConfig.saida`). Os
+        resultados coincidem com os do motor NumPy a menos de arredondamento.
+
+        Args:
+            gridx (np.ndarray): Coordenadas X da grade (nx,).
+            gridy (np.ndarray): Coordenadas Y da grade (ny,).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Grade interpolada e variância de estimativa,
+                shape (ny, nx); a saída dispensada é None.
+
+        Raises:
+            ValueError: Se o modelo de variograma não tiver suporte compacto ou se a
+                matriz de covariância for singular.
+        """
+        if self.variograma.modelo not in _MODELOS_SUPORTE_COMPACTO:
+            raise ValueError(
+                f"O motor esparso exige um variograma de suporte compacto "
+                f"({', '.join(_MODELOS_SUPORTE_COMPACTO)}), mas recebeu "
+                f"'{self.variograma.modelo}'"
+            )
+
+        gridx, gridy = np.ravel(gridx), np.ravel(gridy)
+        n_celulas = gridx.size * gridy.size
+        n_pontos = len(self.x)
+        psill, alcance, nugget = self.variograma.parametros
+        patamar = psill + nugget
+
+        pontos_ajustados, centro = self._pontos_isotropicos()
+        z_interp, ss = _alocar_saidas((gridy.size, gridx.size), self._saida())
+        sistema = self._sistema_esparso_fatorado(pontos_ajustados, patamar, alcance)
+
+        # Pares célula-ponto por célula (estimados pela densidade das amostras) e,
+        # para a variância, os lados direitos e soluções densos (N, B)
+        memoria_mb = self.config.max_memory_mb
+        orcamento = (memoria_mb if memoria_mb is not None else _MEMORIA_PADRAO_MB) * 2**20
+        por_celula = _ARRAYS_POR_PAR_ESPARSO * 8 * max(1.0, sistema.vizinhos_por_ponto)
+        if ss is not None:
+            por_celula += 2 * 8 * n_pontos
+        tamanho_bloco = int(min(n_celulas, max(1, orcamento // por_celula)))
+        self.logger.registrar_progresso(
+            60, f"Motor esparso em blocos de até {tamanho_bloco} células"
+        )
+
+        for inicio in range(0, n_celulas, tamanho_bloco):
+            fim = min(inicio + tamanho_bloco, n_celulas)
+            xi = self._ajustar_anisotropia(_coordenadas_eixos(gridx, gridy, inicio, fim), centro)
+
+            # Covariâncias (esparsas) entre as células do bloco e os pontos no alcance
+            pares = cKDTree(xi).sparse_distance_matrix(
+                sistema.arvore, alcance, output_type="ndarray"
+            )
+            celulas, pontos = pares["i"], pares["j"]
+            c0 = np.where(pares["v"] > _EPS, patamar - self.variograma.gamma(pares["v"]), patamar)
+
+            # Violação da restrição de não viés pelos pesos simples: c0ᵀ u - 1
+            c0u = np.bincount(
+                celulas, weights=c0 * sistema.pesos_media[pontos], minlength=fim - inicio
+            )
+            desvio = c0u.astype(float) - 1.0
+
+            if z_interp is not None:
+                c0a = np.bincount(
+                    celulas, weights=c0 * sistema.pesos_duais[pontos], minlength=fim - inicio
+                )
+                z_interp.ravel()[inicio:fim] = c0a - desvio * sistema.media
+            if ss is not None:
+                b = np.zeros((n_pontos, fim - inicio))
+                b[pontos, celulas] = c0
+                c0_c0 = np.einsum("ij,ij->j", b, sistema.lu.solve(b))
+                ss.ravel()[inicio:fim] = patamar - c0_c0 + desvio**2 / sistema.soma_pesos_media
+
+        return z_interp, ss
+
+    def validacao_cruzada(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Validação cruzada leave-one-out em forma fechada (atalho de Dubrule).
+
+        Com `C = A⁻¹` a inversa da matriz de Krigagem global e `w = C [z, 0]` os
+        pesos duais, o resíduo ao remover o ponto i é `z_i - ẑ_(-i) = w_i / C_ii` e a
+        variância de Krigagem correspondente é `1 / C_ii`. Todos os N resíduos saem
+        de uma única inversão, sem N novos ajustes; o variograma ajustado é mantido
+        fixo. A fatoração é compartilhada com o motor NumPy.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Resíduos `z_i - ẑ_(-i)` e variâncias de
+                Krigagem leave-one-out, shape (N,).
 
-            self.logger.registrar_progresso(
-                20, f"Parâmetros configurados: {self.config.modelo_variograma}"
+        Raises:
+            RuntimeError: Se `ajustar` não tiver sido chamado antes.
+            ValueError: Se o sistema de Krigagem for singular.
+        """
+        if self.variograma is None:
+            raise RuntimeError(
+                "Krigagem não ajustada: chame ajustar() antes de validacao_cruzada()"
             )
 
-            # Executa a Krigagem
-            try:
-                self.logger.registrar_progresso(30, "Iniciando cálculo do variograma")
-                ok = OrdinaryKriging(self.x, self.y, self.z, **kwargs)
-                self.logger.registrar_progresso(60, "Variograma calculado, iniciando interpolação")
+        n_pontos = len(self.x)
+        sistema = self._sistema_fatorado(self._pontos_isotropicos()[0], inversa=True)
+        diagonal = np.diag(sistema.inversa)[:n_pontos]
+        return sistema.pesos_duais[:n_pontos] / diagonal, 1.0 / diagonal
+
+    def adicionar_amostras(
+        self,
+        x: Union[list, np.ndarray],
+        y: Union[list, np.ndarray],
+        z: Union[list, np.ndarray],
+    ) -> "Krigagem":
+        """
+        Acrescenta amostras à Krigagem ajustada, sem refatorar o sistema global.
+
+        O variograma ajustado é mantido. Se o sistema global já estiver fatorado
+        (motor NumPy ou `validacao_cruzada`), a inversa da matriz de Krigagem é
+        atualizada pela fórmula da inversa em blocos (complemento de Schur das k
+        novas linhas), em O(N² k) em vez da fatoração O(N³). Nos demais motores, o
+        estado é reconstruído na próxima previsão.
 
-                z_interp, ss = ok.execute("grid", gridx, gridy)
+        Args:
+            x (list or np.ndarray): Coordenadas X das novas amostras.
+            y (list or np.ndarray): Coordenadas Y das novas amostras.
+            z (list or np.ndarray): Valores das novas amostras.
 
-                self.logger.registrar_progresso(90, "Interpolação concluída")
+        Returns:
+            Krigagem: A própria instância, para encadeamento com `prever`.
 
-                # Retorna com ou sem estatísticas conforme configuração
-                if self.config.enable_statistics:
-                    self.logger.concluir_interpolacao(
-                        f"Grade interpolada: {z_interp.shape}, com estatísticas"
-                    )
-                    return z_interp, ss
-                else:
-                    self.logger.concluir_interpolacao(f"Grade interpolada: {z_interp.shape}")
-                    return z_interp
+        Raises:
+            RuntimeError: Se `ajustar` não tiver sido chamado antes.
+            ValueError: Se as dimensões forem incompatíveis ou o sistema ampliado for
+                singular (amostra repetida com nugget nulo).
+        """
+        if self.variograma is None:
+            raise RuntimeError(
+                "Krigagem não ajustada: chame ajustar() antes de adicionar_amostras()"
+            )
+        x, y, z = (np.atleast_1d(np.asarray(v, dtype=float)) for v in (x, y, z))
+        if len(x) != len(y) or len(x) != len(z):
+            raise ValueError(f"Dimensões incompatíveis: x({len(x)}), y({len(y)}), z({len(z)})")
 
-            except Exception as e:
-                raise ValueError(f"Erro na execução da Krigagem: {str(e)}")
+        self.logger.iniciar_interpolacao(f"Adicionando {len(x)} amostra(s) a {len(self.x)} pontos")
+        try:
+            inversa = None
+            if self._sistema is not None:
+                inversa = self._inversa_ampliada(x, y)
+            self._atualizar_amostras(
+                np.append(self.x, x), np.append(self.y, y), np.append(self.z, z), inversa
+            )
+            self.logger.concluir_interpolacao(f"Pontos: {len(self.x)}")
+            return self
 
         except Exception as e:
             self.logger.registrar_erro(e)
             raise
+
+    def remover_amostras(self, indices: Union[int, list, np.ndarray]) -> "Krigagem":
+        """
+        Remove amostras da Krigagem ajustada, sem refatorar o sistema global.
+
+        O variograma ajustado é mantido. Se o sistema global já estiver fatorado, a
+        inversa sem as linhas removidas `R` é obtida por
+        `M_ss - M_sr M_rr⁻¹ M_rs`, em O(N² k).
+
+        Args:
+            indices (int, list or np.ndarray): Índices das amostras a remover.
+
+        Returns:
+            Krigagem: A própria instância, para encadeamento com `prever`.
+
+        Raises:
+            RuntimeError: Se `ajustar` não tiver sido chamado antes.
+            ValueError: Se algum índice for inválido ou restarem menos de 3 pontos.
+        """
+        if self.variograma is None:
+            raise RuntimeError("Krigagem não ajustada: chame ajustar() antes de remover_amostras()")
+        n_pontos = len(self.x)
+        removidos = np.unique(np.atleast_1d(indices))
+        if removidos.size and (removidos.min() < 0 or removidos.max() >= n_pontos):
+            raise ValueError(f"Índices devem estar entre 0 e {n_pontos - 1}")
+        if n_pontos - removidos.size < 3:
+            raise ValueError(
+                f"Krigagem requer pelo menos 3 pontos, mas restariam {n_pontos - removidos.size}"
+            )
+
+        self.logger.iniciar_interpolacao(
+            f"Removendo {removidos.size} amostra(s) de {n_pontos} pontos"
+        )
+        try:
+            mantidos = np.setdiff1d(np.arange(n_pontos + 1), removidos)
+            inversa = None
+            if self._sistema is not None:
+                inversa = self._sistema_fatorado(
+                    self._pontos_isotropicos()[0], inversa=True
+                ).inversa
+                m_sr = inversa[np.ix_(mantidos, removidos)]
+                m_rr = inversa[np.ix_(removidos, removidos)]
+                inversa = inversa[np.ix_(mantidos, mantidos)] - m_sr @ np.linalg.solve(m_rr, m_sr.T)
+
+            pontos = mantidos[:-1]
+            self._atualizar_amostras(self.x[pontos], self.y[pontos], self.z[pontos], inversa)
+            self.logger.concluir_interpolacao(f"Pontos: {len(self.x)}")
+            return self
+
+        except Exception as e:
+            self.logger.registrar_erro(e)
+            raise
+
+    def ranquear_candidatos(
+        self,
+        x_candidatos: Union[list, np.ndarray],
+        y_candidatos: Union[list, np.ndarray],
+        gridx: Union[np.ndarray, GradeRegular],
+        gridy: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Ordena locais candidatos a novas amostras pela redução da variância na grade.
+
+        Acrescentar uma amostra em `c` reduz a variância de Krigagem global no alvo
+        `t` de `(b_tᵀ M a_c + γ(t, c))² / σ²(c)`, em que `M` é a inversa da matriz
+        de Krigagem, `a_c` e `b_t` são os lados direitos de `c` e `t` e `σ²(c)` é a
+        variância atual em `c`. A redução de todos os candidatos em todas as células
+        é calculada por produtos de matrizes, sem novos ajustes, em blocos de
+        células dimensionados por `max_memory_mb`. A fatoração é compartilhada com
+        o motor NumPy.
+
+        Args:
+            x_candidatos (list or np.ndarray): Coordenadas X dos K candidatos.
+            y_candidatos (list or np.ndarray): Coordenadas Y dos K candidatos.
+            gridx (np.ndarray or GradeRegular): Coordenadas X da grade alvo, ou
+                `GradeRegular`.
+            gridy (np.ndarray, optional): Coordenadas Y da grade alvo (None se `gridx`
+                for uma GradeRegular).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Índices dos candidatos em ordem decrescente
+                de redução e a redução média da variância na grade de cada candidato,
+                shape (K,). Candidatos sobre amostras existentes têm redução nula.
+
+        Raises:
+            RuntimeError: Se `ajustar` não tiver sido chamado antes.
+            ValueError: Se as coordenadas dos candidatos forem incompatíveis.
+        """
+        if self.variograma is None:
+            raise RuntimeError(
+                "Krigagem não ajustada: chame ajustar() antes de ranquear_candidatos()"
+            )
+        x_candidatos = np.atleast_1d(np.asarray(x_candidatos, dtype=float))
+        y_candidatos = np.atleast_1d(np.asarray(y_candidatos, dtype=float))
+        if x_candidatos.shape != y_candidatos.shape:
+            raise ValueError(
+                f"Dimensões incompatíveis: x_candidatos({len(x_candidatos)}), "
+                f"y_candidatos({len(y_candidatos)})"
+            )
+        gridx, gridy = _eixos_grade(gridx, gridy)
+        gridx, gridy = np.ravel(gridx), np.ravel(gridy)
+        n_celulas = gridx.size * gridy.size
+
+        pontos_ajustados, centro = self._pontos_isotropicos()
+        inversa = self._sistema_fatorado(pontos_ajustados, inversa=True).inversa
+        candidatos = self._ajustar_anisotropia(
+            np.column_stack((x_candidatos, y_candidatos)), centro
+        )
+        m_a = inversa @ self._lado_direito(pontos_ajustados, candidatos)
+        variancia = -np.einsum("ij,ij->j", m_a, self._lado_direito(pontos_ajustados, candidatos))
+        informativos = variancia > _EPS
+
+        # Arrays (B, K) e (N + 1, B) de 8 bytes por célula do bloco
+        memoria_mb = self.config.max_memory_mb
+        orcamento = (memoria_mb if memoria_mb is not None else _MEMORIA_PADRAO_MB) * 2**20
+        por_celula = 8 * (3 * len(candidatos) + 2 * (len(pontos_ajustados) + 1))
+        tamanho_bloco = int(min(n_celulas, max(1, orcamento // por_celula)))
+
+        reducao = np.zeros(len(candidatos))
+        for inicio in range(0, n_celulas, tamanho_bloco):
+            fim = min(inicio + tamanho_bloco, n_celulas)
+            xi = self._ajustar_anisotropia(_coordenadas_eixos(gridx, gridy, inicio, fim), centro)
+
+            # b_tᵀ M a_c + γ(t, c) = b_tᵀ M a_c - (lado direito de c em t)
+            d = cdist(xi, candidatos)
+            covariancia = self._lado_direito(pontos_ajustados, xi).T @ m_a
+            covariancia -= np.where(d > _EPS, -self.variograma.gamma(d), 0.0)
+            reducao += np.einsum("ij,ij->j", covariancia, covariancia)
+
+        reducao = np.where(informativos, reducao / np.where(informativos, variancia, 1.0), 0.0)
+        reducao /= n_celulas
+        return np.argsort(-reducao, kind="stable"), reducao
+
+    def operador_pesos(
+        self, gridx: Union[np.ndarray, GradeRegular], gridy: Optional[np.ndarray] = None
+    ) -> OperadorPesos:
+        """
+        Exporta os pesos de Krigagem da grade como um operador linear.
+
+        Com a rede de pontos, o variograma e a grade fixos, os pesos de Krigagem
+        não dependem dos valores medidos; o operador retornado interpola novos
+        valores (campanhas de monitoramento, variáveis co-localizadas) ou uma pilha
+        (N, M) deles com um único produto matriz-vetor e pode ser salvo em disco.
+        Com vizinhança de busca, o operador é esparso (CSR), com até `n_neighbors`
+        pesos por célula; na Krigagem global, é denso (G, N), obtido da inversa do
+        sistema global compartilhada com o motor NumPy.
+
+        Args:
+            gridx (np.ndarray or GradeRegular): Coordenadas X da grade, ou `GradeRegular`.
+            gridy (np.ndarray, optional): Coordenadas Y da grade (None se `gridx` for uma
+                GradeRegular).
+
+        Returns:
+            OperadorPesos: Operador (G, N) com os pesos de cada célula; células sem
+                vizinhos recebem NaN na aplicação.
+
+        Raises:
+            RuntimeError: Se `ajustar` não tiver sido chamado antes.
+            ValueError: Se a grade for inválida ou o sistema de Krigagem for singular.
+
+        Example:
+            >>> krig = Krigagem(x, y, z, config=KrigagemConfig(n_neighbors=16)).ajustar()
+            >>> operador = krig.operador_pesos(grid_x, grid_y)
+            >>> operador.salvar("pesos_krigagem.npz")
+            >>> grades = operador.aplicar(np.column_stack((z_campanha1, z_campanha2)))
+        """
+        if self.variograma is None:
+            raise RuntimeError("Krigagem não ajustada: chame ajustar() antes de operador_pesos()")
+
+        self.logger.iniciar_interpolacao(
+            f"Operador de pesos - Pontos: {len(self.x)}, Grade: {np.shape(gridx)}"
+        )
+
+        try:
+            gridx, gridy = _eixos_grade(gridx, gridy)
+            gridx, gridy = np.ravel(gridx), np.ravel(gridy)
+            if self._usa_vizinhanca():
+                pesos, validos = self._pesos_vizinhanca(gridx, gridy)
+            else:
+                pesos, validos = self._pesos_globais(gridx, gridy)
+
+            self.logger.concluir_interpolacao(
+                f"Operador {pesos.shape} com {np.count_nonzero(validos)} células válidas"
+            )
+            return OperadorPesos(pesos, (gridy.size, gridx.size), validos)
+
+        except Exception as e:
+            self.logger.registrar_erro(e)
+            raise
+
+    def _pesos_vizinhanca(
+        self, gridx: np.ndarray, gridy: np.ndarray
+    ) -> Tuple[sparse.csr_matrix, np.ndarray]:
+        """
+        Pesos esparsos da Krigagem com vizinhança de busca.
+
+        Args:
+            gridx (np.ndarray): Coordenadas X da grade (nx,).
+            gridy (np.ndarray): Coordenadas Y da grade (ny,).
+
+        Returns:
+            Tuple[sparse.csr_matrix, np.ndarray]: Pesos (G, N) e máscara (G,) das
+                células com vizinhos.
+        """
+        n_celulas = gridx.size * gridy.size
+        tree, pontos_ajustados, centro, k, tamanho_bloco = self._plano_local(gridx, gridy)
+        funcao, parametros = self.variograma.funcao, self.variograma.parametros
+
+        pesos, indices, validos = [], [], []
+        for inicio in range(0, n_celulas, tamanho_bloco):
+            fim = min(inicio + tamanho_bloco, n_celulas)
+            x, _, idx, sem_vizinhos = self._pesos_locais(
+                tree,
+                pontos_ajustados,
+                _coordenadas_eixos(gridx, gridy, inicio, fim),
+                centro,
+                k,
+                funcao,
+                parametros,
+            )
+            pesos.append(x[:, :k].ravel())
+            indices.append(idx.ravel())
+            validos.append(~sem_vizinhos)
+
+        # k posições por célula; posições sem vizinho (peso zero) são descartadas
+        matriz = sparse.csr_matrix(
+            (np.concatenate(pesos), np.concatenate(indices), np.arange(n_celulas + 1) * k),
+            shape=(n_celulas, len(self.x)),
+        )
+        matriz.sum_duplicates()
+        matriz.eliminate_zeros()
+        return matriz, np.concatenate(validos)
+
+    def _pesos_globais(self, gridx: np.ndarray, gridy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pesos densos da Krigagem global, `(A⁻¹ b)[:N]` para cada célula.
+
+        Args:
+            gridx (np.ndarray): Coordenadas X da grade (nx,).
+            gridy (np.ndarray): Coordenadas Y da grade (ny,).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Pesos (G, N) e máscara (G,) das células
+                válidas (todas).
+        """
+        n_celulas = gridx.size * gridy.size
+        n_pontos = len(self.x)
+        pontos_ajustados, centro = self._pontos_isotropicos()
+        inversa = self._sistema_fatorado(pontos_ajustados, inversa=True).inversa
+
+        # Lado direito (N + 1, B) e pesos (B, N) por bloco, além do próprio operador
+        memoria_mb = self.config.max_memory_mb
+        orcamento = (memoria_mb if memoria_mb is not None else _MEMORIA_PADRAO_MB) * 2**20
+        tamanho_bloco = int(min(n_celulas, max(1, orcamento // (2 * 8 * (n_pontos + 1)))))
+
+        pesos = np.empty((n_celulas, n_pontos))
+        for inicio in range(0, n_celulas, tamanho_bloco):
+            fim = min(inicio + tamanho_bloco, n_celulas)
+            xi = self._ajustar_anisotropia(_coordenadas_eixos(gridx, gridy, inicio, fim), centro)
+            pesos[inicio:fim] = (inversa[:n_pontos] @ self._lado_direito(pontos_ajustados, xi)).T
+        return pesos, np.ones(n_celulas, dtype=bool)
+
+    def _inversa_ampliada(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Inversa da matriz de Krigagem global com k novas amostras (inversa em blocos).
+
+        Args:
+            x (np.ndarray): Coordenadas X das novas amostras (k,).
+            y (np.ndarray): Coordenadas Y das novas amostras (k,).
+
+        Returns:
+            np.ndarray: Inversa (N + k + 1, N + k + 1), com as novas amostras antes da
+                linha do multiplicador de Lagrange.
+
+        Raises:
+            ValueError: Se o sistema ampliado for singular.
+        """
+        pontos_ajustados, centro = self._pontos_isotropicos()
+        inversa = self._sistema_fatorado(pontos_ajustados, inversa=True).inversa
+        novos = self._ajustar_anisotropia(np.column_stack((x, y)), centro)
+        n_pontos, n_novos = len(pontos_ajustados), len(novos)
+
+        # Matriz [[A, B], [Bᵀ, D]] com as novas linhas por último
+        borda = self._lado_direito(pontos_ajustados, novos)
+        diagonal = -self.variograma.gamma(cdist(novos, novos))
+        np.fill_diagonal(diagonal, 0.0)
+
+        m_b = inversa @ borda
+        schur = diagonal - borda.T @ m_b
+        try:
+            schur_inv = np.linalg.inv(schur)
+        except np.linalg.LinAlgError as e:
+            raise ValueError(
+                "Erro na execução da Krigagem: sistema singular (pontos com coordenadas repetidas?)"
+            ) from e
+        m_b_s = m_b @ schur_inv
+
+        ampliada = np.block([[inversa + m_b_s @ m_b.T, -m_b_s], [-m_b_s.T, schur_inv]])
+
+        # Leva a linha do multiplicador de Lagrange de volta para o fim
+        ordem = np.r_[
+            np.arange(n_pontos), np.arange(n_pontos + 1, n_pontos + n_novos + 1), n_pontos
+        ]
+        return ampliada[np.ix_(ordem, ordem)]
+
+    def _atualizar_amostras(
+        self, x: np.ndarray, y: np.ndarray, z: np.ndarray, inversa: Optional[np.ndarray]
+    ) -> None:
+        """
+        Substitui as amostras, mantendo o variograma e o sistema global atualizado.
+
+        Args:
+            x (np.ndarray): Novas coordenadas X.
+            y (np.ndarray): Novas coordenadas Y.
+            z (np.ndarray): Novos valores.
+            inversa (np.ndarray, optional): Inversa atualizada da matriz de Krigagem,
+                ou None para fatorar o sistema na próxima previsão.
+        """
+        self.x, self.y, self.z = x, y, z
+        self._ok = None
+        self._sistema_esparso = None
+        self._sistema = None
+        if inversa is not None:
+            pesos_duais = inversa @ np.append(self.z.astype(float), 0.0)
+            self._sistema = _SistemaFatorado(None, pesos_duais, inversa)
+
+    def _lado_direito(self, pontos_ajustados: np.ndarray, xi: np.ndarray) -> np.ndarray:
+        """
+        Monta os lados direitos `[-γ(d), 1]` do sistema de Krigagem global.
+
+        Distância nula à amostra resulta em γ = 0, reproduzindo o valor medido.
+
+        Args:
+            pontos_ajustados (np.ndarray): Pontos (N, 2) no espaço isotrópico.
+            xi (np.ndarray): Alvos (B, 2) no espaço isotrópico.
+
+        Returns:
+            np.ndarray: Lados direitos (N + 1, B).
+        """
+        n_pontos = len(pontos_ajustados)
+        d = cdist(pontos_ajustados, xi)
+        b = np.empty((n_pontos + 1, len(xi)))
+        b[:n_pontos] = np.where(d > _EPS, -self.variograma.gamma(d), 0.0)
+        b[n_pontos] = 1.0
+        return b
+
+    def _pontos_isotropicos(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Leva os pontos amostrados ao espaço isotrópico.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Pontos ajustados (N, 2) e o centro (2,) do
+                retângulo envolvente dos pontos originais.
+        """
+        pontos = np.column_stack((self.x, self.y)).astype(float)
+        centro = (pontos.max(axis=0) + pontos.min(axis=0)) / 2
+        return self._ajustar_anisotropia(pontos, centro), centro
+
+    def _sistema_fatorado(self, pontos_ajustados: np.ndarray, inversa: bool) -> "_SistemaFatorado":
+        """
+        Retorna o sistema global fatorado, calculando-o na primeira chamada.
+
+        Args:
+            pontos_ajustados (np.ndarray): Pontos (N, 2) no espaço isotrópico.
+            inversa (bool): Se True, garante que a inversa da matriz esteja calculada.
+
+        Returns:
+            _SistemaFatorado: Sistema fatorado reaproveitado até o próximo `ajustar`.
+        """
+        n_pontos = len(pontos_ajustados)
+        if self._sistema is None:
+            self.logger.registrar_progresso(30, f"Fatorando o sistema de {n_pontos + 1} equações")
+            self._sistema = self._fatorar_sistema(pontos_ajustados)
+        if inversa and self._sistema.inversa is None:
+            self._sistema.inversa = lu_solve(self._sistema.lu, np.eye(n_pontos + 1))
+        return self._sistema
+
+    def _fatorar_sistema(self, pontos_ajustados: np.ndarray) -> "_SistemaFatorado":
+        """
+        Monta e fatora por LU a matriz de Krigagem Ordinária global.
+
+        Args:
+            pontos_ajustados (np.ndarray): Pontos (N, 2) no espaço isotrópico.
+
+        Returns:
+            _SistemaFatorado: Fatoração LU e pesos duais da estimativa.
+
+        Raises:
+            ValueError: Se o sistema de Krigagem for singular.
+        """
+        n_pontos = len(pontos_ajustados)
+        a = np.ones((n_pontos + 1, n_pontos + 1))
+        a[:n_pontos, :n_pontos] = -self.variograma.gamma(cdist(pontos_ajustados, pontos_ajustados))
+        np.fill_diagonal(a, 0.0)
+
+        lu = lu_factor(a, check_finite=False)
+        if not np.all(np.diag(lu[0])):
+            raise ValueError(
+                "Erro na execução da Krigagem: sistema singular (pontos com coordenadas repetidas?)"
+            )
+        return _SistemaFatorado(lu, lu_solve(lu, np.append(self.z.astype(float), 0.0)))
+
+    def _sistema_esparso_fatorado(
+        self, pontos_ajustados: np.ndarray, patamar: float, alcance: float
+    ) -> "_SistemaEsparso":
+        """
+        Monta e fatora a matriz de covariância esparsa na primeira chamada.
+
+        Args:
+            pontos_ajustados (np.ndarray): Pontos (N, 2) no espaço isotrópico.
+            patamar (float): Patamar total do variograma (psill + nugget).
+            alcance (float): Alcance do variograma.
+
+        Returns:
+            _SistemaEsparso: Sistema fatorado reaproveitado até o próximo `ajustar`.
+
+        Raises:
+            ValueError: Se a matriz de covariância for singular.
+        """
+        if self._sistema_esparso is not None:
+            return self._sistema_esparso
+
+        n_pontos = len(pontos_ajustados)
+        arvore = cKDTree(pontos_ajustados)
+        pares = arvore.sparse_distance_matrix(arvore, alcance, output_type="ndarray")
+        linhas, colunas = pares["i"], pares["j"]
+
+        # Mesmas convenções da matriz do motor NumPy: γ(0) = 0 apenas na diagonal
+        covariancias = patamar - self.variograma.gamma(pares["v"])
+        covariancias[linhas == colunas] = patamar
+        matriz = sparse.csc_matrix((covariancias, (linhas, colunas)), shape=(n_pontos, n_pontos))
+        self.logger.registrar_progresso(
+            30, f"Fatorando a matriz esparsa {n_pontos}x{n_pontos} com {matriz.nnz} elementos"
+        )
+
+        try:
+            # C é simétrica e positiva definida: ordenação simétrica, pivôs na diagonal
+            lu = splu(
+                matriz,
+                permc_spec="MMD_AT_PLUS_A",
+                diag_pivot_thresh=0.0,
+                options={"SymmetricMode": True},
+            )
+        except RuntimeError as e:
+            raise ValueError(
+                "Erro na execução da Krigagem: matriz de covariância singular "
+                "(pontos com coordenadas repetidas e nugget nulo?)"
+            ) from e
+
+        solucoes = lu.solve(np.column_stack((self.z.astype(float), np.ones(n_pontos))))
+        pesos_duais, pesos_media = solucoes[:, 0], solucoes[:, 1]
+        soma_pesos_media = float(pesos_media.sum())
+        self._sistema_esparso = _SistemaEsparso(
+            lu=lu,
+            arvore=arvore,
+            pesos_duais=pesos_duais,
+            pesos_media=pesos_media,
+            soma_pesos_media=soma_pesos_media,
+            media=float(pesos_media @ self.z) / soma_pesos_media,
+            vizinhos_por_ponto=matriz.nnz / n_pontos,
+        )
+        return self._sistema_esparso
+
+    def _plano_execucao(self, n_celulas: int) -> Tuple[str, int]:
+        """
+        Escolhe o backend do PyKrige e o tamanho dos blocos da grade.
+
+        O backend vetorizado aloca cerca de `_ARRAYS_POR_CELULA_VETORIZADO` arrays
+        (G, N + 1) e os backends em laço cerca de `_ARRAYS_POR_CELULA_LACO`, além das
+        matrizes (N + 1)² de Krigagem. A grade é dividida em blocos que cabem no
+        orçamento; no modo 'auto', usa o vetorizado se os blocos tiverem ao menos
+        `_CELULAS_MINIMAS_VETORIZADO` células e o laço caso contrário.
+
+        Args:
+            n_celulas (int): Número de células da grade.
+
+        Returns:
+            Tuple[str, int]: Backend e número máximo de células por bloco.
+
+        Raises:
+            ValueError: Se o backend configurado for inválido.
+        """
+        backend = self.config.backend
+        if backend not in _BACKENDS:
+            raise ValueError(f"Backend '{backend}' inválido. Opções: {', '.join(_BACKENDS)}")
+
+        memoria_mb = self.config.max_memory_mb
+        if memoria_mb is None and backend != "auto":
+            # Backend explícito sem orçamento: grade inteira de uma vez
+            return backend, n_celulas
+
+        n_pontos = len(self.x)
+        orcamento = (memoria_mb if memoria_mb is not None else _MEMORIA_PADRAO_MB) * 2**20
+        disponivel = max(orcamento - 2 * 8 * (n_pontos + 1) ** 2, 0)
+        por_celula_vetorizado = _ARRAYS_POR_CELULA_VETORIZADO * 8 * (n_pontos + 1)
+
+        if backend == "auto":
+            minimo = min(n_celulas, _CELULAS_MINIMAS_VETORIZADO)
+            backend = "vectorized" if disponivel >= minimo * por_celula_vetorizado else "loop"
+
+        if backend == "vectorized":
+            por_celula = por_celula_vetorizado
+        else:
+            por_celula = _ARRAYS_POR_CELULA_LACO * 8 * (n_pontos + 1)
+        return backend, int(min(n_celulas, max(1, disponivel // por_celula)))
+
+    def _krigagem_local(
+        self, gridx: np.ndarray, gridy: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Krigagem com vizinhança de busca: um sistema local pequeno por célula.
+
+        Para cada célula são selecionados até `n_neighbors` pontos dentro de
+        `max_distance` (na elipse de anisotropia, se `anisotropic_search`), e o sistema
+        de Krigagem Ordinária desses pontos é resolvido. Os sistemas de um bloco de
+        células são montados com tamanho fixo k + 1 (posições sem vizinho recebem
+        peso zero) e resolvidos de uma vez com `np.linalg.solve`. O custo é
+        O(G x k³), independente do número total de pontos.
+
+        Args:
+            gridx (np.ndarray): Coordenadas X da grade (nx,).
+            gridy (np.ndarray): Coordenadas Y da grade (ny,).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Grade interpolada e variância de estimativa,
+                shape (ny, nx); a saída dispensada é None. Células sem vizinhos recebem NaN.
+
+        Raises:
+            ValueError: Se n_neighbors ou max_distance forem inválidos.
+        """
+        gridx, gridy = np.ravel(gridx), np.ravel(gridy)
+        n_celulas = gridx.size * gridy.size
+        coordenadas = partial(_coordenadas_eixos, gridx, gridy)
+        tree, pontos_ajustados, centro, k, tamanho_bloco = self._plano_local(gridx, gridy)
+        funcao, parametros = self.variograma.funcao, self.variograma.parametros
+
+        z_interp, ss = _alocar_saidas((gridy.size, gridx.size), self._saida())
+        for inicio in range(0, n_celulas, tamanho_bloco):
+            fim = min(inicio + tamanho_bloco, n_celulas)
+            xi = coordenadas(inicio, fim)
+            z_bloco, ss_bloco = self._krigar_bloco(
+                tree, pontos_ajustados, xi, centro, k, funcao, parametros
+            )
+            if z_interp is not None:
+                z_interp.ravel()[inicio:fim] = z_bloco
+            if ss is not None:
+                ss.ravel()[inicio:fim] = ss_bloco
+
+        return z_interp, ss
+
+    def _plano_local(
+        self, gridx: np.ndarray, gridy: np.ndarray
+    ) -> Tuple[cKDTree, np.ndarray, np.ndarray, int, int]:
+        """
+        Prepara a busca de vizinhos e o tamanho dos blocos da Krigagem local.
+
+        Args:
+            gridx (np.ndarray): Coordenadas X da grade (nx,).
+            gridy (np.ndarray): Coordenadas Y da grade (ny,).
+
+        Returns:
+            Tuple[cKDTree, np.ndarray, np.ndarray, int, int]: Árvore de busca, pontos
+                (N, 2) no espaço isotrópico, centro (2,) do retângulo envolvente,
+                tamanho k dos sistemas locais e número de células por bloco.
+
+        Raises:
+            ValueError: Se n_neighbors ou max_distance forem inválidos.
+        """
+        n_neighbors, max_distance = self.config.n_neighbors, self.config.max_distance
+        if n_neighbors is not None and n_neighbors < 1:
+            raise ValueError(f"n_neighbors deve ser >= 1, mas recebeu {n_neighbors}")
+        if max_distance is not None and max_distance <= 0:
+            raise ValueError(f"max_distance deve ser positivo, mas recebeu {max_distance}")
+
+        n_celulas = gridx.size * gridy.size
+        coordenadas = partial(_coordenadas_eixos, gridx, gridy)
+
+        # Coordenadas no espaço isotrópico (rotação e escala da anisotropia)
+        pontos = np.column_stack((self.x, self.y)).astype(float)
+        centro = (pontos.max(axis=0) + pontos.min(axis=0)) / 2
+        pontos_ajustados = self._ajustar_anisotropia(pontos, centro)
+
+        # A busca usa a elipse de anisotropia (espaço ajustado) ou um círculo
+        tree = cKDTree(pontos_ajustados if self.config.anisotropic_search else pontos)
+
+        if n_neighbors is None:
+            # Todos os pontos dentro do raio: k é a maior contagem da grade
+            k = 1
+            for inicio in range(0, n_celulas, _CELULAS_CONTAGEM):
+                xi = coordenadas(inicio, min(inicio + _CELULAS_CONTAGEM, n_celulas))
+                contagens = tree.query_ball_point(
+                    self._coordenadas_busca(xi, centro), max_distance, return_length=True
+                )
+                k = max(k, int(contagens.max()))
+        else:
+            k = min(n_neighbors, len(pontos))
+
+        if self.config.max_memory_mb is not None:
+            bytes_por_celula = _ARRAYS_POR_SISTEMA_LOCAL * 8 * (k + 1) ** 2
+            tamanho_bloco = max(1, int(self.config.max_memory_mb * 2**20 // bytes_por_celula))
+        else:
+            tamanho_bloco = max(1, _ELEMENTOS_BLOCO_LOCAL // (k + 1) ** 2)
+        self.logger.registrar_progresso(
+            40, f"Resolvendo sistemas locais de {k} vizinhos em blocos de {tamanho_bloco} células"
+        )
+        return tree, pontos_ajustados, centro, k, tamanho_bloco
+
+    def _ajustar_anisotropia(self, xy: np.ndarray, centro: np.ndarray) -> np.ndarray:
+        """
+        Leva coordenadas ao espaço isotrópico, como o PyKrige.
+
+        Gira as coordenadas de `-anisotropy_angle` em torno do centro dos pontos e
+        multiplica o eixo menor por `anisotropy_ratio`.
+
+        Args:
+            xy (np.ndarray): Array (B, 2) de coordenadas.
+            centro (np.ndarray): Centro (2,) do retângulo envolvente dos pontos.
+
+        Returns:
+            np.ndarray: Array (B, 2) de coordenadas ajustadas.
+        """
+        angulo = np.deg2rad(self.config.anisotropy_angle)
+        cos, sen = np.cos(-angulo), np.sin(-angulo)
+        dx = xy[:, 0] - centro[0]
+        dy = xy[:, 1] - centro[1]
+        return np.column_stack(
+            (
+                cos * dx - sen * dy + centro[0],
+                (sen * dx + cos * dy) * self.config.anisotropy_ratio + centro[1],
+            )
+        )
+
+    def _coordenadas_busca(self, xi: np.ndarray, centro: np.ndarray) -> np.ndarray:
+        """
+        Converte coordenadas de células para o espaço da árvore de busca.
+
+        Args:
+            xi (np.ndarray): Array (B, 2) de coordenadas originais.
+            centro (np.ndarray): Centro (2,) do retângulo envolvente dos pontos.
+
+        Returns:
+            np.ndarray: Coordenadas ajustadas (busca elíptica) ou as originais.
+        """
+        return self._ajustar_anisotropia(xi, centro) if self.config.anisotropic_search else xi
+
+    def _krigar_bloco(
+        self,
+        tree: cKDTree,
+        pontos_ajustados: np.ndarray,
+        xi: np.ndarray,
+        centro: np.ndarray,
+        k: int,
+        funcao: Callable,
+        parametros: list,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Resolve os sistemas locais de Krigagem Ordinária de um bloco de células.
+
+        Args:
+            tree (cKDTree): Árvore de busca dos pontos.
+            pontos_ajustados (np.ndarray): Pontos (N, 2) no espaço isotrópico.
+            xi (np.ndarray): Array (B, 2) com as coordenadas das células.
+            centro (np.ndarray): Centro (2,) do retângulo envolvente dos pontos.
+            k (int): Número de vizinhos (tamanho do sistema local).
+            funcao (Callable): Função do variograma `gamma(parametros, distancias)`.
+            parametros (list): Parâmetros do variograma.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Estimativas e variâncias (B,); NaN nas
+                células sem vizinhos e None na saída dispensada.
+        """
+        x, b, idx, sem_vizinhos = self._pesos_locais(
+            tree, pontos_ajustados, xi, centro, k, funcao, parametros
+        )
+        z_bloco, ss_bloco = None, None
+        saida = self._saida()
+        if saida != "variancia":
+            z_bloco = (x[:, :k] * self.z[idx]).sum(axis=1)
+            z_bloco[sem_vizinhos] = np.nan
+        if saida != "estimativa":
+            ss_bloco = -(x * b).sum(axis=1)
+            ss_bloco[sem_vizinhos] = np.nan
+        return z_bloco, ss_bloco
+
+    def _pesos_locais(
+        self,
+        tree: cKDTree,
+        pontos_ajustados: np.ndarray,
+        xi: np.ndarray,
+        centro: np.ndarray,
+        k: int,
+        funcao: Callable,
+        parametros: list,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Monta e resolve os sistemas locais de um bloco de células.
+
+        Args:
+            tree (cKDTree): Árvore de busca dos pontos.
+            pontos_ajustados (np.ndarray): Pontos (N, 2) no espaço isotrópico.
+            xi (np.ndarray): Array (B, 2) com as coordenadas das células.
+            centro (np.ndarray): Centro (2,) do retângulo envolvente dos pontos.
+            k (int): Número de vizinhos (tamanho do sistema local).
+            funcao (Callable): Função do variograma `gamma(parametros, distancias)`.
+            parametros (list): Parâmetros do variograma.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Soluções (B, k + 1)
+                (pesos dos vizinhos e multiplicador de Lagrange), lados direitos
+                (B, k + 1), índices (B, k) dos vizinhos (0 nas posições sem vizinho,
+                que têm peso zero) e máscara (B,) das células sem vizinhos.
+        """
+        n_pontos = len(pontos_ajustados)
+        limite = np.inf
+        if self.config.max_distance is not None:
+            limite = np.nextafter(self.config.max_distance, np.inf)
+        _, idx = tree.query(self._coordenadas_busca(xi, centro), k=k, distance_upper_bound=limite)
+        idx = idx.reshape(len(xi), k)
+        validos = idx < n_pontos
+        idx = np.where(validos, idx, 0)
+        pares = validos[:, :, np.newaxis] & validos[:, np.newaxis, :]
+
+        # Distâncias no espaço isotrópico: vizinho-vizinho (B, k, k) e célula-vizinho (B, k)
+        vizinhos = pontos_ajustados[idx]
+        d_pontos = np.sqrt(
+            ((vizinhos[:, :, np.newaxis, :] - vizinhos[:, np.newaxis, :, :]) ** 2).sum(axis=-1)
+        )
+        d_celula = np.sqrt(
+            ((vizinhos - self._ajustar_anisotropia(xi, centro)[:, np.newaxis, :]) ** 2).sum(axis=-1)
+        )
+
+        # Matriz de Krigagem [[-gamma, 1], [1, 0]] com diagonal nula; posições sem
+        # vizinho viram linhas da identidade, com peso zero na solução
+        a = np.zeros((len(xi), k + 1, k + 1))
+        a[:, :k, :k] = np.where(pares, -funcao(parametros, d_pontos), 0.0)
+        diagonal = np.arange(k)
+        a[:, diagonal, diagonal] = np.where(validos, 0.0, 1.0)
+        a[:, :k, k] = validos
+        a[:, k, :k] = validos
+        sem_vizinhos = ~validos.any(axis=1)
+        a[:, k, k] = sem_vizinhos
+
+        # Lado direito; distância nula à amostra reproduz o valor medido
+        b = np.zeros((len(xi), k + 1))
+        b[:, :k] = np.where(validos & (d_celula > _EPS), -funcao(parametros, d_celula), 0.0)
+        b[:, k] = 1.0
+
+        x = np.linalg.solve(a, b[:, :, np.newaxis])[:, :, 0]
+        return x, b, idx, sem_vizinhos
+
+
+def _inicializar_processo(
+    x: np.ndarray,
+    y: np.ndarray,
+    z: np.ndarray,
+    config: KrigagemConfig,
+    variograma: VariogramaAjustado,
+) -> None:
+    """
+    Cria, uma vez por processo, o interpolador com o variograma já ajustado.
+
+    Args:
+        x (np.ndarray): Coordenadas X dos pontos amostrados.
+        y (np.ndarray): Coordenadas Y dos pontos amostrados.
+        z (np.ndarray): Valores associados aos pontos.
+        config (KrigagemConfig): Configuração da Krigagem (com n_jobs=1).
+        variograma (VariogramaAjustado): Variograma ajustado no processo principal.
+    """
+    global _krigagem_processo
+    _krigagem_processo = Krigagem(x, y, z, config=config)
+    _krigagem_processo.variograma = variograma
+
+
+def _krigar_faixa(gridx: np.ndarray, gridy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Executa a Krigagem de uma faixa da grade no processo atual.
+
+    Args:
+        gridx (np.ndarray): Coordenadas X da grade (nx,).
+        gridy (np.ndarray): Coordenadas Y das linhas da faixa.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Estimativas e variâncias da faixa.
+    """
+    return _krigagem_processo._executar(gridx, gridy)
+
+
+def _alocar_saidas(
+    shape: Tuple[int, int], saida: str
+) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Aloca apenas as grades de saída pedidas.
+
+    Args:
+        shape (Tuple[int, int]): Formato (ny, nx) da grade.
+        saida (str): 'estimativa', 'variancia' ou 'ambos'.
+
+    Returns:
+        Tuple[Optional[np.ndarray], Optional[np.ndarray]]: Grades da estimativa e da
+            variância, ou None para a saída dispensada.
+    """
+    z_interp = np.empty(shape) if saida != "variancia" else None
+    ss = np.empty(shape) if saida != "estimativa" else None
+    return z_interp, ss
+
+
+def _selecionar_saidas(
+    z_interp: np.ndarray, ss: np.ndarray, saida: str
+) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Descarta a saída dispensada de um resultado que contém ambas.
+
+    Args:
+        z_interp (np.ndarray): Grade interpolada.
+        ss (np.ndarray): Variância de estimativa.
+        saida (str): 'estimativa', 'variancia' ou 'ambos'.
+
+    Returns:
+        Tuple[Optional[np.ndarray], Optional[np.ndarray]]: Grades pedidas, ou None
+            para a saída dispensada.
+    """
+    return (
+        z_interp if saida != "variancia" else None,
+        ss if saida != "estimativa" else None,
+    )
+
+
+def _coordenadas_eixos(gridx: np.ndarray, gridy: np.ndarray, inicio: int, fim: int) -> np.ndarray:
+    """
+    Gera as coordenadas das células [inicio, fim) de uma grade definida por eixos.
+
+    Args:
+        gridx (np.ndarray): Coordenadas X das colunas (nx,).
+        gridy (np.ndarray): Coordenadas Y das linhas (ny,).
+        inicio (int): Primeira célula (ordem achatada, linha a linha).
+        fim (int): Célula final (exclusiva).
+
+    Returns:
+        np.ndarray: Array (fim - inicio, 2) com as coordenadas (x, y).
+    """
+    linha, coluna = np.divmod(np.arange(inicio, fim), gridx.size)
+    return np.column_stack((gridx[coluna], gridy[linha]))
+
+
+def _eixos_grade(
+    gridx: Union[np.ndarray, GradeRegular], gridy: Optional[np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Valida a grade e a converte nos eixos X e Y usados pelo PyKrige.
+
+    Uma GradeRegular e um par de meshgrids (2D) são reduzidos aos seus eixos.
+
+    Args:
+        gridx (np.ndarray or GradeRegular): Coordenadas X da grade (eixo ou meshgrid)
+            ou grade regular.
+        gridy (np.ndarray, optional): Coordenadas Y da grade (None para GradeRegular).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Coordenadas X e Y da grade.
+
+    Raises:
+        ValueError: Se as grades X e Y tiverem formatos diferentes.
+        ValueError: Se `gridy` for informado junto com uma GradeRegular.
+        ValueError: Se grades 2D não formarem um meshgrid.
+    """
+    if not isinstance(gridx, GradeRegular):
+        if gridy is None or gridx.shape != gridy.shape:
+            raise ValueError(
+                f"Grades X e Y devem ter o mesmo formato, mas têm formatos "
+                f"{gridx.shape} e {np.shape(gridy)}"
+            )
+        if gridx.ndim == 2:
+            eixo_x, eixo_y = gridx[0], gridy[:, 0]
+            if np.any(gridx != eixo_x) or np.any(gridy != eixo_y[:, np.newaxis]):
+                raise ValueError("Grades 2D devem ser um meshgrid de eixos X e Y")
+            return eixo_x, eixo_y
+        return gridx, gridy
+    if gridy is not None:
+        raise ValueError("gridy deve ser None quando gridx é uma GradeRegular")
+    return gridx.eixo_x(), gridx.eixo_y()
@@ -0,0 +1,495 @@
+"""
+Traçado de linhas de fluxo (rastreamento de partículas) sobre o campo de fluxo.
+
+O `ModeloPotenciometrico` fornece os vetores de fluxo em cada célula da grade.
+Este módulo advecta milhares de pontos iniciais ao mesmo tempo por esse campo:
+a velocidade em cada posição é obtida por interpolação bilinear e todos os
+pontos ativos avançam juntos, em um único lote NumPy por passo, por Runge-Kutta
+de 4ª ordem com passo fixo ou Dormand-Prince 5(4) com passo adaptativo por
+ponto.
+
+As linhas são parametrizadas pelo comprimento de arco (a direção do fluxo é
+normalizada), de modo que o passo e o comprimento máximo são distâncias nas
+unidades da grade. O traçado a montante (contra o fluxo) parte de poços e
+delimita as suas zonas de captura.
+
+Características principais:
+- Interpolação bilinear vetorizada do campo (aceita arrays mapeados em disco)
+- Runge-Kutta 4 (passo fixo) ou Dormand-Prince 5(4) (passo adaptativo)
+- Traçado a jusante ou a montante
+- Critérios de parada: borda da grade, estagnação, comprimento máximo e passos
+- Saída compacta: coordenadas concatenadas e deslocamentos de cada linha
+
+Classes:
+    - LinhasFluxo: Linhas de fluxo traçadas, em arrays compactos.
+
+Funções:
+    - tracar_linhas_fluxo: Traça as linhas de fluxo a partir dos pontos iniciais.
+
+Dependências:
+    - numpy: Para operações numéricas eficientes
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np  # noqa: F401
+
+from utils.grid_utils import GradeRegular
+from utils.logging_utils import InterpoladorLogger
+
+# Motivos de parada, na ordem dos códigos de `LinhasFluxo.motivo`
+MOTIVOS_PARADA = ("borda", "estagnacao", "comprimento", "passos")
+_BORDA, _ESTAGNACAO, _COMPRIMENTO, _PASSOS = range(len(MOTIVOS_PARADA))
+_ATIVO = -1
+
+# Passo padrão como fração do menor espaçamento da grade
+_FRACAO_PASSO = 0.5
+
+# Tolerância padrão do passo adaptativo como fração do menor espaçamento da grade
+_FRACAO_TOLERANCIA = 1e-4
+
+# Limites da variação do passo adaptativo a cada tentativa e menor passo relativo
+_FATOR_MIN, _FATOR_MAX, _PASSO_MIN_RELATIVO = 0.2, 5.0, 1e-3
+
+# Deslocamento mínimo de um passo completo, relativo ao passo: com a direção
+# normalizada, um deslocamento menor indica que os estágios se anulam em torno
+# de um ponto de mínimo ou máximo da superfície
+_DESLOCAMENTO_MIN_RELATIVO = 0.5
+
+
+@dataclass(frozen=True)
+class _TabelaRK:
+    """Coeficientes de um método de Runge-Kutta explícito para um campo autônomo."""
+
+    a: Tuple[Tuple[float, ...], ...]
+    b: Tuple[float, ...]
+    b_erro: Optional[Tuple[float, ...]] = None
+
+
+_METODOS = {
+    "rk4": _TabelaRK(a=((0.5,), (0.0, 0.5), (0.0, 0.0, 1.0)), b=(1 / 6, 1 / 3, 1 / 3, 1 / 6)),
+    "rk45": _TabelaRK(
+        a=(
+            (1 / 5,),
+            (3 / 40, 9 / 40),
+            (44 / 45, -56 / 15, 32 / 9),
+            (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+            (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+            (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+        ),
+        b=(35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0),
+        # Diferença entre os pesos de 5ª e de 4ª ordem
+        b_erro=(
+            35 / 384 - 5179 / 57600,
+            0.0,
+            500 / 1113 - 7571 / 16695,
+            125 / 192 - 393 / 640,
+            -2187 / 6784 + 92097 / 339200,
+            11 / 84 - 187 / 2100,
+            -1 / 40,
+        ),
+    ),
+}
+
+
+@dataclass
+class LinhasFluxo:
+    """
+    Linhas de fluxo traçadas, armazenadas como arrays compactos.
+
+    As coordenadas de todas as linhas são concatenadas em `x` e `y`; a linha i
+    ocupa as posições `inicio[i]:inicio[i + 1]`, do ponto inicial ao ponto de
+    parada.
+
+    Args:
+        x (np.ndarray): Coordenadas X concatenadas de todas as linhas.
+        y (np.ndarray): Coordenadas Y concatenadas de todas as linhas.
+        inicio (np.ndarray): Deslocamentos (S + 1,) de cada linha em `x` e `y`.
+        motivo (np.ndarray): Código (S,) do motivo de parada, índice em `MOTIVOS_PARADA`.
+        comprimento (np.ndarray): Comprimento (S,) de cada linha.
+
+    Example:
+        >>> linhas = tracar_linhas_fluxo(fx, fy, grade, x_poco, y_poco, sentido="montante")
+        >>> x_linha, y_linha = linhas.trajetoria(0)
+        >>> MOTIVOS_PARADA[linhas.motivo[0]]
+        'borda'
+    """
+
+    x: np.ndarray
+    y: np.ndarray
+    inicio: np.ndarray
+    motivo: np.ndarray
+    comprimento: np.ndarray
+
+    def __len__(self) -> int:
+        """Retorna o número de linhas de fluxo."""
+        return len(self.motivo)
+
+    def trajetoria(self, indice: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retorna as coordenadas de uma linha de fluxo.
+
+        Args:
+            indice (int): Índice da linha (do ponto inicial correspondente).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Coordenadas X e Y da linha (visões dos arrays).
+        """
+        trecho = slice(self.inicio[indice], self.inicio[indice + 1])
+        return self.x[trecho], self.y[trecho]
+
+    def pontos_finais(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retorna o ponto de parada de cada linha.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Coordenadas X e Y (S,) dos pontos finais.
+        """
+        ultimos = self.inicio[1:] - 1
+        return self.x[ultimos], self.y[ultimos]
+
+
+@dataclass
+class _CampoBilinear:
+    """Campo de fluxo (fx, fy) sobre uma grade regular, interpolado bilinearmente."""
+
+    fx: np.ndarray
+    fy: np.ndarray
+    grade: GradeRegular
+
+    def indices(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Converte coordenadas em índices fracionários (coluna, linha) da grade."""
+        return (x - self.grade.x0) / self.grade.dx, (y - self.grade.y0) / self.grade.dy
+
+    def dentro(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Indica os pontos dentro da grade (incluindo a borda)."""
+        u, v = self.indices(x, y)
+        return (u >= 0) & (u <= self.grade.nx - 1) & (v >= 0) & (v <= self.grade.ny - 1)
+
+    def interpolar(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Interpola o fluxo nos pontos; pontos fora da grade usam o valor da borda."""
+        u, v = self.indices(x, y)
+        u = np.clip(u, 0, self.grade.nx - 1)
+        v = np.clip(v, 0, self.grade.ny - 1)
+        j = np.minimum(u.astype(np.intp), self.grade.nx - 2)
+        i = np.minimum(v.astype(np.intp), self.grade.ny - 2)
+        tu, tv = u - j, v - i
+        pesos = ((1 - tu) * (1 - tv), tu * (1 - tv), (1 - tu) * tv, tu * tv)
+        cantos = ((i, j), (i, j + 1), (i + 1, j), (i + 1, j + 1))
+        vx = sum(p * self.fx[c] for p, c in zip(pesos, cantos))
+        vy = sum(p * self.fy[c] for p, c in zip(pesos, cantos))
+        return vx, vy
+
+    def direcao(
+        self, x: np.ndarray, y: np.ndarray, sinal: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Retorna a direção unitária do fluxo (vezes `sinal`) e a velocidade nos pontos.
+
+        Pontos com velocidade nula ou inválida recebem direção nula.
+        """
+        vx, vy = self.interpolar(x, y)
+        velocidade = np.hypot(vx, vy)
+        valida = np.isfinite(velocidade) & (velocidade > 0)
+        escala = np.divide(sinal, velocidade, out=np.zeros_like(velocidade), where=valida)
+        return (
+            np.where(valida, vx * escala, 0.0),
+            np.where(valida, vy * escala, 0.0),
+            np.where(valida, velocidade, 0.0),
+        )
+
+
+def tracar_linhas_fluxo(
+    fx: np.ndarray,
+    fy: np.ndarray,
+    grade: GradeRegular,
+    x_inicio: Sequence[float],
+    y_inicio: Sequence[float],
+    passo: Optional[float] = None,
+    comprimento_max: float = np.inf,
+    max_passos: Optional[int] = None,
+    sentido: str = "jusante",
+    metodo: str = "rk4",
+    tolerancia: Optional[float] = None,
+    velocidade_minima: float = 0.0,
+    verbose: bool = False,
+    arquivo_log: Optional[str] = None,
+) -> LinhasFluxo:
+    """
+    Traça as linhas de fluxo que partem dos pontos iniciais.
+
+    Todos os pontos ativos avançam juntos a cada passo. Uma linha termina quando
+    sai da grade (o último ponto é a interseção com a borda), quando estagna
+    (velocidade até `velocidade_minima`, ou inversão de sentido ao atingir um
+    ponto de mínimo ou máximo da superfície), quando atinge `comprimento_max`
+    (o último ponto fica exatamente a essa distância ao longo da linha) ou
+    após `max_passos` passos.
+
+    Args:
+        fx (np.ndarray): Componente X do fluxo (ny, nx), como de `calcular_fluxo`.
+        fy (np.ndarray): Componente Y do fluxo (ny, nx).
+        grade (GradeRegular): Grade do campo de fluxo (pelo menos 2 x 2 células).
+        x_inicio (Sequence[float]): Coordenadas X dos pontos iniciais.
+        y_inicio (Sequence[float]): Coordenadas Y dos pontos iniciais.
+        passo (float, optional): Passo ao longo da linha (máximo, no método adaptativo).
+            Se None, usa metade do menor espaçamento da grade. Default é None.
+        comprimento_max (float, optional): Comprimento máximo de cada linha.
+            Default é infinito.
+        max_passos (int, optional): Número máximo de passos (tentativas, no método
+            adaptativo). Se None, usa 10 * (nx + ny). Default é None.
+        sentido (str, optional): "jusante" (no sentido do fluxo) ou "montante" (contra
+            o fluxo, para zonas de captura). Default é "jusante".
+        metodo (str, optional): "rk4" (passo fixo) ou "rk45" (Dormand-Prince com passo
+            adaptativo por linha). Default é "rk4".
+        tolerancia (float, optional): Erro local máximo por passo do método "rk45", em
+            unidades de distância. Se None, usa 1e-4 do menor espaçamento. Default é None.
+        velocidade_minima (float, optional): Velocidade do fluxo abaixo da qual (ou na
+            qual) a linha é considerada estagnada. Default é 0.0.
+        verbose (bool, optional): Se True, exibe logs detalhados. Default é False.
+        arquivo_log (str, optional): Caminho para arquivo de log. Se None, não salva logs.
+            Default é None.
+
+    Returns:
+        LinhasFluxo: Linhas traçadas, com os motivos de parada e os comprimentos.
+
+    Raises:
+        ValueError: Se as entradas forem inválidas.
+
+    Example:
+        >>> modelo = ModeloPotenciometrico(grade, None, z)
+        >>> fx, fy = modelo.calcular_fluxo()
+        >>> linhas = tracar_linhas_fluxo(fx, fy, grade, x_sementes, y_sementes, metodo="rk45")
+        >>> x_final, y_final = linhas.pontos_finais()
+    """
+    nivel_log = logging.DEBUG if verbose else logging.INFO
+    logger = InterpoladorLogger(
+        "LinhasFluxo", nivel=nivel_log, arquivo_log=arquivo_log, console=verbose
+    )
+    logger.iniciar_interpolacao(f"Pontos iniciais: {np.size(x_inicio)}, Grade: {grade.shape}")
+
+    try:
+        x = np.array(x_inicio, dtype=float).ravel()
+        y = np.array(y_inicio, dtype=float).ravel()
+        menor_espacamento = min(abs(grade.dx), abs(grade.dy))
+        passo = _FRACAO_PASSO * menor_espacamento if passo is None else float(passo)
+        if tolerancia is None:
+            tolerancia = _FRACAO_TOLERANCIA * menor_espacamento
+        if max_passos is None:
+            max_passos = 10 * (grade.nx + grade.ny)
+        _validar_entrada(fx, fy, grade, x, y, passo, comprimento_max, max_passos, sentido, metodo)
+        if tolerancia <= 0:
+            raise ValueError(f"tolerancia deve ser positiva, mas recebeu {tolerancia}")
+
+        campo = _CampoBilinear(fx, fy, grade)
+        integrador = _Integrador(
+            campo,
+            _METODOS[metodo],
+            1.0 if sentido == "jusante" else -1.0,
+            passo,
+            comprimento_max,
+            tolerancia,
+            velocidade_minima,
+        )
+        linhas = integrador.tracar(x, y, max_passos, logger)
+
+        logger.concluir_interpolacao(f"Pontos nas linhas: {len(linhas.x)}")
+        return linhas
+
+    except Exception as e:
+        logger.registrar_erro(e)
+        raise
+
+
+class _Integrador:
+    """
+    Avança em lote os pontos ativos e registra as posições aceitas de cada linha.
+    """
+
+    def __init__(
+        self,
+        campo: _CampoBilinear,
+        tabela: _TabelaRK,
+        sinal: float,
+        passo: float,
+        comprimento_max: float,
+        tolerancia: float,
+        velocidade_minima: float,
+    ):
+        self.campo = campo
+        self.tabela = tabela
+        self.sinal = sinal
+        self.passo = passo
+        self.comprimento_max = comprimento_max
+        self.tolerancia = tolerancia
+        self.velocidade_minima = velocidade_minima
+
+    def tracar(
+        self, x: np.ndarray, y: np.ndarray, max_passos: int, logger: InterpoladorLogger
+    ) -> LinhasFluxo:
+        """Traça todas as linhas a partir das posições iniciais (x, y)."""
+        n_linhas = len(x)
+        self.motivo = np.full(n_linhas, _ATIVO, dtype=np.int8)
+        self.comprimento = np.zeros(n_linhas)
+        self.h = np.full(n_linhas, self.passo)
+        self.registros = [(np.arange(n_linhas), x.copy(), y.copy())]
+
+        self.motivo[~self.campo.dentro(x, y)] = _BORDA
+        self.kx, self.ky, velocidade = self.campo.direcao(x, y, self.sinal)
+        self.motivo[(self.motivo == _ATIVO) & (velocidade <= self.velocidade_minima)] = _ESTAGNACAO
+
+        ativos = np.flatnonzero(self.motivo == _ATIVO)
+        for iteracao in range(max_passos):
+            if ativos.size == 0:
+                break
+            self._avancar(ativos, x, y)
+            ativos = ativos[self.motivo[ativos] == _ATIVO]
+            if iteracao % 100 == 99:
+                logger.registrar_progresso(
+                    100 * (n_linhas - ativos.size) // n_linhas, f"Linhas ativas: {ativos.size}"
+                )
+        self.motivo[ativos] = _PASSOS
+        return self._compactar(n_linhas)
+
+    def _avancar(self, ativos: np.ndarray, x: np.ndarray, y: np.ndarray) -> None:
+        """Executa um passo de Runge-Kutta para os pontos ativos."""
+        h = self.h[ativos]
+        dx, dy, erro = self._estagios(x[ativos], y[ativos], h, self.kx[ativos], self.ky[ativos])
+        if erro is not None:
+            aceitos = (erro <= self.tolerancia) | (h <= _PASSO_MIN_RELATIVO * self.passo)
+            fator = 0.9 * (self.tolerancia / np.maximum(erro, np.finfo(float).tiny)) ** 0.2
+            self.h[ativos] = np.clip(
+                h * np.clip(fator, _FATOR_MIN, _FATOR_MAX),
+                _PASSO_MIN_RELATIVO * self.passo,
+                self.passo,
+            )
+            ativos, h, dx, dy = ativos[aceitos], h[aceitos], dx[aceitos], dy[aceitos]
+            if ativos.size == 0:
+                return
+
+        x0, y0 = x[ativos], y[ativos]
+        curto = np.hypot(dx, dy) < _DESLOCAMENTO_MIN_RELATIVO * h
+        fracao = self._truncar(ativos, x0, y0, dx, dy)
+        x[ativos] = x0 + fracao * dx
+        y[ativos] = y0 + fracao * dy
+        self.comprimento[ativos] += fracao * np.hypot(dx, dy)
+        # Passos nulos (ponto já sobre a borda, fluxo para fora) não repetem o ponto
+        movidos = ativos[fracao > 0]
+        self.registros.append((movidos, x[movidos], y[movidos]))
+
+        # Estagnação: velocidade mínima, inversão de sentido ou passo que não avança
+        kx, ky, velocidade = self.campo.direcao(x[ativos], y[ativos], self.sinal)
+        inverteu = kx * self.kx[ativos] + ky * self.ky[ativos] < 0
+        parados = (self.motivo[ativos] == _ATIVO) & (
+            (velocidade <= self.velocidade_minima) | inverteu | curto
+        )
+        self.motivo[ativos[parados]] = _ESTAGNACAO
+        self.kx[ativos], self.ky[ativos] = kx, ky
+
+    def _estagios(
+        self, x: np.ndarray, y: np.ndarray, h: np.ndarray, kx1: np.ndarray, ky1: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """Retorna o deslocamento do passo e, no método adaptativo, o erro local."""
+        kx, ky = [kx1], [ky1]
+        for linha in self.tabela.a:
+            xs = x + h * sum(c * k for c, k in zip(linha, kx))
+            ys = y + h * sum(c * k for c, k in zip(linha, ky))
+            kxs, kys, _ = self.campo.direcao(xs, ys, self.sinal)
+            kx.append(kxs)
+            ky.append(kys)
+
+        dx = h * sum(b * k for b, k in zip(self.tabela.b, kx))
+        dy = h * sum(b * k for b, k in zip(self.tabela.b, ky))
+        if self.tabela.b_erro is None:
+            return dx, dy, None
+        ex = sum(b * k for b, k in zip(self.tabela.b_erro, kx))
+        ey = sum(b * k for b, k in zip(self.tabela.b_erro, ky))
+        return dx, dy, h * np.hypot(ex, ey)
+
+    def _truncar(
+        self, ativos: np.ndarray, x0: np.ndarray, y0: np.ndarray, dx: np.ndarray, dy: np.ndarray
+    ) -> np.ndarray:
+        """
+        Retorna a fração de cada passo até a borda da grade ou o comprimento máximo,
+        marcando as linhas que param nesses limites.
+        """
+        grade = self.campo.grade
+        u0, v0 = self.campo.indices(x0, y0)
+        fracao_borda = np.minimum(
+            _fracao_ate_limite(u0, dx / grade.dx, grade.nx - 1),
+            _fracao_ate_limite(v0, dy / grade.dy, grade.ny - 1),
+        )
+
+        restante = self.comprimento_max - self.comprimento[ativos]
+        distancia = np.hypot(dx, dy)
+        fracao_comprimento = np.ones_like(distancia)
+        longos = distancia >= restante
+        fracao_comprimento[longos] = restante[longos] / distancia[longos]
+
+        borda = fracao_borda < np.minimum(fracao_comprimento, 1.0)
+        self.motivo[ativos[borda]] = _BORDA
+        self.motivo[ativos[~borda & longos]] = _COMPRIMENTO
+        return np.minimum(fracao_borda, fracao_comprimento)
+
+    def _compactar(self, n_linhas: int) -> LinhasFluxo:
+        """Ordena os registros por linha (mantendo a ordem dos passos)."""
+        indices = np.concatenate([r[0] for r in self.registros])
+        ordem = np.argsort(indices, kind="stable")
+        inicio = np.zeros(n_linhas + 1, dtype=np.intp)
+        np.cumsum(np.bincount(indices, minlength=n_linhas), out=inicio[1:])
+        return LinhasFluxo(
+            x=np.concatenate([r[1] for r in self.registros])[ordem],
+            y=np.concatenate([r[2] for r in self.registros])[ordem],
+            inicio=inicio,
+            motivo=self.motivo,
+            comprimento=self.comprimento,
+        )
+
+
+def _fracao_ate_limite(u0: np.ndarray, du: np.ndarray, limite: float) -> np.ndarray:
+    """
+    Retorna a fração do deslocamento `du` (índices fracionários) que mantém u0 + t * du
+    em [0, limite]; 1 se o deslocamento completo permanece no intervalo.
+    """
+    u1 = u0 + du
+    fracao = np.ones_like(u0)
+    abaixo, acima = u1 < 0, u1 > limite
+    fracao[abaixo] = -u0[abaixo] / du[abaixo]
+    fracao[acima] = (limite - u0[acima]) / du[acima]
+    return fracao
+
+
+def _validar_entrada(
+    fx: np.ndarray,
+    fy: np.ndarray,
+    grade: GradeRegular,
+    x: np.ndarray,
+    y: np.ndarray,
+    passo: float,
+    comprimento_max: float,
+    max_passos: int,
+    sentido: str,
+    metodo: str,
+) -> None:
+    """
+    Valida as entradas do traçado de linhas de fluxo.
+
+    Raises:
+        ValueError: Se alguma entrada for inválida.
+    """
+    if np.shape(fx) != grade.shape or np.shape(fy) != grade.shape:
+        raise ValueError(
+            f"Dimensões incompatíveis: grade({grade.shape}), fx({np.shape(fx)}), "
+            f"fy({np.shape(fy)})"
+        )
+    if grade.nx < 2 or grade.ny < 2:
+        raise ValueError("A interpolação bilinear requer uma grade de pelo menos 2 x 2 células")
+    if x.shape != y.shape:
+        raise ValueError(f"Dimensões incompatíveis: x_inicio({x.shape}), y_inicio({y.shape})")
+    if not passo > 0 or not comprimento_max > 0 or max_passos < 1:
+        raise ValueError("passo, comprimento_max e max_passos devem ser positivos")
+    if sentido not in ("jusante", "montante"):
+        raise ValueError(f"sentido deve ser 'jusante' ou 'montante', mas recebeu '{sentido}'")
+    if metodo not in _METODOS:
+        raise ValueError(f"Método inválido: '{metodo}'. Opções: {tuple(_METODOS)}")
@@ -9,6 +9,9 @@ Permite calcular gradientes, vetores de fluxo e visualizar os resultados.
 Características principais:
 - Cálculo de gradiente da superfície
 - Cálculo de vetores de fluxo (gradiente negativo)
+- Cálculo em faixas de linhas, com saídas float32 ou mapeadas em disco
+- Traçado de linhas de fluxo a partir de pontos iniciais
+- Direções e acumulação de fluxo (D8, D-infinito) e zonas de captura de poços
 - Visualização de vetores de fluxo com opções de personalização
 - Validação de dados de entrada
 
@@ -25,13 +28,22 @@ Dependências:
 
 import logging
 from dataclasses import dataclass, field
-from typing import Optional, Tuple, Union
+from typing import Optional, Sequence, Tuple, Union
 
 import matplotlib.pyplot as plt
 import numpy as np  # noqa: F401
+from numpy.typing import DTypeLike
 
+from interpoladores.linhas_fluxo import LinhasFluxo, tracar_linhas_fluxo
+from interpoladores.rede_fluxo import RedeFluxo, calcular_rede_fluxo
+from utils.grid_utils import GradeRegular
 from utils.logging_utils import InterpoladorLogger, configurar_logger
 
+# Orçamento padrão de memória temporária por faixa de linhas
+_MEMORIA_PADRAO_MB = 256.0
+# Arrays temporários por célula da faixa: cópia de z e as duas componentes
+_ARRAYS_POR_CELULA = 3
+
 
 @dataclass
 class ModeloPotenciometrico:
@@ -47,16 +59,24 @@ class ModeloPotenciometrico:
     apontando de valores altos para valores baixos (gradiente negativo).
 
     Args:
-        grid_x (np.ndarray): Grade de coordenadas X (meshgrid).
-        grid_y (np.ndarray): Grade de coordenadas Y (meshgrid).
+        grid_x (np.ndarray or GradeRegular): Grade de coordenadas X (meshgrid), ou
+            `GradeRegular` com origem e resolução da grade.
+        grid_y (np.ndarray, optional): Grade de coordenadas Y (meshgrid), ou None se
+            `grid_x` for uma GradeRegular.
         z (np.ndarray): Superfície interpolada.
         verbose (bool, optional): Se True, exibe logs detalhados. Default é False.
         arquivo_log (str, optional): Caminho para arquivo de log. Se None, não salva logs.
             Default é None.
+        max_memory_mb (float, optional): Memória temporária por faixa de linhas, em MB.
+            O gradiente é calculado em faixas com uma linha de borda de cada lado, sem
+            arrays temporários do tamanho da grade; `z` pode ser um `np.memmap`.
+            Default é None (256 MB).
 
     Methods:
         calcular_fluxo: Calcula os vetores de fluxo (gradiente negativo da superfície).
         calcular_gradiente: Calcula o gradiente da superfície.
+        tracar_linhas_fluxo: Traça linhas de fluxo a partir de pontos iniciais.
+        rede_fluxo: Calcula direções e acumulação de fluxo e zonas de captura.
 
     Example:
         >>> import numpy as np
@@ -77,13 +97,25 @@ class ModeloPotenciometrico:
         >>>
         >>> # Visualizar os vetores
         >>> plotar_vetores_fluxo(grid_x, grid_y, flow_x, flow_y, densidade=2)
+        >>>
+        >>> # Grade regular sem meshgrid
+        >>> grade = GradeRegular.de_limites(0, 10, 0, 10, nx=20, ny=20)
+        >>> modelo = ModeloPotenciometrico(grade, None, z)
+        >>>
+        >>> # Superfície maior que a memória: saídas float32 mapeadas em disco
+        >>> saida = tuple(
+        ...     np.lib.format.open_memmap(f"fluxo_{c}.npy", "w+", np.float32, z.shape)
+        ...     for c in "xy"
+        ... )
+        >>> flow_x, flow_y = modelo.calcular_fluxo(saida=saida)
     """
 
-    grid_x: np.ndarray
-    grid_y: np.ndarray
+    grid_x: Union[np.ndarray, GradeRegular]
+    grid_y: Optional[np.ndarray]
     z: np.ndarray
     verbose: bool = False
     arquivo_log: Optional[str] = None
+    max_memory_mb: Optional[float] = None
     logger: InterpoladorLogger = field(init=False, repr=False)
 
     def __post_init__(self):
@@ -91,11 +123,20 @@ class ModeloPotenciometrico:
         Validação após inicialização e configuração do logger.
         """
         # Validação de dimensões
-        if self.grid_x.shape != self.grid_y.shape or self.grid_x.shape != self.z.shape:
+        if isinstance(self.grid_x, GradeRegular):
+            if self.grid_y is not None:
+                raise ValueError("grid_y deve ser None quando grid_x é uma GradeRegular")
+            if self.z.shape != self.grid_x.shape:
+                raise ValueError(
+                    f"Dimensões incompatíveis: grade({self.grid_x.shape}), z({self.z.shape})"
+                )
+        elif self.grid_x.shape != self.grid_y.shape or self.grid_x.shape != self.z.shape:
             raise ValueError(
                 f"Dimensões incompatíveis: grid_x({self.grid_x.shape}), "
                 f"grid_y({self.grid_y.shape}), z({self.z.shape})"
             )
+        if self.max_memory_mb is not None and self.max_memory_mb <= 0:
+            raise ValueError("max_memory_mb deve ser positivo")
 
         # Configura o logger
         nivel_log = logging.DEBUG if self.verbose else logging.INFO
@@ -106,32 +147,42 @@ class ModeloPotenciometrico:
             console=self.verbose,
         )
 
-    def calcular_gradiente(self) -> Tuple[np.ndarray, np.ndarray]:
+    def calcular_gradiente(
+        self,
+        saida: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+        dtype: Optional[DTypeLike] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Calcula o gradiente da superfície z.
 
         O gradiente é um vetor que aponta na direção de maior aumento da função,
         com magnitude proporcional à taxa de variação. É calculado usando
-        diferenças finitas centrais.
+        diferenças finitas centrais (unilaterais nas bordas), em faixas de linhas
+        com uma linha de borda, com resultado idêntico ao de `np.gradient` na grade
+        inteira.
+
+        Args:
+            saida (Tuple[np.ndarray, np.ndarray], optional): Arrays (grad_x, grad_y) com
+                a forma de z onde escrever o resultado, por exemplo `np.memmap`. Se None,
+                novos arrays são alocados. Default é None.
+            dtype (DTypeLike, optional): Tipo dos arrays alocados (ex.: np.float32). Se
+                None, usa o tipo de ponto flutuante de z. Ignorado quando `saida` é
+                fornecida. Default é None.
 
         Returns:
             Tuple[np.ndarray, np.ndarray]:
                 - grad_x (np.ndarray): Componente X do gradiente.
                 - grad_y (np.ndarray): Componente Y do gradiente.
+
+        Raises:
+            ValueError: Se os arrays de `saida` não tiverem a forma de z.
         """
         self.logger.iniciar_interpolacao(
             f"Calculando gradiente para grade de tamanho {self.grid_x.shape}"
         )
 
         try:
-            # Calcula o espaçamento da grade
-            dx = np.mean(np.diff(self.grid_x[0]))
-            dy = np.mean(np.diff(self.grid_y[:, 0]))
-
-            self.logger.registrar_progresso(30, f"Espaçamento da grade: dx={dx:.4f}, dy={dy:.4f}")
-
-            # Calcula o gradiente
-            grad_y, grad_x = np.gradient(self.z, dy, dx)
+            grad_x, grad_y = self._gradiente_em_faixas(saida, dtype, negativo=False)
 
             self.logger.registrar_progresso(100, "Cálculo do gradiente concluído")
             self.logger.concluir_interpolacao()
@@ -142,32 +193,39 @@ class ModeloPotenciometrico:
             self.logger.registrar_erro(e)
             raise
 
-    def calcular_fluxo(self) -> Tuple[np.ndarray, np.ndarray]:
+    def calcular_fluxo(
+        self,
+        saida: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+        dtype: Optional[DTypeLike] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Calcula os vetores de fluxo (gradiente invertido) da superfície z.
 
         Os vetores de fluxo apontam na direção de maior diminuição da superfície
         (gradiente negativo), representando a direção natural do fluxo de um
-        fluido sob a influência do campo potencial.
+        fluido sob a influência do campo potencial. A inversão é feita em cada
+        faixa, sem cópias da grade inteira.
+
+        Args:
+            saida (Tuple[np.ndarray, np.ndarray], optional): Arrays (flow_x, flow_y) com
+                a forma de z onde escrever o resultado. Default é None.
+            dtype (DTypeLike, optional): Tipo dos arrays alocados quando `saida` é None.
+                Default é None (tipo de ponto flutuante de z).
 
         Returns:
             Tuple[np.ndarray, np.ndarray]:
                 - flow_x (np.ndarray): Componente X dos vetores de fluxo.
                 - flow_y (np.ndarray): Componente Y dos vetores de fluxo.
+
+        Raises:
+            ValueError: Se os arrays de `saida` não tiverem a forma de z.
         """
         self.logger.iniciar_interpolacao(
             f"Calculando vetores de fluxo para grade de tamanho {self.grid_x.shape}"
         )
 
         try:
-            # Calcula o gradiente
-            self.logger.registrar_progresso(20, "Calculando gradiente")
-            grad_x, grad_y = self.calcular_gradiente()
-
-            # Inverte o gradiente para obter o fluxo
-            self.logger.registrar_progresso(80, "Invertendo gradiente para obter fluxo")
-            flow_x = -grad_x
-            flow_y = -grad_y
+            flow_x, flow_y = self._gradiente_em_faixas(saida, dtype, negativo=True)
 
             self.logger.registrar_progresso(100, "Cálculo dos vetores de fluxo concluído")
             self.logger.concluir_interpolacao()
@@ -178,6 +236,168 @@ class ModeloPotenciometrico:
             self.logger.registrar_erro(e)
             raise
 
+    def tracar_linhas_fluxo(
+        self,
+        x_inicio: Sequence[float],
+        y_inicio: Sequence[float],
+        passo: Optional[float] = None,
+        comprimento_max: float = np.inf,
+        max_passos: Optional[int] = None,
+        sentido: str = "jusante",
+        metodo: str = "rk4",
+        tolerancia: Optional[float] = None,
+    ) -> LinhasFluxo:
+        """
+        Traça as linhas de fluxo que partem dos pontos iniciais.
+
+        O campo de `calcular_fluxo` é interpolado bilinearmente e todos os pontos
+        avançam juntos a cada passo; veja `interpoladores.linhas_fluxo.tracar_linhas_fluxo`
+        para os critérios de parada.
+
+        Args:
+            x_inicio (Sequence[float]): Coordenadas X dos pontos iniciais.
+            y_inicio (Sequence[float]): Coordenadas Y dos pontos iniciais.
+            passo (float, optional): Passo ao longo da linha. Se None, usa metade do
+                menor espaçamento da grade. Default é None.
+            comprimento_max (float, optional): Comprimento máximo de cada linha.
+                Default é infinito.
+            max_passos (int, optional): Número máximo de passos. Default é None.
+            sentido (str, optional): "jusante" ou "montante" (zonas de captura de poços).
+                Default é "jusante".
+            metodo (str, optional): "rk4" (passo fixo) ou "rk45" (passo adaptativo).
+                Default é "rk4".
+            tolerancia (float, optional): Erro local máximo por passo do método "rk45".
+                Default é None.
+
+        Returns:
+            LinhasFluxo: Linhas traçadas, com os motivos de parada e os comprimentos.
+
+        Raises:
+            ValueError: Se as entradas forem inválidas.
+        """
+        flow_x, flow_y = self.calcular_fluxo()
+        return tracar_linhas_fluxo(
+            flow_x,
+            flow_y,
+            self._grade_regular(),
+            x_inicio,
+            y_inicio,
+            passo=passo,
+            comprimento_max=comprimento_max,
+            max_passos=max_passos,
+            sentido=sentido,
+            metodo=metodo,
+            tolerancia=tolerancia,
+            verbose=self.verbose,
+            arquivo_log=self.arquivo_log,
+        )
+
+    def rede_fluxo(
+        self,
+        metodo: str = "d8",
+        x_pocos: Optional[Sequence[float]] = None,
+        y_pocos: Optional[Sequence[float]] = None,
+        preencher_depressoes: bool = True,
+    ) -> RedeFluxo:
+        """
+        Calcula a rede de fluxo da superfície: direções, acumulação e zonas de captura.
+
+        As direções seguem o gradiente negativo discreto da superfície (o vizinho ou a
+        faceta de maior declividade), após o preenchimento das depressões sem saída;
+        veja `interpoladores.rede_fluxo.calcular_rede_fluxo`.
+
+        Args:
+            metodo (str, optional): "d8" ou "dinf" (D-infinito). Default é "d8".
+            x_pocos (Sequence[float], optional): Coordenadas X dos poços de bombeamento.
+                Default é None.
+            y_pocos (Sequence[float], optional): Coordenadas Y dos poços. Default é None.
+            preencher_depressoes (bool, optional): Se True, preenche as depressões sem
+                saída (os poços não são preenchidos). Default é True.
+
+        Returns:
+            RedeFluxo: Rede com `acumulacao()` e `zonas_captura()`.
+
+        Raises:
+            ValueError: Se as entradas forem inválidas.
+
+        Example:
+            >>> rede = modelo.rede_fluxo(x_pocos=[250.0, 610.0], y_pocos=[400.0, 120.0])
+            >>> zonas = rede.zonas_captura()
+        """
+        return calcular_rede_fluxo(
+            self.z,
+            self._grade_regular(),
+            metodo=metodo,
+            x_pocos=x_pocos,
+            y_pocos=y_pocos,
+            preencher_depressoes=preencher_depressoes,
+            verbose=self.verbose,
+            arquivo_log=self.arquivo_log,
+        )
+
+    def _grade_regular(self) -> GradeRegular:
+        """Retorna a grade como GradeRegular (origem e espaçamento do meshgrid)."""
+        if isinstance(self.grid_x, GradeRegular):
+            return self.grid_x
+        dx, dy = self._espacamento()
+        ny, nx = self.z.shape
+        return GradeRegular(
+            x0=float(self.grid_x[0, 0]), y0=float(self.grid_y[0, 0]), dx=dx, dy=dy, nx=nx, ny=ny
+        )
+
+    def _espacamento(self) -> Tuple[float, float]:
+        """Retorna o espaçamento (dx, dy) da grade."""
+        if isinstance(self.grid_x, GradeRegular):
+            return self.grid_x.dx, self.grid_x.dy
+        return np.mean(np.diff(self.grid_x[0])), np.mean(np.diff(self.grid_y[:, 0]))
+
+    def _gradiente_em_faixas(
+        self,
+        saida: Optional[Tuple[np.ndarray, np.ndarray]],
+        dtype: Optional[DTypeLike],
+        negativo: bool,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Escreve o gradiente de z (ou o seu negativo, o fluxo) em faixas de linhas.
+
+        Cada faixa [i0, i1) lê as linhas [i0 - 1, i1 + 1) de z: as diferenças centrais
+        das linhas internas e as unilaterais das bordas da grade coincidem com as de
+        `np.gradient` sobre a grade inteira.
+        """
+        ny, nx = self.z.shape
+        dx, dy = self._espacamento()
+        self.logger.registrar_progresso(10, f"Espaçamento da grade: dx={dx:.4f}, dy={dy:.4f}")
+
+        # Tipo de cálculo igual ao de np.gradient (inteiros são promovidos a float64)
+        tipo_calculo = self.z.dtype if np.issubdtype(self.z.dtype, np.inexact) else np.float64
+        if saida is None:
+            tipo_saida = tipo_calculo if dtype is None else dtype
+            saida = (np.empty((ny, nx), tipo_saida), np.empty((ny, nx), tipo_saida))
+        elif len(saida) != 2 or any(np.shape(s) != (ny, nx) for s in saida):
+            raise ValueError(f"saida deve conter dois arrays com a forma de z {(ny, nx)}")
+        saida_x, saida_y = saida
+
+        memoria_mb = _MEMORIA_PADRAO_MB if self.max_memory_mb is None else self.max_memory_mb
+        bytes_por_linha = _ARRAYS_POR_CELULA * nx * np.dtype(tipo_calculo).itemsize
+        linhas_por_faixa = max(1, int(memoria_mb * 1024**2 // bytes_por_linha))
+
+        for i0 in range(0, ny, linhas_por_faixa):
+            i1 = min(i0 + linhas_por_faixa, ny)
+            leitura = slice(max(i0 - 1, 0), min(i1 + 1, ny))
+            faixa = np.asarray(self.z[leitura], dtype=tipo_calculo)
+            grad_y, grad_x = np.gradient(faixa, dy, dx)
+            internas = slice(i0 - leitura.start, i1 - leitura.start)
+            if negativo:
+                np.negative(grad_x, out=grad_x)
+                np.negative(grad_y, out=grad_y)
+            saida_x[i0:i1] = grad_x[internas]
+            saida_y[i0:i1] = grad_y[internas]
+            self.logger.registrar_progresso(
+                10 + 90 * i1 // ny, f"Linhas {i1}/{ny} do gradiente calculadas"
+            )
+
+        return saida_x, saida_y
+
 
 # Configura um logger global para as funções
 logger_global = configurar_logger("ModeloPotenciometrico_Funcs")
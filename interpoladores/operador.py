@@ -0,0 +1,159 @@
+"""
+Operador linear de pesos de interpolação.
+
+Para uma rede de pontos e uma grade fixas, os pesos de interpoladores lineares
+(IDW, Krigagem) não dependem dos valores medidos. Este módulo armazena esses
+pesos como um operador W (G x N), de modo que uma nova interpolação se reduz a
+um único produto matriz-vetor `W @ valores`.
+
+Características principais:
+- Armazenamento esparso (CSR) ou denso dos pesos
+- Aplicação a um vetor de valores (N,) ou a uma pilha (N, M)
+- Persistência em disco em formato `.npz` comprimido
+
+Classes:
+    - OperadorPesos: Operador de pesos de interpolação.
+
+Dependências:
+    - numpy: Para operações numéricas eficientes
+    - scipy.sparse: Para o armazenamento esparso dos pesos
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+
+import numpy as np  # noqa: F401
+from scipy import sparse
+
+
+@dataclass
+class OperadorPesos:
+    """
+    Operador linear que mapeia valores nos pontos amostrados para a grade.
+
+    Cada linha de `pesos` contém os pesos de uma célula da grade (em ordem
+    achatada) sobre os N pontos amostrados. Células sem vizinhos válidos têm
+    linha vazia e recebem `default_value` (ou NaN) na aplicação.
+
+    Args:
+        pesos (scipy.sparse.csr_matrix or np.ndarray): Matriz (G, N) de pesos.
+        shape_grade (Tuple[int, ...]): Formato da grade de saída (produto = G).
+        validos (np.ndarray): Máscara booleana (G,) das células com vizinhos válidos.
+        default_value (float, optional): Valor para células sem vizinhos válidos.
+            Se None, usa NaN. Default é None.
+
+    Example:
+        >>> operador = idw.operador_pesos(grid_x, grid_y)
+        >>> operador.salvar("pesos_idw.npz")
+        >>> operador = OperadorPesos.carregar("pesos_idw.npz")
+        >>> z = operador.aplicar(valores_da_hora)
+    """
+
+    pesos: Union[sparse.csr_matrix, np.ndarray]
+    shape_grade: Tuple[int, ...]
+    validos: np.ndarray
+    default_value: Optional[float] = None
+
+    def __post_init__(self):
+        """
+        Validação das dimensões após inicialização.
+        """
+        self.shape_grade = tuple(int(n) for n in self.shape_grade)
+        n_celulas = int(np.prod(self.shape_grade))
+        if self.pesos.shape[0] != n_celulas or self.validos.shape != (n_celulas,):
+            raise ValueError(
+                f"Dimensões incompatíveis: pesos({self.pesos.shape}), "
+                f"grade({self.shape_grade}), validos({self.validos.shape})"
+            )
+
+    @property
+    def n_pontos(self) -> int:
+        """Número de pontos amostrados (colunas do operador)."""
+        return int(self.pesos.shape[1])
+
+    @property
+    def esparso(self) -> bool:
+        """True se os pesos estão armazenados em formato esparso."""
+        return sparse.issparse(self.pesos)
+
+    def aplicar(self, valores: np.ndarray) -> np.ndarray:
+        """
+        Interpola novos valores com um único produto matriz-vetor.
+
+        Args:
+            valores (np.ndarray): Array (N,) de valores nos pontos amostrados, ou
+                (N, M) com M conjuntos de valores (atributos, campanhas).
+
+        Returns:
+            np.ndarray: Grade com o formato `shape_grade`, ou pilha (M, *shape_grade)
+                se `valores` tiver M colunas.
+
+        Raises:
+            ValueError: Se o número de valores não corresponder ao número de pontos.
+        """
+        valores = np.asarray(valores, dtype=float)
+        if valores.ndim not in (1, 2) or valores.shape[0] != self.n_pontos:
+            raise ValueError(
+                f"Valores devem ter formato ({self.n_pontos},) ou ({self.n_pontos}, M), "
+                f"mas têm formato {valores.shape}"
+            )
+
+        z = np.asarray(self.pesos @ valores, dtype=float)
+        preenchimento = np.nan if self.default_value is None else self.default_value
+        z[~self.validos] = preenchimento
+
+        if valores.ndim == 1:
+            return z.reshape(self.shape_grade)
+        return np.ascontiguousarray(z.T).reshape((valores.shape[1],) + self.shape_grade)
+
+    def salvar(self, caminho: str) -> None:
+        """
+        Salva o operador em um arquivo `.npz` comprimido.
+
+        Args:
+            caminho (str): Caminho do arquivo de saída.
+        """
+        campos = {
+            "shape_grade": np.asarray(self.shape_grade, dtype=np.int64),
+            "validos": self.validos,
+            "default_value": np.array(np.nan if self.default_value is None else self.default_value),
+        }
+        if self.esparso:
+            pesos = self.pesos.tocsr()
+            campos.update(
+                formato=np.array("csr"),
+                data=pesos.data,
+                indices=pesos.indices,
+                indptr=pesos.indptr,
+                shape=np.asarray(pesos.shape, dtype=np.int64),
+            )
+        else:
+            campos.update(formato=np.array("densa"), pesos=self.pesos)
+        np.savez_compressed(caminho, **campos)
+
+    @classmethod
+    def carregar(cls, caminho: str) -> "OperadorPesos":
+        """
+        Carrega um operador salvo com `salvar`.
+
+        Args:
+            caminho (str): Caminho do arquivo `.npz`.
+
+        Returns:
+            OperadorPesos: Operador carregado.
+        """
+        with np.load(caminho, allow_pickle=False) as arquivo:
+            if str(arquivo["formato"]) == "csr":
+                pesos = sparse.csr_matrix(
+                    (arquivo["data"], arquivo["indices"], arquivo["indptr"]),
+                    shape=tuple(arquivo["shape"]),
+                )
+            else:
+                pesos = arquivo["pesos"]
+            default_value = float(arquivo["default_value"])
+            return cls(
+                pesos=pesos,
+                shape_grade=tuple(arquivo["shape_grade"]),
+                validos=arquivo["validos"],
+                default_value=None if np.isnan(default_value) else default_value,
+            )
@@ -0,0 +1,440 @@
+"""
+Direções de fluxo, acumulação e zonas de captura sobre superfícies potenciométricas.
+
+A partir da carga hidráulica interpolada em uma grade regular, este módulo
+define para onde escoa cada célula (D8: o vizinho de maior declividade;
+D-infinito: a direção contínua de maior declividade nas oito facetas
+triangulares, repartida entre dois vizinhos), acumula o fluxo de montante para
+jusante e delimita a área de contribuição de cada poço de bombeamento.
+
+Depressões (mínimos locais sem saída, em geral artefatos da interpolação) são
+preenchidas até o nível de transbordamento, como no priority-flood: o nível de
+cada célula é o menor valor máximo de z entre os caminhos até uma saída (borda
+da grade, vizinho sem dado ou poço). Esse nível é obtido da árvore geradora
+mínima do grafo de vizinhança (ordenação das arestas em O(n log n), em código
+compilado do SciPy); nas áreas planas resultantes, cada célula escoa para o
+seu pai na árvore, que conduz ao ponto de transbordamento. Os poços são saídas:
+os seus cones de rebaixamento não são preenchidos.
+
+A acumulação percorre a rede em ondas (ordem topológica): cada célula é
+processada uma única vez, depois de todas as células a montante, em operações
+vetorizadas sobre a frente de cada onda.
+
+Características principais:
+- Direções D8 e D-infinito (Tarboton), inclusive para células retangulares
+- Preenchimento de depressões equivalente ao priority-flood, preservando poços
+- Acumulação de fluxo (contagem de células ou pesos, ex.: recarga) em tempo linear
+- Zonas de captura de cada poço
+- Células sem dado (NaN) excluídas da rede, com os vizinhos tratados como borda
+
+Classes:
+    - RedeFluxo: Receptores de cada célula, acumulação e zonas de captura.
+
+Funções:
+    - calcular_rede_fluxo: Calcula a rede de fluxo de uma superfície.
+
+Dependências:
+    - numpy: Para operações numéricas eficientes
+    - scipy.sparse.csgraph: Para a árvore geradora mínima e a sua ordem de visita
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np  # noqa: F401
+from scipy import sparse
+from scipy.sparse.csgraph import breadth_first_order, minimum_spanning_tree
+
+from utils.grid_utils import GradeRegular
+from utils.logging_utils import InterpoladorLogger
+
+_METODOS = ("d8", "dinf")
+
+# Deslocamentos (linha, coluna) dos oito vizinhos, em ordem anti-horária
+_VIZINHOS_D8 = ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1))
+
+# Deslocamentos que ligam cada par de vizinhos uma única vez no grafo
+_ARESTAS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# Facetas triangulares do D-infinito: (vizinho cardinal, vizinho diagonal)
+_FACETAS = tuple(((0, dc), (dl, dc)) for dc in (1, -1) for dl in (1, -1)) + tuple(
+    ((dl, 0), (dl, dc)) for dl in (1, -1) for dc in (1, -1)
+)
+
+
+@dataclass
+class RedeFluxo:
+    """
+    Rede de fluxo de uma grade: células receptoras e proporções do fluxo.
+
+    As células são indexadas em ordem achatada (linha * nx + coluna). Cada célula
+    envia a proporção `proporcoes[c, k]` do seu fluxo para `receptores[c, k]`;
+    receptor -1 indica que o fluxo deixa a rede (borda, poço ou célula sem dado).
+
+    Args:
+        shape (Tuple[int, int]): Formato (ny, nx) da grade.
+        metodo (str): Método das direções ("d8" ou "dinf").
+        receptores (np.ndarray): Índices (ny * nx, k) das células receptoras.
+        proporcoes (np.ndarray): Proporções (ny * nx, k) do fluxo de cada célula.
+        z_preenchida (np.ndarray): Superfície (ny, nx) com as depressões preenchidas.
+        celulas_pocos (np.ndarray): Índices achatados (W,) das células dos poços.
+
+    Example:
+        >>> rede = calcular_rede_fluxo(z, grade, x_pocos=[120.0], y_pocos=[340.0])
+        >>> area = rede.acumulacao() * abs(grade.dx * grade.dy)
+        >>> zonas = rede.zonas_captura()  # -1 fora das zonas de captura
+    """
+
+    shape: Tuple[int, int]
+    metodo: str
+    receptores: np.ndarray
+    proporcoes: np.ndarray
+    z_preenchida: np.ndarray
+    celulas_pocos: np.ndarray
+
+    def acumulacao(self, pesos: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Acumula o fluxo de montante para jusante.
+
+        Args:
+            pesos (np.ndarray, optional): Contribuição (ny, nx) de cada célula, como a
+                recarga. Se None, cada célula contribui com 1 (contagem de células).
+                Default é None.
+
+        Returns:
+            np.ndarray: Fluxo acumulado (ny, nx) em cada célula, incluindo a própria
+                contribuição; NaN nas células sem dado.
+
+        Raises:
+            ValueError: Se `pesos` não tiver o formato da grade.
+        """
+        validas = np.isfinite(self.z_preenchida).ravel()
+        if pesos is None:
+            acumulado = validas.astype(float)
+        elif np.shape(pesos) != self.shape:
+            raise ValueError(
+                f"Dimensões incompatíveis: grade({self.shape}), pesos({np.shape(pesos)})"
+            )
+        else:
+            acumulado = np.where(validas, np.asarray(pesos, dtype=float).ravel(), 0.0)
+
+        arestas = self.receptores >= 0
+        entrada = np.bincount(self.receptores[arestas], minlength=acumulado.size)
+        frente = np.flatnonzero(entrada == 0)
+        posicao = np.empty(acumulado.size, dtype=np.intp)
+        while frente.size:
+            receptores = self.receptores[frente]
+            usadas = receptores >= 0
+            destino = receptores[usadas]
+            np.add.at(
+                acumulado,
+                destino,
+                (acumulado[frente, np.newaxis] * self.proporcoes[frente])[usadas],
+            )
+            np.subtract.at(entrada, destino, 1)
+
+            # Próxima frente: receptores sem entradas pendentes, sem repetições
+            prontos = destino[entrada[destino] == 0]
+            ordem = np.arange(prontos.size)
+            posicao[prontos] = ordem
+            frente = prontos[posicao[prontos] == ordem]
+
+        acumulado[~validas] = np.nan
+        return acumulado.reshape(self.shape)
+
+    def zonas_captura(self) -> np.ndarray:
+        """
+        Delimita a zona de captura (área de contribuição) de cada poço.
+
+        Cada célula segue o seu receptor de maior proporção até sair da rede; as
+        células que terminam em um poço pertencem à sua zona. Na rede D8 as zonas
+        são exatas; na D-infinito, o fluxo repartido é atribuído ao ramo principal.
+
+        Returns:
+            np.ndarray: Índice (ny, nx) do poço de cada célula (int32), ou -1 fora das
+                zonas de captura. Poços na mesma célula compartilham a zona do primeiro.
+        """
+        n_celulas = self.receptores.shape[0]
+        principal = self.receptores[np.arange(n_celulas), np.argmax(self.proporcoes, axis=1)]
+        destino = np.where(principal >= 0, principal, np.arange(n_celulas))
+
+        # Saltos de ponteiro: cada rodada dobra o trecho percorrido do caminho
+        ativos = np.flatnonzero(destino != np.arange(n_celulas))
+        while ativos.size:
+            destino[ativos] = destino[destino[ativos]]
+            ativos = ativos[destino[ativos] != destino[destino[ativos]]]
+
+        rotulos = np.full(n_celulas, -1, dtype=np.int32)
+        rotulos[self.celulas_pocos[::-1]] = np.arange(len(self.celulas_pocos))[::-1]
+        return rotulos[destino].reshape(self.shape)
+
+
+def calcular_rede_fluxo(
+    z: np.ndarray,
+    grade: GradeRegular,
+    metodo: str = "d8",
+    x_pocos: Optional[Sequence[float]] = None,
+    y_pocos: Optional[Sequence[float]] = None,
+    preencher_depressoes: bool = True,
+    verbose: bool = False,
+    arquivo_log: Optional[str] = None,
+) -> RedeFluxo:
+    """
+    Calcula as direções de fluxo de uma superfície potenciométrica.
+
+    Args:
+        z (np.ndarray): Superfície (ny, nx); NaN marca células sem dado.
+        grade (GradeRegular): Grade da superfície.
+        metodo (str, optional): "d8" (um receptor por célula) ou "dinf" (D-infinito,
+            até dois receptores). Default é "d8".
+        x_pocos (Sequence[float], optional): Coordenadas X dos poços de bombeamento,
+            tratados como saídas da rede. Default é None.
+        y_pocos (Sequence[float], optional): Coordenadas Y dos poços. Default é None.
+        preencher_depressoes (bool, optional): Se True, preenche as depressões sem
+            saída até o nível de transbordamento. Se False, células sem vizinho mais
+            baixo são sumidouros. Default é True.
+        verbose (bool, optional): Se True, exibe logs detalhados. Default é False.
+        arquivo_log (str, optional): Caminho para arquivo de log. Se None, não salva logs.
+            Default é None.
+
+    Returns:
+        RedeFluxo: Receptores, proporções e superfície preenchida.
+
+    Raises:
+        ValueError: Se as entradas forem inválidas.
+
+    Example:
+        >>> rede = calcular_rede_fluxo(z, grade, metodo="dinf", x_pocos=xp, y_pocos=yp)
+        >>> acumulado = rede.acumulacao()
+    """
+    nivel_log = logging.DEBUG if verbose else logging.INFO
+    logger = InterpoladorLogger(
+        "RedeFluxo", nivel=nivel_log, arquivo_log=arquivo_log, console=verbose
+    )
+    logger.iniciar_interpolacao(f"Grade: {grade.shape}, Método: {metodo}")
+
+    try:
+        z = np.asarray(z, dtype=float)
+        _validar_entrada(z, grade, metodo)
+        validas = np.isfinite(z)
+        pocos = _celulas_pocos(grade, validas, x_pocos, y_pocos)
+        saidas = _celulas_saida(validas, pocos)
+
+        if preencher_depressoes:
+            logger.registrar_progresso(10, "Preenchendo depressões")
+            z_preenchida, pai = _preencher_depressoes(z, validas, saidas)
+        else:
+            z_preenchida, pai = z, None
+
+        logger.registrar_progresso(60, "Calculando direções de fluxo")
+        receptor = _receptores_d8(z_preenchida, validas, saidas, pai, grade)
+        if metodo == "dinf":
+            receptores, proporcoes = _receptores_dinf(z_preenchida, receptor, grade)
+        else:
+            receptores, proporcoes = receptor[:, np.newaxis], np.ones((receptor.size, 1))
+        receptores[pocos] = -1
+        proporcoes[pocos] = 0.0
+
+        logger.concluir_interpolacao(f"Poços: {len(pocos)}")
+        return RedeFluxo(grade.shape, metodo, receptores, proporcoes, z_preenchida, pocos)
+
+    except Exception as e:
+        logger.registrar_erro(e)
+        raise
+
+
+def _fatias(deslocamento: int, n: int) -> Tuple[slice, slice]:
+    """Retorna as fatias (destino, origem) de um deslocamento ao longo de um eixo."""
+    if deslocamento >= 0:
+        return slice(0, n - deslocamento), slice(deslocamento, n)
+    return slice(-deslocamento, n), slice(0, n + deslocamento)
+
+
+def _vizinho(a: np.ndarray, dl: int, dc: int, preenchimento: float) -> np.ndarray:
+    """Retorna b com b[i, j] = a[i + dl, j + dc], ou `preenchimento` fora da grade."""
+    b = np.full(a.shape, preenchimento, dtype=a.dtype)
+    linhas_destino, linhas_origem = _fatias(dl, a.shape[0])
+    colunas_destino, colunas_origem = _fatias(dc, a.shape[1])
+    b[linhas_destino, colunas_destino] = a[linhas_origem, colunas_origem]
+    return b
+
+
+def _celulas_pocos(
+    grade: GradeRegular,
+    validas: np.ndarray,
+    x_pocos: Optional[Sequence[float]],
+    y_pocos: Optional[Sequence[float]],
+) -> np.ndarray:
+    """Retorna os índices achatados das células mais próximas dos poços."""
+    if x_pocos is None and y_pocos is None:
+        return np.zeros(0, dtype=np.intp)
+    x = np.asarray(x_pocos, dtype=float).ravel()
+    y = np.asarray(y_pocos, dtype=float).ravel()
+    if x.shape != y.shape:
+        raise ValueError(f"Dimensões incompatíveis: x_pocos({x.shape}), y_pocos({y.shape})")
+
+    colunas = np.rint((x - grade.x0) / grade.dx).astype(np.intp)
+    linhas = np.rint((y - grade.y0) / grade.dy).astype(np.intp)
+    fora = (colunas < 0) | (colunas >= grade.nx) | (linhas < 0) | (linhas >= grade.ny)
+    if np.any(fora):
+        raise ValueError(f"Poços fora da grade: {np.flatnonzero(fora).tolist()}")
+    if not np.all(validas[linhas, colunas]):
+        raise ValueError("Poços em células sem dado (NaN)")
+    return linhas * grade.nx + colunas
+
+
+def _celulas_saida(validas: np.ndarray, pocos: np.ndarray) -> np.ndarray:
+    """Marca as saídas da rede: borda, vizinhos de células sem dado e poços."""
+    saidas = np.zeros(validas.shape, dtype=bool)
+    for dl, dc in _VIZINHOS_D8:
+        saidas |= ~_vizinho(validas, dl, dc, False)
+    saidas &= validas
+    saidas.ravel()[pocos] = True
+    return saidas
+
+
+def _preencher_depressoes(
+    z: np.ndarray, validas: np.ndarray, saidas: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Preenche as depressões até o nível de transbordamento.
+
+    O nível de cada célula é o menor valor máximo de z entre os caminhos até uma
+    saída (o resultado do priority-flood), igual ao máximo de z no caminho até a
+    raiz da árvore geradora mínima do grafo de vizinhança, com peso max(z_a, z_b)
+    em cada aresta e uma raiz virtual ligada às saídas.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Superfície preenchida (ny, nx) e o pai (n,) de
+            cada célula na árvore (-1 para as saídas e células sem dado).
+    """
+    n_celulas = z.size
+    raiz = n_celulas
+    indices = np.arange(n_celulas).reshape(z.shape)
+    origens, destinos = [np.flatnonzero(saidas)], [np.full(np.count_nonzero(saidas), raiz)]
+    for dl, dc in _ARESTAS:
+        pares = validas & _vizinho(validas, dl, dc, False)
+        origens.append(indices[pares])
+        destinos.append(indices[pares] + dl * z.shape[1] + dc)
+    origens, destinos = np.concatenate(origens), np.concatenate(destinos)
+
+    # Pesos deslocados para valores positivos (arestas de peso nulo são ignoradas)
+    z_plano = z.ravel()
+    z_minimo = np.min(z_plano[validas.ravel()])
+    pesos = np.maximum(z_plano[origens], z_plano[np.minimum(destinos, n_celulas - 1)])
+    pesos[destinos == raiz] = z_plano[origens[destinos == raiz]]
+    grafo = sparse.csr_matrix(
+        (pesos - z_minimo + 1.0, (origens, destinos)), shape=(n_celulas + 1, n_celulas + 1)
+    )
+    _, pai = breadth_first_order(
+        minimum_spanning_tree(grafo), raiz, directed=False, return_predecessors=True
+    )
+    pai[pai < 0] = raiz
+
+    # Saltos de ponteiro: máximo de z no caminho até a raiz
+    nivel = np.append(np.where(validas.ravel(), z_plano, -np.inf), -np.inf)
+    ancestral = pai.copy()
+    ativos = np.flatnonzero(ancestral != raiz)
+    while ativos.size:
+        proximos = ancestral[ativos]
+        nivel[ativos] = np.maximum(nivel[ativos], nivel[proximos])
+        ancestral[ativos] = ancestral[proximos]
+        ativos = ativos[ancestral[ativos] != raiz]
+
+    preenchida = np.where(validas, nivel[:n_celulas].reshape(z.shape), np.nan)
+    pai = pai[:n_celulas]
+    pai[pai == raiz] = -1
+    return preenchida, pai
+
+
+def _receptores_d8(
+    z: np.ndarray,
+    validas: np.ndarray,
+    saidas: np.ndarray,
+    pai: Optional[np.ndarray],
+    grade: GradeRegular,
+) -> np.ndarray:
+    """
+    Retorna o receptor D8 de cada célula: o vizinho de maior declividade positiva.
+
+    Células sem vizinho mais baixo escoam para o pai na árvore de preenchimento
+    (áreas planas) ou deixam a rede (saídas, sumidouros sem preenchimento).
+    """
+    alto = np.where(validas, z, np.inf)
+    indices = np.arange(z.size).reshape(z.shape)
+    maior_declive = np.zeros(z.shape)
+    receptor = np.full(z.shape, -1, dtype=np.intp)
+    for dl, dc in _VIZINHOS_D8:
+        with np.errstate(invalid="ignore"):
+            distancia = np.hypot(dl * grade.dy, dc * grade.dx)
+            declive = (alto - _vizinho(alto, dl, dc, np.inf)) / distancia
+        maior = declive > maior_declive
+        maior_declive[maior] = declive[maior]
+        receptor[maior] = indices[maior] + dl * z.shape[1] + dc
+
+    receptor[~validas] = -1
+    receptor = receptor.ravel()
+    if pai is not None:
+        planas = (receptor < 0) & ~saidas.ravel() & validas.ravel()
+        receptor[planas] = pai[planas]
+    return receptor
+
+
+def _receptores_dinf(
+    z: np.ndarray, receptor_d8: np.ndarray, grade: GradeRegular
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Retorna os receptores e proporções D-infinito (Tarboton, 1997).
+
+    Em cada uma das oito facetas (centro, vizinho cardinal, vizinho diagonal) a
+    direção de maior declividade é limitada à faceta; o fluxo é repartido entre os
+    dois vizinhos pela proximidade angular. Células sem declividade positiva (áreas
+    planas e saídas) usam o receptor D8.
+    """
+    indices = np.arange(z.size).reshape(z.shape)
+    maior_declive = np.zeros(z.shape)
+    cardinal = np.full(z.shape, -1, dtype=np.intp)
+    diagonal = np.full(z.shape, -1, dtype=np.intp)
+    fracao_diagonal = np.zeros(z.shape)
+
+    for (cl, cc), (dl, dc) in _FACETAS:
+        d1 = abs(grade.dx) if cl == 0 else abs(grade.dy)
+        d2 = abs(grade.dy) if cl == 0 else abs(grade.dx)
+        angulo_max = np.arctan2(d2, d1)
+        e1 = _vizinho(z, cl, cc, np.nan)
+        e2 = _vizinho(z, dl, dc, np.nan)
+        with np.errstate(invalid="ignore"):
+            s1, s2 = (z - e1) / d1, (e1 - e2) / d2
+            angulo = np.arctan2(s2, s1)
+            declive = np.where(angulo < 0, s1, np.hypot(s1, s2))
+            declive = np.where(angulo > angulo_max, (z - e2) / np.hypot(d1, d2), declive)
+            maior = declive > maior_declive
+        maior_declive[maior] = declive[maior]
+        cardinal[maior] = indices[maior] + cl * z.shape[1] + cc
+        diagonal[maior] = indices[maior] + dl * z.shape[1] + dc
+        fracao_diagonal[maior] = np.clip(angulo[maior], 0, angulo_max) / angulo_max
+
+    receptores = np.column_stack((cardinal.ravel(), diagonal.ravel()))
+    fracao = fracao_diagonal.ravel()
+    proporcoes = np.column_stack((1.0 - fracao, fracao))
+    planas = receptores[:, 0] < 0
+    receptores[planas] = np.column_stack((receptor_d8[planas], np.full(planas.sum(), -1)))
+    proporcoes[planas] = (1.0, 0.0)
+    receptores[proporcoes == 0] = -1
+    return receptores, proporcoes
+
+
+def _validar_entrada(z: np.ndarray, grade: GradeRegular, metodo: str) -> None:
+    """
+    Valida as entradas da rede de fluxo.
+
+    Raises:
+        ValueError: Se alguma entrada for inválida.
+    """
+    if z.shape != grade.shape:
+        raise ValueError(f"Dimensões incompatíveis: grade({grade.shape}), z({z.shape})")
+    if metodo not in _METODOS:
+        raise ValueError(f"Método inválido: '{metodo}'. Opções: {_METODOS}")
+    if not np.any(np.isfinite(z)):
+        raise ValueError("z não possui células com dado")
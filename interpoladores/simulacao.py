@@ -0,0 +1,763 @@
+"""
+Simulação sequencial gaussiana (SGS) condicionada às amostras.
+
+A Krigagem fornece a estimativa e a variância em cada célula, mas não a
+variabilidade conjunta necessária para análises de risco. Este módulo gera
+realizações equiprováveis da superfície: os valores são levados a escores
+normais, cada célula de um caminho aleatório recebe uma amostra da distribuição
+condicional dada pela Krigagem Simples com os vizinhos já conhecidos (amostras e
+células simuladas antes dela), e o resultado é levado de volta à escala original.
+
+Com o caminho aleatório fixo, os vizinhos e os pesos de cada célula são os
+mesmos em todas as realizações: a busca de vizinhos e os sistemas de Krigagem
+são resolvidos uma única vez, e cada realização se reduz a uma soma ponderada
+por célula, vetorizada sobre as realizações de um lote.
+
+Características principais:
+- Transformação em escores normais e retrotransformação com caudas configuráveis
+- Variograma dos escores ajustado pela Krigagem (ou fornecido na configuração)
+- Vizinhança local (número de vizinhos e raio, na elipse de anisotropia)
+- Busca de vizinhos e pesos calculados uma vez e reaproveitados entre realizações
+- Realizações em paralelo em vários processos, reprodutíveis pela semente
+- Saída (R, ny, nx) em memória ou mapeada em disco (`.npy`) para R grande
+
+Classes:
+    - TransformacaoNormal: Transformação em escores normais e sua inversa.
+    - SimulacaoGaussiana: Simulação sequencial gaussiana condicionada.
+
+Dependências:
+    - numpy: Para operações numéricas eficientes
+    - scipy.stats: Para os quantis da distribuição normal
+    - scipy.spatial.cKDTree: Para a busca de vizinhos
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Optional, Tuple, Union
+
+import numpy as np  # noqa: F401
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import cdist
+from scipy.stats import norm
+
+from interpoladores.config import KrigagemConfig
+from interpoladores.krigagem import Krigagem, VariogramaAjustado
+from utils.grid_utils import GradeRegular, coordenadas_grade
+from utils.logging_utils import InterpoladorLogger
+
+# Distâncias abaixo deste limite são tratadas como nulas (mesmo corte da Krigagem)
+_EPS = 1e-10
+
+# Número de vizinhos quando KrigagemConfig.n_neighbors é None
+_VIZINHOS_PADRAO = 16
+
+# Modelos de variograma com patamar, exigidos pela Krigagem Simples
+_MODELOS_COM_PATAMAR = ("spherical", "exponential", "gaussian")
+
+# Células do caminho processadas por etapa na busca de vizinhos
+_CELULAS_POR_ETAPA = 1024
+
+# Até esta posição do caminho, as células anteriores são comparadas por uma
+# matriz de distâncias densa; depois, por árvores KD de prefixos do caminho
+_CELULAS_BUSCA_DIRETA = 4096
+
+# Escore normal associado aos limites zmin e zmax na retrotransformação
+_ESCORE_LIMITE = 5.0
+
+# Orçamento de memória (MB) dos lotes de realizações quando max_memory_mb é None
+_MEMORIA_PADRAO_MB = 256.0
+
+# Lotes de realizações por processo na execução paralela (equilíbrio de carga)
+_LOTES_POR_PROCESSO = 2
+
+# Plano de simulação de cada processo da execução paralela, recebido uma única vez
+# por `_inicializar_processo`
+_plano_processo = None
+
+
+@dataclass
+class TransformacaoNormal:
+    """
+    Transformação dos valores em escores normais (anamorfose gaussiana) e sua inversa.
+
+    Os valores ordenados recebem os quantis `(i + 0.5) / N` da normal padrão
+    (valores empatados recebem a média dos seus escores). A retrotransformação
+    interpola linearmente a tabela; além dos extremos dos dados, usa `zmin` e
+    `zmax` (associados aos escores ±5) ou, se não definidos, repete o extremo.
+
+    Attributes:
+        valores (np.ndarray): Valores distintos ordenados da tabela.
+        escores (np.ndarray): Escores normais correspondentes.
+
+    Example:
+        >>> transformacao = TransformacaoNormal.ajustar(z)
+        >>> y = transformacao.direta(z)
+        >>> np.allclose(transformacao.inversa(y), z)
+        True
+    """
+
+    valores: np.ndarray
+    escores: np.ndarray
+
+    @classmethod
+    def ajustar(
+        cls, z: np.ndarray, zmin: Optional[float] = None, zmax: Optional[float] = None
+    ) -> "TransformacaoNormal":
+        """
+        Constrói a tabela de transformação a partir dos valores amostrados.
+
+        Args:
+            z (np.ndarray): Valores amostrados (N,).
+            zmin (float, optional): Limite inferior da cauda na retrotransformação.
+                Se None, usa o menor valor amostrado. Default é None.
+            zmax (float, optional): Limite superior da cauda na retrotransformação.
+                Se None, usa o maior valor amostrado. Default é None.
+
+        Returns:
+            TransformacaoNormal: Transformação ajustada.
+
+        Raises:
+            ValueError: Se os limites não envolverem os valores amostrados.
+        """
+        z = np.asarray(z, dtype=float)
+        quantis = norm.ppf((np.arange(z.size) + 0.5) / z.size)
+        valores, grupos = np.unique(np.sort(z), return_inverse=True)
+        escores = np.bincount(grupos, weights=quantis) / np.bincount(grupos)
+
+        if zmin is not None:
+            if zmin > valores[0]:
+                raise ValueError(f"zmin ({zmin}) deve ser <= menor valor ({valores[0]})")
+            valores, escores = np.r_[zmin, valores], np.r_[-_ESCORE_LIMITE, escores]
+        if zmax is not None:
+            if zmax < valores[-1]:
+                raise ValueError(f"zmax ({zmax}) deve ser >= maior valor ({valores[-1]})")
+            valores, escores = np.r_[valores, zmax], np.r_[escores, _ESCORE_LIMITE]
+        return cls(valores, escores)
+
+    def direta(self, z: np.ndarray) -> np.ndarray:
+        """
+        Converte valores em escores normais.
+
+        Args:
+            z (np.ndarray): Valores na escala original.
+
+        Returns:
+            np.ndarray: Escores normais, com o mesmo formato de `z`.
+        """
+        return np.interp(z, self.valores, self.escores)
+
+    def inversa(self, y: np.ndarray) -> np.ndarray:
+        """
+        Converte escores normais de volta à escala original.
+
+        Args:
+            y (np.ndarray): Escores normais.
+
+        Returns:
+            np.ndarray: Valores na escala original, com o mesmo formato de `y`.
+        """
+        return np.interp(y, self.escores, self.valores)
+
+
+@dataclass
+class _PlanoSimulacao:
+    """
+    Caminho, vizinhos e pesos da simulação, comuns a todas as realizações.
+
+    Os valores de uma realização ficam em um vetor (N + G,): os escores das N
+    amostras seguidos das G células na ordem do caminho. As células sobre uma
+    amostra não fazem parte do caminho e recebem o valor da amostra.
+
+    Attributes:
+        caminho (np.ndarray): Células da grade (G,) na ordem de simulação.
+        vizinhos (np.ndarray): Índices (G, k) dos vizinhos no vetor de valores.
+        pesos (np.ndarray): Pesos (G, k) da Krigagem Simples (zero sem vizinho).
+        desvios (np.ndarray): Desvios padrão (G,) da Krigagem Simples.
+        escores (np.ndarray): Escores normais das amostras (N,).
+        transformacao (TransformacaoNormal): Transformação dos valores.
+        shape (Tuple[int, ...]): Formato da grade.
+        nos_amostrados (np.ndarray): Células da grade sobre uma amostra.
+        amostras_nos (np.ndarray): Amostra de cada célula em `nos_amostrados`.
+    """
+
+    caminho: np.ndarray
+    vizinhos: np.ndarray
+    pesos: np.ndarray
+    desvios: np.ndarray
+    escores: np.ndarray
+    transformacao: TransformacaoNormal
+    shape: Tuple[int, ...]
+    nos_amostrados: np.ndarray
+    amostras_nos: np.ndarray
+
+
+class SimulacaoGaussiana:
+    """
+    Simulação sequencial gaussiana (SGS) condicionada às amostras.
+
+    Cada realização reproduz os valores amostrados, o histograma (pela
+    transformação em escores normais) e o variograma dos escores. A distribuição
+    condicional de cada célula é dada pela Krigagem Simples (média zero) com até
+    `n_neighbors` vizinhos dentro de `max_distance`, entre as amostras e as células
+    já simuladas; a vizinhança é a elipse de anisotropia. O variograma deve ter
+    patamar ('spherical', 'exponential' ou 'gaussian').
+
+    Args:
+        x (list or np.ndarray): Coordenadas X dos pontos amostrados.
+        y (list or np.ndarray): Coordenadas Y dos pontos amostrados.
+        z (list or np.ndarray): Valores associados aos pontos.
+        config (KrigagemConfig, optional): Modelo de variograma, anisotropia e
+            vizinhança (n_neighbors, por padrão 16, e max_distance). Parâmetros em
+            variogram_model_parameters devem se referir aos escores normais. Se None,
+            usa a configuração padrão. Default é None.
+        zmin (float, optional): Limite inferior da retrotransformação. Default é None.
+        zmax (float, optional): Limite superior da retrotransformação. Default é None.
+        verbose (bool, optional): Se True, exibe logs detalhados. Default é False.
+        arquivo_log (str, optional): Caminho para arquivo de log. Se None, não salva logs.
+            Default é None.
+
+    Example:
+        >>> sgs = SimulacaoGaussiana(x, y, z, config=KrigagemConfig(n_neighbors=12)).ajustar()
+        >>> realizacoes = sgs.simular(grid_x, grid_y, n_realizacoes=100, seed=1, n_jobs=4)
+        >>> realizacoes.shape
+        (100, ny, nx)
+        >>> p90 = np.percentile(realizacoes, 90, axis=0)
+    """
+
+    def __init__(
+        self,
+        x: Union[list, np.ndarray],
+        y: Union[list, np.ndarray],
+        z: Union[list, np.ndarray],
+        *,
+        config: KrigagemConfig = None,
+        zmin: Optional[float] = None,
+        zmax: Optional[float] = None,
+        verbose: bool = False,
+        arquivo_log: Optional[str] = None,
+    ):
+        """
+        Inicializa a simulação.
+
+        Args:
+            x (list or np.ndarray): Coordenadas X dos pontos amostrados.
+            y (list or np.ndarray): Coordenadas Y dos pontos amostrados.
+            z (list or np.ndarray): Valores associados aos pontos.
+            config (KrigagemConfig, optional): Configuração do variograma e da
+                vizinhança. Default é None.
+            zmin (float, optional): Limite inferior da retrotransformação. Default é None.
+            zmax (float, optional): Limite superior da retrotransformação. Default é None.
+            verbose (bool, optional): Se True, exibe logs detalhados. Default é False.
+            arquivo_log (str, optional): Caminho para arquivo de log. Default é None.
+        """
+        if len(x) != len(y) or len(x) != len(z):
+            raise ValueError(f"Dimensões incompatíveis: x({len(x)}), y({len(y)}), z({len(z)})")
+
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.z = np.asarray(z, dtype=float)
+        self.config = config if config is not None else KrigagemConfig()
+        self.zmin, self.zmax = zmin, zmax
+
+        # Estado ajustado: transformação e variograma dos escores normais
+        self.transformacao: Optional[TransformacaoNormal] = None
+        self.variograma: Optional[VariogramaAjustado] = None
+        self._krigagem: Optional[Krigagem] = None
+
+        nivel_log = logging.DEBUG if verbose else logging.INFO
+        self.logger = InterpoladorLogger(
+            "SimulacaoGaussiana", nivel=nivel_log, arquivo_log=arquivo_log, console=verbose
+        )
+
+    def ajustar(self) -> "SimulacaoGaussiana":
+        """
+        Transforma os valores em escores normais e ajusta o variograma dos escores.
+
+        Returns:
+            SimulacaoGaussiana: A própria instância, para encadeamento com `simular`.
+
+        Raises:
+            ValueError: Se o modelo de variograma não tiver patamar.
+        """
+        self.logger.iniciar_interpolacao(
+            f"Ajuste da simulação - Pontos: {len(self.x)}, "
+            f"Modelo: {self.config.modelo_variograma}"
+        )
+
+        try:
+            if self.config.modelo_variograma not in _MODELOS_COM_PATAMAR:
+                raise ValueError(
+                    f"A simulação exige um variograma com patamar "
+                    f"({', '.join(_MODELOS_COM_PATAMAR)}), mas recebeu "
+                    f"'{self.config.modelo_variograma}'"
+                )
+
+            self.transformacao = TransformacaoNormal.ajustar(self.z, self.zmin, self.zmax)
+            escores = self.transformacao.direta(self.z)
+            self.logger.registrar_progresso(30, "Escores normais calculados")
+
+            # O variograma dos escores é ajustado (em subamostra) pela Krigagem local
+            n_neighbors = self.config.n_neighbors or _VIZINHOS_PADRAO
+            config = replace(self.config, n_neighbors=n_neighbors, n_jobs=1)
+            self._krigagem = Krigagem(self.x, self.y, escores, config=config).ajustar()
+            self.variograma = self._krigagem.variograma
+
+            self.logger.concluir_interpolacao(f"Parâmetros: {self.variograma.parametros}")
+            return self
+
+        except Exception as e:
+            self.logger.registrar_erro(e)
+            raise
+
+    def simular(
+        self,
+        grid_x: Union[np.ndarray, GradeRegular],
+        grid_y: Optional[np.ndarray] = None,
+        n_realizacoes: int = 1,
+        seed: Optional[int] = None,
+        n_jobs: int = 1,
+        arquivo_saida: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Gera realizações condicionadas sobre a grade.
+
+        O caminho aleatório, os vizinhos e os pesos de Krigagem Simples de cada
+        célula são calculados uma única vez e compartilhados por todas as
+        realizações. Cada realização usa o seu próprio ruído, derivado de `seed`,
+        e o resultado não depende de `n_jobs` nem do tamanho dos lotes.
+
+        Args:
+            grid_x (np.ndarray or GradeRegular): Meshgrid com coordenadas X da grade,
+                ou `GradeRegular`.
+            grid_y (np.ndarray, optional): Meshgrid com coordenadas Y da grade (None se
+                `grid_x` for uma GradeRegular).
+            n_realizacoes (int, optional): Número R de realizações. Default é 1.
+            seed (int, optional): Semente do caminho e dos ruídos. Default é None.
+            n_jobs (int, optional): Número de processos entre os quais os lotes de
+                realizações são distribuídos. Se -1 (ou qualquer valor <= 0), usa
+                todos os núcleos. Default é 1.
+            arquivo_saida (str, optional): Arquivo `.npy` em que as realizações são
+                gravadas diretamente (mapeado em memória), sem manter a pilha na
+                memória. Se None, retorna um array em memória. Default é None.
+
+        Returns:
+            np.ndarray: Realizações (R, *shape da grade), ou `np.memmap` do arquivo
+                de saída.
+
+        Raises:
+            RuntimeError: Se `ajustar` não tiver sido chamado antes.
+            ValueError: Se n_realizacoes for inválido ou a grade for inválida.
+        """
+        if self.variograma is None:
+            raise RuntimeError("Simulação não ajustada: chame ajustar() antes de simular()")
+        if n_realizacoes < 1:
+            raise ValueError(f"n_realizacoes deve ser >= 1, mas recebeu {n_realizacoes}")
+
+        self.logger.iniciar_interpolacao(
+            f"Simulação - Pontos: {len(self.x)}, Grade: {np.shape(grid_x)}, "
+            f"Realizações: {n_realizacoes}"
+        )
+
+        try:
+            semente_caminho, *sementes = np.random.SeedSequence(seed).spawn(n_realizacoes + 1)
+            plano = self._planejar(grid_x, grid_y, np.random.default_rng(semente_caminho))
+            self.logger.registrar_progresso(
+                50, f"Plano com {plano.vizinhos.shape[1]} vizinhos por célula concluído"
+            )
+
+            shape = (n_realizacoes,) + plano.shape
+            if arquivo_saida is not None:
+                realizacoes = np.lib.format.open_memmap(
+                    arquivo_saida, mode="w+", dtype=float, shape=shape
+                )
+            else:
+                realizacoes = np.empty(shape)
+
+            n_jobs = _resolver_n_jobs(n_jobs)
+            lotes = self._lotes(n_realizacoes, len(plano.escores) + len(plano.caminho), n_jobs)
+            if n_jobs > 1 and len(lotes) > 1:
+                self.logger.registrar_progresso(
+                    60, f"{len(lotes)} lotes de realizações em {n_jobs} processo(s)"
+                )
+                with ProcessPoolExecutor(
+                    max_workers=n_jobs, initializer=_inicializar_processo, initargs=(plano,)
+                ) as executor:
+                    tarefas = [sementes[inicio:fim] for inicio, fim in lotes]
+                    for (inicio, fim), lote in zip(lotes, executor.map(_simular_lote, tarefas)):
+                        realizacoes[inicio:fim] = lote
+            else:
+                for inicio, fim in lotes:
+                    realizacoes[inicio:fim] = _realizar(plano, sementes[inicio:fim])
+
+            if arquivo_saida is not None:
+                realizacoes.flush()
+            self.logger.concluir_interpolacao(f"Realizações: {realizacoes.shape}")
+            return realizacoes
+
+        except Exception as e:
+            self.logger.registrar_erro(e)
+            raise
+
+    def _lotes(self, n_realizacoes: int, n_valores: int, n_jobs: int) -> list:
+        """
+        Divide as realizações em lotes que cabem no orçamento de memória.
+
+        Args:
+            n_realizacoes (int): Número de realizações.
+            n_valores (int): Tamanho N + G do vetor de valores de uma realização.
+            n_jobs (int): Número de processos.
+
+        Returns:
+            list: Pares (início, fim) dos lotes.
+        """
+        memoria_mb = self.config.max_memory_mb
+        orcamento = (memoria_mb if memoria_mb is not None else _MEMORIA_PADRAO_MB) * 2**20
+        # Vetor de valores e ruídos de cada realização do lote, por processo
+        tamanho = max(1, int(orcamento / n_jobs // (2 * 8 * n_valores)))
+        if n_jobs > 1:
+            tamanho = min(tamanho, -(-n_realizacoes // (n_jobs * _LOTES_POR_PROCESSO)))
+        limites = list(range(0, n_realizacoes, tamanho)) + [n_realizacoes]
+        return list(zip(limites[:-1], limites[1:]))
+
+    def _planejar(
+        self,
+        grid_x: Union[np.ndarray, GradeRegular],
+        grid_y: Optional[np.ndarray],
+        rng: np.random.Generator,
+    ) -> _PlanoSimulacao:
+        """
+        Sorteia o caminho e calcula vizinhos e pesos de todas as células.
+
+        As células a até `_EPS` de uma amostra recebem o valor dela e ficam fora do
+        caminho: como vizinhas de outras células, repetiriam a linha da amostra no
+        sistema de Krigagem Simples, que se tornaria singular com efeito pepita
+        nulo. O caminho é percorrido em etapas de `_CELULAS_POR_ETAPA` células. Os
+        vizinhos de cada célula são os k mais próximos entre as amostras (árvore KD
+        fixa) e as células anteriores no caminho. A árvore das células cobre um
+        prefixo do caminho cujo tamanho dobra a cada reconstrução (ver
+        `_arvore_celulas`), e as células ainda não simuladas são descartadas pela
+        posição no caminho (ver `_celulas_anteriores`).
+
+        Args:
+            grid_x (np.ndarray or GradeRegular): Coordenadas X da grade.
+            grid_y (np.ndarray, optional): Coordenadas Y da grade.
+            rng (np.random.Generator): Gerador do caminho aleatório.
+
+        Returns:
+            _PlanoSimulacao: Plano compartilhado pelas realizações.
+        """
+        shape, coordenadas = coordenadas_grade(grid_x, grid_y)
+        caminho = rng.permutation(int(np.prod(shape)))
+
+        # Amostras e células (na ordem do caminho) no espaço isotrópico
+        amostras, centro = self._krigagem._pontos_isotropicos()
+        celulas = self._krigagem._ajustar_anisotropia(coordenadas(caminho), centro)
+        arvore_amostras, arvore_celulas = cKDTree(amostras), None
+
+        # Células sobre uma amostra recebem o seu valor, fora do caminho
+        d_amostra, amostra = arvore_amostras.query(
+            celulas, distance_upper_bound=np.nextafter(_EPS, np.inf)
+        )
+        sobre_amostra = np.isfinite(d_amostra)
+        nos_amostrados, amostras_nos = caminho[sobre_amostra], amostra[sobre_amostra]
+        caminho, celulas = caminho[~sobre_amostra], celulas[~sobre_amostra]
+
+        pontos = np.vstack((amostras, celulas))
+        n_amostras, n_celulas = len(amostras), len(caminho)
+        k = self.config.n_neighbors or _VIZINHOS_PADRAO
+        raio = self.config.max_distance if self.config.max_distance is not None else np.inf
+
+        vizinhos = np.empty((n_celulas, k), dtype=np.int64)
+        pesos = np.empty((n_celulas, k))
+        desvios = np.empty(n_celulas)
+        for inicio in range(0, n_celulas, _CELULAS_POR_ETAPA):
+            fim = min(inicio + _CELULAS_POR_ETAPA, n_celulas)
+            arvore_celulas = _arvore_celulas(arvore_celulas, celulas, fim)
+            distancias, indices = _vizinhos_etapa(
+                arvore_amostras, arvore_celulas, celulas, n_amostras, inicio, fim, k, raio
+            )
+            vizinhos[inicio:fim] = indices
+            pesos[inicio:fim], desvios[inicio:fim] = self._krigagem_simples(
+                pontos, celulas[inicio:fim], indices, distancias
+            )
+
+        return _PlanoSimulacao(
+            caminho=caminho,
+            vizinhos=vizinhos,
+            pesos=pesos,
+            desvios=desvios,
+            escores=self.transformacao.direta(self.z),
+            transformacao=self.transformacao,
+            shape=tuple(shape),
+            nos_amostrados=nos_amostrados,
+            amostras_nos=amostras_nos,
+        )
+
+    def _krigagem_simples(
+        self,
+        pontos: np.ndarray,
+        xi: np.ndarray,
+        indices: np.ndarray,
+        distancias: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Resolve os sistemas de Krigagem Simples (média zero) de uma etapa.
+
+        A covariância é `C(h) = patamar - γ(h)`, com `C(0) = patamar` na diagonal.
+        Um vizinho na mesma posição de outro anterior na lista (amostras repetidas)
+        é descartado, pois repetiria a linha do outro no sistema.
+
+        Args:
+            pontos (np.ndarray): Amostras e células (N + G, 2) no espaço isotrópico.
+            xi (np.ndarray): Células (B, 2) da etapa no espaço isotrópico.
+            indices (np.ndarray): Índices (B, k) dos vizinhos em `pontos`.
+            distancias (np.ndarray): Distâncias (B, k) aos vizinhos (inf sem vizinho).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Pesos (B, k) e desvios padrão (B,).
+        """
+        k = indices.shape[1]
+        patamar = self.variograma.parametros[0] + self.variograma.parametros[-1]
+
+        vizinhos = pontos[indices]
+        d_pontos = np.sqrt(
+            ((vizinhos[:, :, np.newaxis, :] - vizinhos[:, np.newaxis, :, :]) ** 2).sum(axis=-1)
+        )
+        d_celula = np.sqrt(((vizinhos - xi[:, np.newaxis, :]) ** 2).sum(axis=-1))
+
+        # Vizinhos na posição de um anterior da lista (amostras repetidas) são descartados
+        validos = np.isfinite(distancias)
+        anteriores = np.tri(k, k, -1, dtype=bool)
+        repetidos = ((d_pontos <= _EPS) & anteriores & validos[:, np.newaxis, :]).any(axis=2)
+        validos &= ~repetidos
+        pares = validos[:, :, np.newaxis] & validos[:, np.newaxis, :]
+
+        # Posições sem vizinho viram linhas da identidade, com peso zero na solução
+        c = np.where(pares, patamar - self.variograma.gamma(d_pontos), 0.0)
+        diagonal = np.arange(k)
+        c[:, diagonal, diagonal] = np.where(validos, patamar, 1.0)
+        c0 = np.where(validos, patamar - self.variograma.gamma(d_celula), 0.0)
+
+        pesos = np.linalg.solve(c, c0[:, :, np.newaxis])[:, :, 0]
+        variancia = np.maximum(patamar - (pesos * c0).sum(axis=1), 0.0)
+        return pesos, np.sqrt(variancia)
+
+
+def _vizinhos_etapa(
+    arvore_amostras: cKDTree,
+    arvore_celulas: Optional[cKDTree],
+    celulas: np.ndarray,
+    n_amostras: int,
+    inicio: int,
+    fim: int,
+    k: int,
+    raio: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Busca os k vizinhos conhecidos das células de uma etapa do caminho.
+
+    Args:
+        arvore_amostras (cKDTree): Árvore das amostras.
+        arvore_celulas (cKDTree, optional): Árvore de um prefixo do caminho que
+            contém a etapa (None enquanto a busca é direta).
+        celulas (np.ndarray): Células (G, 2) na ordem do caminho.
+        n_amostras (int): Número N de amostras (deslocamento dos índices das células).
+        inicio (int): Primeira posição da etapa no caminho.
+        fim (int): Posição final (exclusiva) da etapa.
+        k (int): Número de vizinhos.
+        raio (float): Raio de busca (inf sem limite).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Distâncias (B, k), inf nas posições sem
+            vizinho, e índices (B, k) no vetor de valores (0 sem vizinho).
+    """
+    xi = celulas[inicio:fim]
+    limite = np.nextafter(raio, np.inf)
+
+    # Candidatos: amostras e células anteriores no caminho
+    d_amostras, i_amostras = arvore_amostras.query(
+        xi, k=min(k, n_amostras), distance_upper_bound=limite
+    )
+    d_celulas, i_celulas = _celulas_anteriores(arvore_celulas, celulas, inicio, fim, k, raio)
+    distancias = np.concatenate((d_amostras.reshape(len(xi), -1), d_celulas), axis=1)
+    indices = np.concatenate((i_amostras.reshape(len(xi), -1), i_celulas + n_amostras), axis=1)
+
+    if distancias.shape[1] > k:
+        mais_proximos = np.argpartition(distancias, k - 1, axis=1)[:, :k]
+        distancias = np.take_along_axis(distancias, mais_proximos, axis=1)
+        indices = np.take_along_axis(indices, mais_proximos, axis=1)
+    else:
+        preenchimento = ((0, 0), (0, k - distancias.shape[1]))
+        distancias = np.pad(distancias, preenchimento, constant_values=np.inf)
+        indices = np.pad(indices, preenchimento)
+    return distancias, np.where(np.isfinite(distancias), indices, 0)
+
+
+def _celulas_anteriores(
+    arvore_celulas: Optional[cKDTree],
+    celulas: np.ndarray,
+    inicio: int,
+    fim: int,
+    k: int,
+    raio: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Busca, para cada célula da etapa, as células mais próximas já simuladas.
+
+    Uma célula só pode usar as células de posição menor no caminho. No início do
+    caminho (até `_CELULAS_BUSCA_DIRETA`), elas são comparadas por distâncias
+    diretas. Depois, a árvore das P primeiras células do caminho é consultada com
+    folga: como o caminho é aleatório, uma fração `inicio / P` (mais de um terço)
+    dos vizinhos já foi simulada, e a consulta pede `2 k P / inicio` vizinhos. As
+    células cuja consulta não achou k vizinhos anteriores (sem esgotar o raio) são
+    consultadas de novo, com o dobro de vizinhos.
+
+    Args:
+        arvore_celulas (cKDTree, optional): Árvore das P primeiras células do
+            caminho, com P >= fim (None enquanto a busca é direta).
+        celulas (np.ndarray): Células (G, 2) na ordem do caminho.
+        inicio (int): Primeira posição da etapa no caminho.
+        fim (int): Posição final (exclusiva) da etapa.
+        k (int): Número de vizinhos.
+        raio (float): Raio de busca (inf sem limite).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Distâncias (B, m), inf nas posições sem
+            vizinho, e posições (B, m) das células no caminho.
+    """
+    xi = celulas[inicio:fim]
+    posicoes = np.arange(inicio, fim)[:, np.newaxis]
+    if fim <= _CELULAS_BUSCA_DIRETA:
+        distancias = cdist(xi, celulas[:fim])
+        indices = np.broadcast_to(np.arange(fim), distancias.shape)
+        distancias[(indices >= posicoes) | (distancias > raio)] = np.inf
+        return distancias, indices
+
+    n_arvore = arvore_celulas.n
+    limite = np.nextafter(raio, np.inf)
+    distancias = np.full((len(xi), k), np.inf)
+    indices = np.zeros((len(xi), k), dtype=np.int64)
+    pendentes = np.arange(len(xi))
+    k_busca = min(n_arvore, -(-2 * k * n_arvore // inicio))
+    while pendentes.size:
+        d, i = arvore_celulas.query(xi[pendentes], k=k_busca, distance_upper_bound=limite)
+        anteriores = i < posicoes[pendentes]
+
+        # As consultas vêm ordenadas por distância: os k primeiros anteriores
+        primeiros = np.argsort(~anteriores, axis=1, kind="stable")[:, :k]
+        selecionados = np.take_along_axis(anteriores, primeiros, axis=1)
+        distancias[pendentes] = np.where(selecionados, np.take_along_axis(d, primeiros, 1), np.inf)
+        indices[pendentes] = np.take_along_axis(i, primeiros, axis=1)
+
+        completas = selecionados.all(axis=1) | np.isinf(d[:, -1]) | (k_busca == n_arvore)
+        pendentes = pendentes[~completas]
+        k_busca = min(n_arvore, 2 * k_busca)
+    return distancias, indices
+
+
+def _arvore_celulas(arvore: Optional[cKDTree], celulas: np.ndarray, fim: int) -> Optional[cKDTree]:
+    """
+    Devolve a árvore de um prefixo do caminho que contém as células até `fim`.
+
+    O prefixo dobra de tamanho a cada reconstrução (`2 x _CELULAS_BUSCA_DIRETA`,
+    o dobro, ...), de modo que as árvores somam menos de 2G células e o prefixo
+    tem sempre menos que o dobro das células já percorridas.
+
+    Args:
+        arvore (cKDTree, optional): Árvore da etapa anterior (None na primeira).
+        celulas (np.ndarray): Células (G, 2) na ordem do caminho.
+        fim (int): Posição final (exclusiva) da etapa.
+
+    Returns:
+        Optional[cKDTree]: Árvore do prefixo, ou None enquanto a busca é direta.
+    """
+    if fim <= _CELULAS_BUSCA_DIRETA:
+        return None
+    if arvore is not None and arvore.n >= fim:
+        return arvore
+    tamanho = 2 * _CELULAS_BUSCA_DIRETA
+    while tamanho < fim:
+        tamanho *= 2
+    return cKDTree(celulas[: min(tamanho, len(celulas))])
+
+
+def _realizar(plano: _PlanoSimulacao, sementes: list) -> np.ndarray:
+    """
+    Gera um lote de realizações percorrendo o caminho com os pesos do plano.
+
+    Args:
+        plano (_PlanoSimulacao): Plano compartilhado pelas realizações.
+        sementes (list): `np.random.SeedSequence` de cada realização do lote.
+
+    Returns:
+        np.ndarray: Realizações (L, *shape) retrotransformadas.
+    """
+    n_amostras, n_celulas = len(plano.escores), len(plano.caminho)
+
+    # Valores (N + G, L), uma coluna por realização. A soma ponderada ao longo do
+    # eixo 0 acumula as linhas em ordem fixa, e cada realização independe do lote;
+    # uma coluna extra evita a soma em pares do NumPy em lotes de uma realização
+    largura = max(len(sementes), 2)
+    ruido = np.zeros((n_celulas, largura))
+    for coluna, semente in enumerate(sementes):
+        ruido[:, coluna] = np.random.default_rng(semente).standard_normal(n_celulas)
+    ruido *= plano.desvios[:, np.newaxis]
+
+    valores = np.empty((n_amostras + n_celulas, largura))
+    valores[:n_amostras] = plano.escores[:, np.newaxis]
+    pesos = plano.pesos[:, :, np.newaxis]
+    for posicao in range(n_celulas):
+        valores[n_amostras + posicao] = (valores[plano.vizinhos[posicao]] * pesos[posicao]).sum(
+            axis=0
+        ) + ruido[posicao]
+
+    realizacoes = np.empty((len(sementes), int(np.prod(plano.shape))))
+    simulados = valores[n_amostras:].T
+    realizacoes[:, plano.caminho] = plano.transformacao.inversa(simulados[: len(sementes)])
+    realizacoes[:, plano.nos_amostrados] = plano.transformacao.inversa(
+        plano.escores[plano.amostras_nos]
+    )
+    return realizacoes.reshape((len(sementes),) + plano.shape)
+
+
+def _inicializar_processo(plano: _PlanoSimulacao) -> None:
+    """
+    Recebe, uma vez por processo, o plano compartilhado pelas realizações.
+
+    Args:
+        plano (_PlanoSimulacao): Plano da simulação.
+    """
+    global _plano_processo
+    _plano_processo = plano
+
+
+def _simular_lote(sementes: list) -> np.ndarray:
+    """
+    Gera um lote de realizações no processo atual.
+
+    Args:
+        sementes (list): `np.random.SeedSequence` de cada realização do lote.
+
+    Returns:
+        np.ndarray: Realizações (L, *shape).
+    """
+    return _realizar(_plano_processo, sementes)
+
+
+def _resolver_n_jobs(n_jobs: Optional[int]) -> int:
+    """
+    Resolve o número de processos.
+
+    Args:
+        n_jobs (int, optional): Número de processos (<= 0 usa todos os núcleos).
+
+    Returns:
+        int: Número de processos.
+    """
+    if n_jobs is None or n_jobs == 1:
+        return 1
+    if n_jobs <= 0:
+        return os.cpu_count() or 1
+    return int(n_jobs)
@@ -0,0 +1,502 @@
+"""
+Validação cruzada leave-one-out (LOO) para a escolha de parâmetros do IDW e do
+modelo de variograma da Krigagem.
+
+Este módulo avalia, sem interpolar nenhuma grade, o erro de previsão em cada
+ponto amostrado quando esse ponto é removido do conjunto. No IDW, uma única busca
+de k+1 vizinhos sobre os próprios pontos alimenta todos os candidatos: os pesos
+são calculados de uma vez para todos os expoentes e somas acumuladas ao longo
+dos vizinhos fornecem a previsão para todos os números de vizinhos. Na Krigagem,
+todos os resíduos saem de uma única inversão da matriz de Krigagem (atalho de
+Dubrule), e os modelos de variograma candidatos são comparados pelo erro
+padronizado.
+
+Características principais:
+- Uma única consulta à árvore KD para toda a grade de candidatos
+- Avaliação vetorizada de vários expoentes e números de vizinhos
+- RMSE e MAE por candidato e configuração ótima pronta para uso
+- Resíduos e erros padronizados da Krigagem sem N novos ajustes
+- Seleção automática do modelo de variograma, com candidatos em paralelo
+
+Classes:
+    - ResultadoValidacaoIDW: Erros por candidato e melhor configuração.
+    - ResultadoValidacaoKrigagem: Resíduos e métricas LOO de um modelo de variograma.
+    - ResultadoSelecaoVariograma: Métricas por modelo e melhor configuração.
+
+Funções:
+    - validacao_cruzada_idw: Executa a validação cruzada LOO do IDW.
+    - validacao_cruzada_krigagem: Executa a validação cruzada LOO da Krigagem.
+    - selecionar_modelo_variograma: Ordena modelos de variograma pela validação cruzada.
+
+Dependências:
+    - numpy: Para operações numéricas eficientes
+    - scipy.spatial.cKDTree: Para busca eficiente de vizinhos próximos
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np  # noqa: F401
+from scipy.spatial import cKDTree  # noqa: F401
+
+from interpoladores.config import IDWConfig, KrigagemConfig
+from interpoladores.krigagem import Krigagem, VariogramaAjustado
+from utils.logging_utils import InterpoladorLogger
+
+# Critérios aceitos para a escolha da melhor configuração
+_CRITERIOS = ("rmse", "mae")
+
+# Critérios aceitos para a escolha do modelo de variograma
+_CRITERIOS_VARIOGRAMA = ("erro_padronizado", "rmse", "mae")
+
+# Modelos de variograma comparados por padrão (os mesmos da opção --modelo)
+_MODELOS_VARIOGRAMA = ("spherical", "exponential", "gaussian", "linear")
+
+
+@dataclass
+class ResultadoValidacaoIDW:
+    """
+    Resultado da validação cruzada leave-one-out do IDW.
+
+    Attributes:
+        powers (np.ndarray): Expoentes avaliados, shape (P,).
+        n_neighbors (list): Números de vizinhos avaliados (None = todos os pontos), tamanho K.
+        rmse (np.ndarray): Raiz do erro quadrático médio por candidato, shape (P, K).
+        mae (np.ndarray): Erro absoluto médio por candidato, shape (P, K).
+        n_validos (np.ndarray): Número de pontos com previsão válida (com ao menos
+            um vizinho) por candidato, shape (P, K).
+        melhor_config (IDWConfig): Configuração com o menor erro pelo critério escolhido.
+    """
+
+    powers: np.ndarray
+    n_neighbors: list
+    rmse: np.ndarray
+    mae: np.ndarray
+    n_validos: np.ndarray
+    melhor_config: IDWConfig
+
+
+@dataclass
+class ResultadoValidacaoKrigagem:
+    """
+    Resultado da validação cruzada leave-one-out da Krigagem com um variograma.
+
+    Attributes:
+        variograma (VariogramaAjustado): Variograma ajustado e mantido fixo na validação.
+        residuos (np.ndarray): Resíduos `z_i - ẑ_(-i)`, shape (N,).
+        variancias (np.ndarray): Variâncias de Krigagem leave-one-out, shape (N,).
+        erros_padronizados (np.ndarray): Resíduos divididos pelo desvio padrão de
+            Krigagem, shape (N,).
+        rmse (float): Raiz do erro quadrático médio.
+        mae (float): Erro absoluto médio.
+        erro_medio_padronizado (float): Média dos erros padronizados (ideal 0).
+        erro_quadratico_padronizado (float): Média dos quadrados dos erros
+            padronizados (ideal 1; acima de 1 a variância de Krigagem é otimista).
+    """
+
+    variograma: VariogramaAjustado
+    residuos: np.ndarray
+    variancias: np.ndarray
+    erros_padronizados: np.ndarray
+    rmse: float
+    mae: float
+    erro_medio_padronizado: float
+    erro_quadratico_padronizado: float
+
+
+@dataclass
+class ResultadoSelecaoVariograma:
+    """
+    Resultado da seleção automática do modelo de variograma.
+
+    Attributes:
+        modelos (List[str]): Modelos ordenados do melhor para o pior pelo critério.
+        resultados (List[ResultadoValidacaoKrigagem]): Validação de cada modelo, na
+            ordem de `modelos`. Modelos cujo ajuste falhou não aparecem.
+        melhor_config (KrigagemConfig): Configuração com o melhor modelo e seus
+            parâmetros ajustados em `variogram_model_parameters`.
+    """
+
+    modelos: List[str]
+    resultados: List[ResultadoValidacaoKrigagem]
+    melhor_config: KrigagemConfig
+
+
+def validacao_cruzada_idw(
+    pontos: np.ndarray,
+    valores: np.ndarray,
+    powers: Sequence[float] = (1.0, 2.0, 3.0),
+    n_neighbors: Sequence[Optional[int]] = (4, 8, 12, 16),
+    config: Optional[IDWConfig] = None,
+    criterio: str = "rmse",
+    verbose: bool = False,
+    arquivo_log: Optional[str] = None,
+) -> ResultadoValidacaoIDW:
+    """
+    Avalia o IDW por validação cruzada leave-one-out para vários parâmetros.
+
+    Cada ponto é previsto a partir dos demais com todos os pares (power, n_neighbors)
+    candidatos. O custo é o de uma única consulta de k_max+1 vizinhos na árvore KD
+    mais O(P x N x k_max) operações vetorizadas, independente do tamanho da grade.
+
+    Args:
+        pontos (np.ndarray): Array de shape (N, 2) com coordenadas (x, y) dos pontos amostrados.
+        valores (np.ndarray): Array de shape (N,) com os valores correspondentes aos pontos.
+        powers (Sequence[float], optional): Expoentes candidatos. Default é (1, 2, 3).
+        n_neighbors (Sequence[int], optional): Números de vizinhos candidatos; None
+            considera todos os demais pontos. Default é (4, 8, 12, 16).
+        config (IDWConfig, optional): Configuração base; `max_distance` limita a busca
+            e os demais campos são copiados para `melhor_config`. Default é None.
+        criterio (str, optional): Critério de escolha, 'rmse' ou 'mae'. Default é 'rmse'.
+        verbose (bool, optional): Se True, exibe logs detalhados. Default é False.
+        arquivo_log (str, optional): Caminho para arquivo de log. Se None, não salva logs.
+            Default é None.
+
+    Returns:
+        ResultadoValidacaoIDW: Erros por candidato e melhor configuração.
+
+    Raises:
+        ValueError: Se as entradas forem inválidas ou se nenhum ponto tiver vizinhos.
+
+    Example:
+        >>> resultado = validacao_cruzada_idw(pontos, valores, powers=np.arange(1, 4, 0.5))
+        >>> z = IDW(resultado.melhor_config).interpolar(pontos, valores, grid_x, grid_y)
+    """
+    nivel_log = logging.DEBUG if verbose else logging.INFO
+    logger = InterpoladorLogger(
+        "ValidacaoCruzadaIDW", nivel=nivel_log, arquivo_log=arquivo_log, console=verbose
+    )
+    config = config if config is not None else IDWConfig()
+
+    logger.iniciar_interpolacao(
+        f"Pontos: {len(pontos)}, Candidatos: {len(powers)} x {len(n_neighbors)}"
+    )
+
+    try:
+        pontos = np.asarray(pontos, dtype=float)
+        valores = np.asarray(valores, dtype=float)
+        powers = np.asarray(powers, dtype=float).ravel()
+        n_neighbors = list(n_neighbors)
+
+        _validar_entrada(pontos, valores, powers, n_neighbors, criterio)
+
+        # Cada candidato usa no máximo os N - 1 demais pontos
+        n_outros = pontos.shape[0] - 1
+        ks = np.array([n_outros if k is None else min(k, n_outros) for k in n_neighbors])
+        k_max = int(ks.max())
+
+        # Consulta única de k_max + 1 vizinhos, incluindo o próprio ponto
+        limite = np.inf
+        if config.max_distance:
+            limite = np.nextafter(config.max_distance, np.inf)
+        dist, idx = cKDTree(pontos).query(pontos, k=k_max + 1, distance_upper_bound=limite)
+        dist, idx = _remover_proprio_ponto(dist.reshape(-1, k_max + 1), idx.reshape(-1, k_max + 1))
+        logger.registrar_progresso(40, f"Busca de {k_max} vizinhos concluída")
+
+        # Vizinhos ausentes (além de max_distance) recebem peso zero
+        encontrados = np.isfinite(dist)
+        dist = np.where(dist == 0, 1e-10, np.where(encontrados, dist, 1.0))
+        vizinhos = np.where(encontrados, valores[np.minimum(idx, n_outros)], 0.0)
+
+        # Pesos (P, N, k) para todos os expoentes e somas acumuladas ao longo dos
+        # vizinhos: a coluna k - 1 contém a previsão com k vizinhos
+        weights = np.where(encontrados, dist[np.newaxis] ** -powers[:, np.newaxis, np.newaxis], 0.0)
+        den = np.cumsum(weights, axis=2)[:, :, ks - 1]
+        num = np.cumsum(weights * vizinhos, axis=2)[:, :, ks - 1]
+        logger.registrar_progresso(80, "Previsões leave-one-out calculadas")
+
+        validos = den > 0
+        erros = np.where(validos, num / np.where(validos, den, 1.0) - valores[:, np.newaxis], 0.0)
+        n_validos = validos.sum(axis=1)
+        if not np.any(n_validos):
+            raise ValueError("Nenhum ponto tem vizinhos dentro da distância máxima configurada")
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rmse = np.sqrt((erros**2).sum(axis=1) / n_validos)
+            mae = np.abs(erros).sum(axis=1) / n_validos
+
+        metrica = rmse if criterio == "rmse" else mae
+        i_power, i_k = np.unravel_index(np.nanargmin(metrica), metrica.shape)
+        melhor_config = replace(config, power=float(powers[i_power]), n_neighbors=n_neighbors[i_k])
+
+        logger.concluir_interpolacao(
+            f"Melhor: power={melhor_config.power}, n_neighbors={melhor_config.n_neighbors}, "
+            f"{criterio.upper()}={metrica[i_power, i_k]:.6g}"
+        )
+        return ResultadoValidacaoIDW(powers, n_neighbors, rmse, mae, n_validos, melhor_config)
+
+    except Exception as e:
+        logger.registrar_erro(e)
+        raise
+
+
+def validacao_cruzada_krigagem(
+    x: np.ndarray,
+    y: np.ndarray,
+    z: np.ndarray,
+    config: Optional[KrigagemConfig] = None,
+    verbose: bool = False,
+    arquivo_log: Optional[str] = None,
+) -> ResultadoValidacaoKrigagem:
+    """
+    Avalia a Krigagem Ordinária por validação cruzada leave-one-out.
+
+    O variograma é ajustado uma vez sobre todos os pontos e mantido fixo; os N
+    resíduos e variâncias saem de uma única inversão da matriz de Krigagem global
+    (ver `Krigagem.validacao_cruzada`), com custo O(N³) em vez de N novos ajustes.
+    A vizinhança de busca da configuração, se houver, não é usada.
+
+    Args:
+        x (np.ndarray): Coordenadas X dos pontos amostrados.
+        y (np.ndarray): Coordenadas Y dos pontos amostrados.
+        z (np.ndarray): Valores associados aos pontos.
+        config (KrigagemConfig, optional): Configuração da Krigagem. Default é None.
+        verbose (bool, optional): Se True, exibe logs detalhados. Default é False.
+        arquivo_log (str, optional): Caminho para arquivo de log. Se None, não salva logs.
+            Default é None.
+
+    Returns:
+        ResultadoValidacaoKrigagem: Resíduos, variâncias e métricas LOO.
+
+    Raises:
+        ValueError: Se as entradas forem inválidas ou o sistema de Krigagem for singular.
+
+    Example:
+        >>> resultado = validacao_cruzada_krigagem(x, y, z, KrigagemConfig("exponential"))
+        >>> print(resultado.rmse, resultado.erro_quadratico_padronizado)
+    """
+    config = config if config is not None else KrigagemConfig()
+    krig = Krigagem(x, y, z, config=config, verbose=verbose, arquivo_log=arquivo_log)
+    krig.ajustar()
+
+    logger = krig.logger
+    logger.iniciar_interpolacao(f"Validação cruzada LOO - Pontos: {len(krig.x)}")
+    try:
+        residuos, variancias = krig.validacao_cruzada()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            padronizados = residuos / np.sqrt(variancias)
+
+        resultado = ResultadoValidacaoKrigagem(
+            variograma=krig.variograma,
+            residuos=residuos,
+            variancias=variancias,
+            erros_padronizados=padronizados,
+            rmse=float(np.sqrt(np.mean(residuos**2))),
+            mae=float(np.mean(np.abs(residuos))),
+            erro_medio_padronizado=float(np.mean(padronizados)),
+            erro_quadratico_padronizado=float(np.mean(padronizados**2)),
+        )
+        logger.concluir_interpolacao(
+            f"RMSE={resultado.rmse:.6g}, erro quadrático padronizado="
+            f"{resultado.erro_quadratico_padronizado:.4g}"
+        )
+        return resultado
+
+    except Exception as e:
+        logger.registrar_erro(e)
+        raise
+
+
+def selecionar_modelo_variograma(
+    x: np.ndarray,
+    y: np.ndarray,
+    z: np.ndarray,
+    modelos: Sequence[str] = _MODELOS_VARIOGRAMA,
+    config: Optional[KrigagemConfig] = None,
+    criterio: str = "erro_padronizado",
+    n_jobs: int = 1,
+    verbose: bool = False,
+    arquivo_log: Optional[str] = None,
+) -> ResultadoSelecaoVariograma:
+    """
+    Ordena modelos de variograma pela validação cruzada leave-one-out da Krigagem.
+
+    Cada modelo é ajustado aos dados e avaliado com `validacao_cruzada_krigagem`.
+    O critério 'erro_padronizado' ordena pela distância entre a média dos
+    quadrados dos erros padronizados e 1 (variância de Krigagem coerente com os
+    erros), com o RMSE como desempate; 'rmse' e 'mae' ordenam pelo erro absoluto.
+    Modelos cujo ajuste falha (por exemplo, sistema singular) são descartados.
+
+    Args:
+        x (np.ndarray): Coordenadas X dos pontos amostrados.
+        y (np.ndarray): Coordenadas Y dos pontos amostrados.
+        z (np.ndarray): Valores associados aos pontos.
+        modelos (Sequence[str], optional): Modelos candidatos. Default são 'spherical',
+            'exponential', 'gaussian' e 'linear'.
+        config (KrigagemConfig, optional): Configuração base; o modelo e os parâmetros
+            do variograma são substituídos em cada candidato. Default é None.
+        criterio (str, optional): 'erro_padronizado', 'rmse' ou 'mae'. Default é
+            'erro_padronizado'.
+        n_jobs (int, optional): Número de processos que avaliam os candidatos em
+            paralelo, limitado ao número de candidatos. Se -1 (ou qualquer valor <= 0),
+            usa todos os núcleos. Default é 1.
+        verbose (bool, optional): Se True, exibe logs detalhados. Default é False.
+        arquivo_log (str, optional): Caminho para arquivo de log. Se None, não salva logs.
+            Default é None.
+
+    Returns:
+        ResultadoSelecaoVariograma: Modelos ordenados, suas métricas e a melhor
+            configuração.
+
+    Raises:
+        ValueError: Se as entradas forem inválidas ou nenhum modelo puder ser ajustado.
+
+    Example:
+        >>> selecao = selecionar_modelo_variograma(x, y, z, n_jobs=-1)
+        >>> z_interp = Krigagem(x, y, z, config=selecao.melhor_config).interpolar(gridx, gridy)
+    """
+    nivel_log = logging.DEBUG if verbose else logging.INFO
+    logger = InterpoladorLogger(
+        "SelecaoVariograma", nivel=nivel_log, arquivo_log=arquivo_log, console=verbose
+    )
+    config = config if config is not None else KrigagemConfig()
+    modelos = list(modelos)
+
+    logger.iniciar_interpolacao(f"Pontos: {len(x)}, Modelos: {', '.join(modelos)}")
+
+    try:
+        if not modelos:
+            raise ValueError("É necessário ao menos um modelo de variograma candidato")
+        if criterio not in _CRITERIOS_VARIOGRAMA:
+            raise ValueError(
+                f"Critério '{criterio}' inválido. Opções: {', '.join(_CRITERIOS_VARIOGRAMA)}"
+            )
+
+        candidatos = [
+            replace(config, modelo_variograma=modelo, variogram_model_parameters=None, n_jobs=1)
+            for modelo in modelos
+        ]
+        n_jobs = min((os.cpu_count() or 1) if n_jobs <= 0 else n_jobs, len(candidatos))
+        if n_jobs > 1:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                avaliacoes = list(
+                    executor.map(_avaliar_modelo, *zip(*[(x, y, z, c) for c in candidatos]))
+                )
+        else:
+            avaliacoes = [_avaliar_modelo(x, y, z, c) for c in candidatos]
+
+        resultados = []
+        for modelo, (resultado, erro) in zip(modelos, avaliacoes):
+            if resultado is None:
+                logger.registrar_progresso(50, f"Modelo '{modelo}' descartado: {erro}")
+            else:
+                resultados.append(resultado)
+        if not resultados:
+            raise ValueError("Nenhum modelo de variograma pôde ser ajustado")
+
+        resultados.sort(key=lambda r: _chave_ordenacao(r, criterio))
+        melhor = resultados[0].variograma
+        melhor_config = replace(
+            config, modelo_variograma=melhor.modelo, variogram_model_parameters=melhor.como_dict()
+        )
+
+        ranking = ", ".join(f"{r.variograma.modelo} (RMSE={r.rmse:.4g})" for r in resultados)
+        logger.concluir_interpolacao(f"Ranking: {ranking}")
+        return ResultadoSelecaoVariograma(
+            [r.variograma.modelo for r in resultados], resultados, melhor_config
+        )
+
+    except Exception as e:
+        logger.registrar_erro(e)
+        raise
+
+
+def _avaliar_modelo(
+    x: np.ndarray, y: np.ndarray, z: np.ndarray, config: KrigagemConfig
+) -> Tuple[Optional[ResultadoValidacaoKrigagem], Optional[str]]:
+    """
+    Avalia um modelo de variograma candidato (executado em outro processo se n_jobs > 1).
+
+    Args:
+        x (np.ndarray): Coordenadas X dos pontos amostrados.
+        y (np.ndarray): Coordenadas Y dos pontos amostrados.
+        z (np.ndarray): Valores associados aos pontos.
+        config (KrigagemConfig): Configuração com o modelo candidato.
+
+    Returns:
+        Tuple: Resultado da validação e None, ou None e a mensagem de erro do ajuste.
+    """
+    try:
+        return validacao_cruzada_krigagem(x, y, z, config), None
+    except (ValueError, np.linalg.LinAlgError) as e:
+        return None, str(e)
+
+
+def _chave_ordenacao(resultado: ResultadoValidacaoKrigagem, criterio: str) -> Tuple[float, float]:
+    """
+    Chave de ordenação de um modelo de variograma pelo critério escolhido.
+
+    Args:
+        resultado (ResultadoValidacaoKrigagem): Validação do modelo.
+        criterio (str): 'erro_padronizado', 'rmse' ou 'mae'.
+
+    Returns:
+        Tuple[float, float]: Métrica principal (menor é melhor; NaN vira infinito) e
+            RMSE como desempate.
+    """
+    if criterio == "erro_padronizado":
+        metrica = abs(resultado.erro_quadratico_padronizado - 1.0)
+    else:
+        metrica = getattr(resultado, criterio)
+    return float(np.nan_to_num(metrica, nan=np.inf)), resultado.rmse
+
+
+def _validar_entrada(
+    pontos: np.ndarray,
+    valores: np.ndarray,
+    powers: np.ndarray,
+    n_neighbors: list,
+    criterio: str,
+) -> None:
+    """
+    Valida as entradas da validação cruzada.
+
+    Args:
+        pontos (np.ndarray): Coordenadas dos pontos amostrados.
+        valores (np.ndarray): Valores nos pontos amostrados.
+        powers (np.ndarray): Expoentes candidatos.
+        n_neighbors (list): Números de vizinhos candidatos.
+        criterio (str): Critério de escolha da melhor configuração.
+
+    Raises:
+        ValueError: Se alguma entrada for inválida.
+    """
+    if pontos.ndim != 2 or pontos.shape[1] != 2:
+        raise ValueError(f"Pontos devem ter formato (N, 2), mas têm formato {pontos.shape}")
+    if valores.shape != (pontos.shape[0],):
+        raise ValueError(
+            f"Valores devem ter formato ({pontos.shape[0]},), mas têm formato {valores.shape}"
+        )
+    if pontos.shape[0] < 2:
+        raise ValueError("Validação cruzada requer pelo menos 2 pontos")
+    if powers.size == 0 or len(n_neighbors) == 0:
+        raise ValueError("É necessário ao menos um valor de power e de n_neighbors")
+    if any(k is not None and k < 1 for k in n_neighbors):
+        raise ValueError(f"n_neighbors deve ser None ou >= 1, mas recebeu {n_neighbors}")
+    if criterio not in _CRITERIOS:
+        raise ValueError(f"Critério '{criterio}' inválido. Opções: {', '.join(_CRITERIOS)}")
+
+
+def _remover_proprio_ponto(dist: np.ndarray, idx: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Remove o próprio ponto da lista de vizinhos de cada ponto.
+
+    O próprio ponto costuma ser o primeiro vizinho, mas pontos com coordenadas
+    repetidas podem trocar de posição entre si; se não aparecer, descarta-se o
+    vizinho mais distante.
+
+    Args:
+        dist (np.ndarray): Distâncias (N, k + 1) retornadas pela árvore KD.
+        idx (np.ndarray): Índices (N, k + 1) retornados pela árvore KD.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Distâncias e índices (N, k) sem o próprio ponto.
+    """
+    proprio = idx == np.arange(idx.shape[0])[:, np.newaxis]
+    proprio[~proprio.any(axis=1), -1] = True
+    manter = ~proprio
+    n_pontos, k = idx.shape[0], idx.shape[1] - 1
+    return dist[manter].reshape(n_pontos, k), idx[manter].reshape(n_pontos, k)
@@ -0,0 +1,466 @@
+"""
+Variograma experimental rápido para grandes conjuntos de amostras.
+
+O `OrdinaryKriging` do PyKrige calcula o variograma experimental sobre todos os
+N²/2 pares de pontos, o que domina o tempo e a memória a partir de algumas
+dezenas de milhares de amostras. Este módulo calcula as semivariâncias por
+classe de distância acumulando apenas os pares até a distância máxima, em blocos
+de tamanho limitado encontrados por uma árvore KD, ou sobre uma amostra
+aleatória de pares. O ajuste do modelo produz um `VariogramaAjustado` que
+alimenta a Krigagem sem novo cálculo do variograma.
+
+Características principais:
+- Classes de distância (nlags) até uma distância máxima configurável
+- Busca de pares por árvore KD em blocos de memória limitada
+- Subamostragem aleatória de pares para conjuntos muito grandes
+- Variogramas direcionais (com tolerância angular) para anisotropia
+- Ajuste dos modelos do PyKrige e configuração pronta para a Krigagem
+
+Classes:
+    - VariogramaExperimental: Semivariâncias por classe de distância e direção.
+
+Funções:
+    - calcular_variograma_experimental: Calcula o variograma experimental.
+
+Dependências:
+    - numpy: Para operações numéricas eficientes
+    - scipy.spatial.cKDTree: Para a busca dos pares até a distância máxima
+    - scipy.optimize.least_squares: Para o ajuste do modelo de variograma
+"""
+
+import logging
+from dataclasses import dataclass, replace
+from typing import Optional, Sequence, Tuple
+
+import numpy as np  # noqa: F401
+from scipy.optimize import least_squares
+from scipy.spatial import cKDTree
+
+from interpoladores.config import KrigagemConfig
+from interpoladores.krigagem import VariogramaAjustado
+from utils.logging_utils import InterpoladorLogger
+
+# Pares materializados por bloco (distâncias, diferenças e classes; ~100 MB)
+_PARES_POR_BLOCO = 2**22
+
+# Pontos usados para estimar o número médio de vizinhos até a distância máxima
+_AMOSTRA_CONTAGEM = 1000
+
+# Modelos com alcance (parâmetros [psill, range, nugget]), usados na anisotropia
+_MODELOS_COM_ALCANCE = ("spherical", "exponential", "gaussian")
+
+# Modelos aceitos pelo ajuste (os de KrigagemConfig.modelo_variograma)
+_MODELOS = ("linear", "power") + _MODELOS_COM_ALCANCE
+
+
+@dataclass
+class VariogramaExperimental:
+    """
+    Variograma experimental por classe de distância (e direção).
+
+    Os arrays têm shape (nlags,) no variograma omnidirecional e (D, nlags) com
+    D direções. Classes sem pares têm semivariância e distância NaN.
+
+    Attributes:
+        lags (np.ndarray): Distância média dos pares de cada classe.
+        semivariancias (np.ndarray): Semivariância `0.5 * média((z_i - z_j)²)` da classe.
+        n_pares (np.ndarray): Número de pares de cada classe.
+        direcoes (np.ndarray, optional): Direções (graus, anti-horário a partir do
+            eixo X, como `KrigagemConfig.anisotropy_angle`), ou None se omnidirecional.
+    """
+
+    lags: np.ndarray
+    semivariancias: np.ndarray
+    n_pares: np.ndarray
+    direcoes: Optional[np.ndarray] = None
+
+    def ajustar(
+        self, modelo: str = "spherical", direcao: Optional[int] = None
+    ) -> VariogramaAjustado:
+        """
+        Ajusta um modelo de variograma do PyKrige às semivariâncias.
+
+        Usa mínimos quadrados ponderados pelo número de pares de cada classe, com a
+        estimativa inicial e os limites do ajuste automático do PyKrige.
+
+        Args:
+            modelo (str, optional): 'linear', 'power', 'gaussian', 'spherical' ou
+                'exponential'. Default é 'spherical'.
+            direcao (int, optional): Índice da direção ajustada (obrigatório em
+                variogramas direcionais). Default é None.
+
+        Returns:
+            VariogramaAjustado: Modelo e parâmetros na ordem do PyKrige.
+
+        Raises:
+            ValueError: Se o modelo for inválido, a direção não for informada ou houver
+                menos classes com pares do que parâmetros.
+        """
+        lags, semivariancias, n_pares = self._serie(direcao)
+        validas = n_pares > 0
+        lags, semivariancias, n_pares = lags[validas], semivariancias[validas], n_pares[validas]
+
+        if modelo not in _MODELOS:
+            raise ValueError(f"Modelo '{modelo}' inválido. Opções: {', '.join(_MODELOS)}")
+        funcao = VariogramaAjustado(modelo, []).funcao
+
+        x0, limites = _estimativa_inicial(modelo, lags, semivariancias)
+        if len(lags) < len(x0):
+            raise ValueError(
+                f"Ajuste do modelo '{modelo}' requer ao menos {len(x0)} classes com pares, "
+                f"mas há {len(lags)}"
+            )
+
+        pesos = np.sqrt(n_pares / n_pares.sum())
+        resultado = least_squares(
+            lambda p: pesos * (funcao(p, lags) - semivariancias), x0, bounds=limites
+        )
+        return VariogramaAjustado(modelo, [float(p) for p in resultado.x])
+
+    def config_krigagem(
+        self, modelo: str = "spherical", config: Optional[KrigagemConfig] = None
+    ) -> KrigagemConfig:
+        """
+        Cria a configuração da Krigagem com o variograma ajustado.
+
+        No variograma omnidirecional, apenas o modelo e os parâmetros são definidos.
+        Com duas ou mais direções, cada uma é ajustada: a direção de maior alcance
+        define `anisotropy_angle` e seus parâmetros, e a razão entre o maior e o menor
+        alcance define `anisotropy_ratio`.
+
+        Args:
+            modelo (str, optional): Modelo de variograma. Default é 'spherical'.
+            config (KrigagemConfig, optional): Configuração base. Default é None.
+
+        Returns:
+            KrigagemConfig: Configuração com `variogram_model_parameters` fixos, que
+                dispensa o cálculo do variograma pelo PyKrige em `Krigagem.ajustar`.
+
+        Raises:
+            ValueError: Se a anisotropia for pedida para um modelo sem alcance.
+
+        Example:
+            >>> experimental = calcular_variograma_experimental(x, y, z, direcoes=[0, 45, 90, 135])
+            >>> krig = Krigagem(x, y, z, config=experimental.config_krigagem("spherical"))
+        """
+        config = config if config is not None else KrigagemConfig()
+        if self.direcoes is None or len(self.direcoes) < 2:
+            variograma = self.ajustar(modelo, None if self.direcoes is None else 0)
+            return replace(
+                config, modelo_variograma=modelo, variogram_model_parameters=variograma.como_dict()
+            )
+
+        if modelo not in _MODELOS_COM_ALCANCE:
+            raise ValueError(
+                f"Anisotropia requer um modelo com alcance ({', '.join(_MODELOS_COM_ALCANCE)})"
+            )
+        ajustes = [self.ajustar(modelo, k) for k in range(len(self.direcoes))]
+        alcances = np.array([v.parametros[1] for v in ajustes])
+        maior = int(np.argmax(alcances))
+        return replace(
+            config,
+            modelo_variograma=modelo,
+            variogram_model_parameters=ajustes[maior].como_dict(),
+            anisotropy_angle=float(self.direcoes[maior]),
+            anisotropy_ratio=float(alcances[maior] / max(alcances.min(), np.finfo(float).tiny)),
+        )
+
+    def _serie(self, direcao: Optional[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Seleciona as classes de uma direção (ou do variograma omnidirecional).
+
+        Args:
+            direcao (int, optional): Índice da direção.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Distâncias, semivariâncias e
+                número de pares (nlags,).
+
+        Raises:
+            ValueError: Se a direção for inconsistente com o variograma.
+        """
+        if self.direcoes is None:
+            if direcao is not None:
+                raise ValueError("Variograma omnidirecional: direcao deve ser None")
+            return self.lags, self.semivariancias, self.n_pares
+        if direcao is None or not 0 <= direcao < len(self.direcoes):
+            raise ValueError(
+                f"Variograma direcional: informe direcao entre 0 e {len(self.direcoes) - 1}"
+            )
+        return self.lags[direcao], self.semivariancias[direcao], self.n_pares[direcao]
+
+
+def calcular_variograma_experimental(
+    x: np.ndarray,
+    y: np.ndarray,
+    z: np.ndarray,
+    nlags: int = 6,
+    max_lag: Optional[float] = None,
+    direcoes: Optional[Sequence[float]] = None,
+    tolerancia_angular: float = 22.5,
+    max_pares: Optional[int] = None,
+    seed: Optional[int] = None,
+    verbose: bool = False,
+    arquivo_log: Optional[str] = None,
+) -> VariogramaExperimental:
+    """
+    Calcula o variograma experimental sem formar todos os N²/2 pares.
+
+    Apenas os pares até `max_lag` são considerados. Sem `max_pares`, todos esses
+    pares são encontrados por uma árvore KD em blocos de pontos dimensionados para
+    materializar até `_PARES_POR_BLOCO` pares por vez; com `max_pares`, são
+    sorteados `max_pares` pares aleatórios (com reposição) entre todos os pares, a
+    um custo independente de N.
+
+    Args:
+        x (np.ndarray): Coordenadas X dos pontos amostrados.
+        y (np.ndarray): Coordenadas Y dos pontos amostrados.
+        z (np.ndarray): Valores associados aos pontos.
+        nlags (int, optional): Número de classes de distância, de mesma largura entre
+            0 e max_lag. Default é 6 (o padrão do PyKrige).
+        max_lag (float, optional): Distância máxima dos pares. Se None, usa metade da
+            diagonal do retângulo envolvente dos pontos. Default é None.
+        direcoes (Sequence[float], optional): Direções em graus (anti-horário a partir
+            do eixo X). Se None, calcula o variograma omnidirecional. Default é None.
+        tolerancia_angular (float, optional): Meia abertura (graus) de cada direção.
+            Default é 22.5.
+        max_pares (int, optional): Número de pares aleatórios sorteados quando o
+            total de pares é maior. Se None, usa todos os pares. Default é None.
+        seed (int, optional): Semente do sorteio de pares. Default é None.
+        verbose (bool, optional): Se True, exibe logs detalhados. Default é False.
+        arquivo_log (str, optional): Caminho para arquivo de log. Se None, não salva logs.
+            Default é None.
+
+    Returns:
+        VariogramaExperimental: Semivariâncias por classe (e direção).
+
+    Raises:
+        ValueError: Se as entradas forem inválidas.
+
+    Example:
+        >>> experimental = calcular_variograma_experimental(x, y, z, nlags=12, max_pares=10**7)
+        >>> config = experimental.config_krigagem("exponential")
+        >>> z_interp = Krigagem(x, y, z, config=config).interpolar(gridx, gridy)
+    """
+    nivel_log = logging.DEBUG if verbose else logging.INFO
+    logger = InterpoladorLogger(
+        "VariogramaExperimental", nivel=nivel_log, arquivo_log=arquivo_log, console=verbose
+    )
+    logger.iniciar_interpolacao(f"Pontos: {len(x)}, Classes: {nlags}")
+
+    try:
+        pontos = np.column_stack((x, y)).astype(float)
+        z = np.asarray(z, dtype=float)
+        if max_lag is None:
+            max_lag = float(np.hypot(*np.ptp(pontos, axis=0))) / 2
+        angulos = None if direcoes is None else np.asarray(direcoes, dtype=float).ravel()
+        _validar_entrada(pontos, z, nlags, max_lag, angulos, tolerancia_angular, max_pares)
+
+        n_direcoes = 1 if angulos is None else len(angulos)
+        acumulador = _Acumulador(nlags, max_lag, angulos, tolerancia_angular, n_direcoes)
+
+        n_pontos = len(pontos)
+        if max_pares is not None and n_pontos * (n_pontos - 1) // 2 > max_pares:
+            logger.registrar_progresso(20, f"Sorteando {max_pares} pares aleatórios")
+            _pares_aleatorios(pontos, z, max_pares, seed, acumulador)
+        else:
+            logger.registrar_progresso(20, f"Buscando pares até a distância {max_lag:.6g}")
+            _pares_por_blocos(pontos, z, max_lag, acumulador)
+
+        resultado = acumulador.resultado()
+        logger.concluir_interpolacao(f"Pares considerados: {int(resultado.n_pares.sum())}")
+        return resultado
+
+    except Exception as e:
+        logger.registrar_erro(e)
+        raise
+
+
+class _Acumulador:
+    """
+    Soma, por direção e classe, o número de pares, as distâncias e (z_i - z_j)².
+
+    Args:
+        nlags (int): Número de classes de distância.
+        max_lag (float): Distância máxima dos pares.
+        angulos (np.ndarray, optional): Direções em graus, ou None se omnidirecional.
+        tolerancia_angular (float): Meia abertura (graus) de cada direção.
+        n_direcoes (int): Número de direções (1 se omnidirecional).
+    """
+
+    def __init__(
+        self,
+        nlags: int,
+        max_lag: float,
+        angulos: Optional[np.ndarray],
+        tolerancia_angular: float,
+        n_direcoes: int,
+    ):
+        self.nlags = nlags
+        self.max_lag = max_lag
+        self.angulos = angulos
+        self.tolerancia = tolerancia_angular
+        self.n_pares = np.zeros((n_direcoes, nlags))
+        self.soma_d = np.zeros((n_direcoes, nlags))
+        self.soma_dz2 = np.zeros((n_direcoes, nlags))
+
+    def adicionar(self, delta: Optional[np.ndarray], d: np.ndarray, dz2: np.ndarray) -> None:
+        """
+        Acumula um bloco de pares com distância até max_lag.
+
+        Args:
+            delta (np.ndarray, optional): Vetores (P, 2) entre os pontos de cada par
+                (dispensáveis no variograma omnidirecional).
+            d (np.ndarray): Distâncias (P,).
+            dz2 (np.ndarray): Quadrados das diferenças de valor (P,).
+        """
+        classes = np.minimum((d * (self.nlags / self.max_lag)).astype(np.int64), self.nlags - 1)
+        if self.angulos is None:
+            mascaras = [slice(None)]
+        else:
+            # Ângulo do par em [0, 180) e diferença angular mínima a cada direção
+            angulo = np.degrees(np.arctan2(delta[:, 1], delta[:, 0])) % 180.0
+            mascaras = [
+                np.abs((angulo - direcao + 90.0) % 180.0 - 90.0) <= self.tolerancia
+                for direcao in self.angulos
+            ]
+        for k, mascara in enumerate(mascaras):
+            c = classes[mascara]
+            self.n_pares[k] += np.bincount(c, minlength=self.nlags)
+            self.soma_d[k] += np.bincount(c, weights=d[mascara], minlength=self.nlags)
+            self.soma_dz2[k] += np.bincount(c, weights=dz2[mascara], minlength=self.nlags)
+
+    def resultado(self) -> VariogramaExperimental:
+        """Converte as somas em distâncias médias e semivariâncias."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            lags = self.soma_d / self.n_pares
+            semivariancias = 0.5 * self.soma_dz2 / self.n_pares
+        n_pares = self.n_pares.astype(np.int64)
+        if self.angulos is None:
+            return VariogramaExperimental(lags[0], semivariancias[0], n_pares[0])
+        return VariogramaExperimental(lags, semivariancias, n_pares, self.angulos.copy())
+
+
+def _pares_por_blocos(
+    pontos: np.ndarray, z: np.ndarray, max_lag: float, acumulador: _Acumulador
+) -> None:
+    """
+    Acumula todos os pares até max_lag, em blocos de pontos de memória limitada.
+
+    Args:
+        pontos (np.ndarray): Coordenadas (N, 2).
+        z (np.ndarray): Valores (N,).
+        max_lag (float): Distância máxima dos pares.
+        acumulador (_Acumulador): Acumulador das somas por classe.
+    """
+    n_pontos = len(pontos)
+
+    # Estima o número médio de vizinhos para dimensionar os blocos
+    passo = max(1, n_pontos // _AMOSTRA_CONTAGEM)
+    vizinhos = cKDTree(pontos).query_ball_point(pontos[::passo], max_lag, return_length=True)
+    tamanho_bloco = int(max(1, _PARES_POR_BLOCO // max(vizinhos.mean(), 1.0)))
+
+    for inicio in range(0, n_pontos, tamanho_bloco):
+        fim = min(inicio + tamanho_bloco, n_pontos)
+        # Pares do bloco com os pontos seguintes: cada par uma única vez (j > i)
+        pares = cKDTree(pontos[inicio:fim]).sparse_distance_matrix(
+            cKDTree(pontos[inicio:]), max_lag, output_type="ndarray"
+        )
+        manter = pares["j"] > pares["i"]
+        i = pares["i"][manter] + inicio
+        j = pares["j"][manter] + inicio
+        delta = None if acumulador.angulos is None else pontos[j] - pontos[i]
+        acumulador.adicionar(delta, pares["v"][manter], (z[j] - z[i]) ** 2)
+
+
+def _pares_aleatorios(
+    pontos: np.ndarray,
+    z: np.ndarray,
+    max_pares: int,
+    seed: Optional[int],
+    acumulador: _Acumulador,
+) -> None:
+    """
+    Acumula `max_pares` pares aleatórios distintos (i != j), sorteados com reposição.
+
+    Args:
+        pontos (np.ndarray): Coordenadas (N, 2).
+        z (np.ndarray): Valores (N,).
+        max_pares (int): Número de pares sorteados.
+        seed (int, optional): Semente do gerador.
+        acumulador (_Acumulador): Acumulador das somas por classe.
+    """
+    rng = np.random.default_rng(seed)
+    n_pontos = len(pontos)
+    for inicio in range(0, max_pares, _PARES_POR_BLOCO):
+        n = min(_PARES_POR_BLOCO, max_pares - inicio)
+        i = rng.integers(0, n_pontos, n)
+        j = rng.integers(0, n_pontos - 1, n)
+        j += j >= i
+        delta = pontos[j] - pontos[i]
+        d = np.hypot(delta[:, 0], delta[:, 1])
+        manter = d <= acumulador.max_lag
+        acumulador.adicionar(delta[manter], d[manter], (z[j[manter]] - z[i[manter]]) ** 2)
+
+
+def _estimativa_inicial(
+    modelo: str, lags: np.ndarray, semivariancias: np.ndarray
+) -> Tuple[list, Tuple[list, list]]:
+    """
+    Estimativa inicial e limites dos parâmetros (os mesmos do ajuste do PyKrige).
+
+    Args:
+        modelo (str): Modelo de variograma.
+        lags (np.ndarray): Distâncias das classes com pares.
+        semivariancias (np.ndarray): Semivariâncias das classes com pares.
+
+    Returns:
+        Tuple[list, Tuple[list, list]]: Parâmetros iniciais e limites (inferior, superior).
+    """
+    gamma_min, gamma_max = semivariancias.min(), semivariancias.max()
+    if modelo in _MODELOS_COM_ALCANCE:
+        x0 = [gamma_max - gamma_min, 0.25 * lags.max(), gamma_min]
+        return x0, ([0.0, 0.0, 0.0], [10.0 * gamma_max, lags.max(), gamma_max])
+
+    inclinacao = (gamma_max - gamma_min) / max(lags.max() - lags.min(), np.finfo(float).tiny)
+    if modelo == "linear":
+        return [inclinacao, gamma_min], ([0.0, 0.0], [np.inf, gamma_max])
+    return [inclinacao, 1.1, gamma_min], ([0.0, 0.001, 0.0], [np.inf, 1.999, gamma_max])
+
+
+def _validar_entrada(
+    pontos: np.ndarray,
+    z: np.ndarray,
+    nlags: int,
+    max_lag: float,
+    angulos: Optional[np.ndarray],
+    tolerancia_angular: float,
+    max_pares: Optional[int],
+) -> None:
+    """
+    Valida as entradas do variograma experimental.
+
+    Args:
+        pontos (np.ndarray): Coordenadas (N, 2).
+        z (np.ndarray): Valores (N,).
+        nlags (int): Número de classes de distância.
+        max_lag (float): Distância máxima dos pares.
+        angulos (np.ndarray, optional): Direções em graus.
+        tolerancia_angular (float): Meia abertura (graus) de cada direção.
+        max_pares (int, optional): Número de pares aleatórios.
+
+    Raises:
+        ValueError: Se alguma entrada for inválida.
+    """
+    if z.shape != (pontos.shape[0],):
+        raise ValueError(f"Dimensões incompatíveis: pontos({pontos.shape[0]}), z({z.shape})")
+    if pontos.shape[0] < 2:
+        raise ValueError("Variograma experimental requer pelo menos 2 pontos")
+    if nlags < 1:
+        raise ValueError(f"nlags deve ser >= 1, mas recebeu {nlags}")
+    if not max_lag > 0:
+        raise ValueError(f"max_lag deve ser positivo, mas recebeu {max_lag}")
+    if angulos is not None and (angulos.size == 0 or not 0 < tolerancia_angular <= 90):
+        raise ValueError("Direções devem ser não vazias e tolerancia_angular deve estar em (0, 90]")
+    if max_pares is not None and max_pares < 1:
+        raise ValueError(f"max_pares deve ser >= 1, mas recebeu {max_pares}")
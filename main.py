@@ -12,6 +12,9 @@ Exemplos de uso:
     # Krigagem com modelo específico
     python main.py --metodo krigagem --modelo spherical
 
+    # Krigagem com o modelo escolhido por validação cruzada
+    python main.py --metodo krigagem --modelo auto
+
     # Modelo potenciométrico com visualização de vetores de fluxo
     python main.py --metodo potenciometrico --fluxo
 """
@@ -29,6 +32,7 @@ from interpoladores.config import IDWConfig, KrigagemConfig
 from interpoladores.idw import IDW
 from interpoladores.krigagem import Krigagem
 from interpoladores.modelo_potenciometrico import ModeloPotenciometrico, plotar_vetores_fluxo
+from interpoladores.validacao_cruzada import selecionar_modelo_variograma
 
 # Utilitários
 from utils.grid_utils import criar_grade_regular
@@ -97,14 +101,22 @@ def interpolar_krigagem(pontos, valores, grid_x, grid_y, modelo="spherical"):
         pontos: Array de pontos (x, y)
         valores: Array de valores
         grid_x, grid_y: Grade para interpolação
-        modelo: Modelo de variograma
+        modelo: Modelo de variograma ('auto' escolhe por validação cruzada)
 
     Returns:
         Array 2D com valores interpolados
     """
-    logger.info(f"Executando Krigagem (modelo={modelo})")
-
     config = KrigagemConfig(modelo_variograma=modelo, enable_statistics=True)
+    if modelo == "auto":
+        # Usa o variograma validado, sem novo ajuste
+        selecao = selecionar_modelo_variograma(
+            pontos[:, 0], pontos[:, 1], valores, config=config, n_jobs=-1
+        )
+        config = selecao.melhor_config
+        modelo = config.modelo_variograma
+        logger.info(f"Modelos por validação cruzada: {', '.join(selecao.modelos)}")
+
+    logger.info(f"Executando Krigagem (modelo={modelo})")
 
     krig = Krigagem(pontos[:, 0], pontos[:, 1], valores, config=config)
     z_interp, ss = krig.interpolar(grid_x, grid_y)
@@ -266,8 +278,8 @@ def main():
         "--modelo",
         type=str,
         default="spherical",
-        choices=["spherical", "exponential", "gaussian", "linear"],
-        help="Modelo de variograma para Krigagem",
+        choices=["spherical", "exponential", "gaussian", "linear", "auto"],
+        help="Modelo de variograma para Krigagem ('auto' escolhe por validação cruzada)",
     )
 
     # Argumentos específicos para Modelo Potenciométrico
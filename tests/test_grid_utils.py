@@ -0,0 +1,50 @@
+import numpy as np  # noqa: F401
+import pytest
+
+from utils.grid_utils import GradeRegular, coordenadas_grade, criar_grade_regular
+
+
+def test_grade_regular_coordenadas():
+    """Testa as coordenadas geradas sob demanda contra o meshgrid."""
+    grade = GradeRegular(x0=10.0, y0=-5.0, dx=2.5, dy=0.5, nx=7, ny=4)
+    grid_x, grid_y = grade.meshgrid()
+
+    assert grade.shape == grid_x.shape == (4, 7)
+    assert grade.size == 28
+    xi = np.column_stack((grid_x.ravel(), grid_y.ravel()))
+    np.testing.assert_array_equal(grade.coordenadas(), xi)
+    np.testing.assert_array_equal(grade.coordenadas(slice(5, 17)), xi[5:17])
+    np.testing.assert_array_equal(grade.coordenadas(np.array([0, 8, 27])), xi[[0, 8, 27]])
+    mascara = np.arange(28) % 3 == 0
+    np.testing.assert_array_equal(grade.coordenadas(mascara), xi[mascara])
+
+
+def test_grade_regular_de_limites():
+    """Testa a criação a partir dos limites, equivalente a np.linspace."""
+    grade = GradeRegular.de_limites(0, 50, 0, 20, nx=11, ny=5)
+    np.testing.assert_allclose(grade.eixo_x(), np.linspace(0, 50, 11))
+    np.testing.assert_allclose(grade.eixo_y(), np.linspace(0, 20, 5))
+
+    grid_x, grid_y = criar_grade_regular(0, 50, 0, 20, 11, 5)
+    assert grid_x.shape == (5, 11)
+
+    with pytest.raises(ValueError):
+        GradeRegular(0.0, 0.0, 1.0, 1.0, nx=0, ny=3)
+    with pytest.raises(ValueError):
+        GradeRegular(0.0, 0.0, 0.0, 1.0, nx=3, ny=3)
+
+
+def test_coordenadas_grade():
+    """Testa a resolução de grades em formato e gerador de coordenadas."""
+    grade = GradeRegular(0.0, 0.0, 1.0, 1.0, nx=5, ny=3)
+    grid_x, grid_y = grade.meshgrid()
+
+    shape, coordenadas = coordenadas_grade(grid_x, grid_y)
+    assert shape == (3, 5)
+    np.testing.assert_array_equal(coordenadas(slice(2, 9)), grade.coordenadas(slice(2, 9)))
+
+    assert coordenadas_grade(grade)[0] == (3, 5)
+    with pytest.raises(ValueError):
+        coordenadas_grade(grid_x, grid_y[:-1])
+    with pytest.raises(ValueError):
+        coordenadas_grade(grade, grid_y)
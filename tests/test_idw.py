@@ -3,6 +3,8 @@ import pytest
 
 from interpoladores.config import IDWConfig
 from interpoladores.idw import IDW
+from interpoladores.operador import OperadorPesos
+from utils.grid_utils import GradeRegular, coordenadas_grade
 
 
 def gerar_grid(nx=10, ny=10, xmin=0, xmax=50, ymin=0, ymax=50):
@@ -175,3 +177,329 @@ def test_idw_reproducibilidade():
     z2 = idw.interpolar(pontos, valores, grid_x, grid_y)
 
     np.testing.assert_allclose(z1, z2)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"n_neighbors": 3},
+        {"max_distance": 10.0},
+        {"max_distance": 10.0, "default_value": -999.0, "n_neighbors": 5},
+    ],
+)
+def test_idw_blocos_identico_ao_integral(kwargs):
+    """Testa se o processamento em blocos produz resultado idêntico ao integral."""
+    pontos, valores = gerar_amostras(n_pontos=20)
+    grid_x, grid_y = gerar_grid(nx=37, ny=23)
+
+    z_integral = IDW(IDWConfig(**kwargs)).interpolar(pontos, valores, grid_x, grid_y)
+
+    # Orçamento pequeno força dezenas de blocos
+    config_blocos = IDWConfig(max_memory_mb=0.01, **kwargs)
+    idw = IDW(config_blocos)
+    assert idw._tamanho_bloco(20 * 8 * 8, grid_x.size) < grid_x.size
+    z_blocos = idw.interpolar(pontos, valores, grid_x, grid_y)
+
+    np.testing.assert_array_equal(z_integral, z_blocos)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"power": 3.0}, {"max_distance": 10.0}])
+def test_idw_forca_bruta_equivale_kdtree(kwargs):
+    """Testa se o kernel de força bruta reproduz o caminho por árvore KD."""
+    pontos, valores = gerar_amostras(n_pontos=20)
+    # Inclui células coincidentes com pontos amostrados
+    grid_x, grid_y = gerar_grid(nx=30, ny=30)
+    grid_x.ravel()[:3] = pontos[:3, 0]
+    grid_y.ravel()[:3] = pontos[:3, 1]
+
+    z_kdtree = IDW(IDWConfig(engine="kdtree", **kwargs)).interpolar(pontos, valores, grid_x, grid_y)
+    z_bruta = IDW(IDWConfig(engine="brute", **kwargs)).interpolar(pontos, valores, grid_x, grid_y)
+
+    np.testing.assert_allclose(z_bruta, z_kdtree, rtol=1e-12, atol=1e-12)
+    np.testing.assert_array_equal(np.isnan(z_bruta), np.isnan(z_kdtree))
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"default_value": -1.0}, {"power": 1.5}])
+def test_idw_busca_por_raio_equivale_kdtree(kwargs):
+    """Testa se a busca limitada ao raio reproduz a filtragem após a busca completa."""
+    pontos, valores = gerar_amostras(n_pontos=20)
+    grid_x, grid_y = gerar_grid(nx=40, ny=40, xmin=-20, xmax=70)
+    grid_x.ravel()[:3] = pontos[:3, 0]
+    grid_y.ravel()[:3] = pontos[:3, 1]
+
+    config_raio = IDWConfig(max_distance=6.0, engine="radius", **kwargs)
+    config_kdtree = IDWConfig(max_distance=6.0, engine="kdtree", **kwargs)
+    z_raio = IDW(config_raio).interpolar(pontos, valores, grid_x, grid_y)
+    z_kdtree = IDW(config_kdtree).interpolar(pontos, valores, grid_x, grid_y)
+
+    np.testing.assert_allclose(z_raio, z_kdtree, rtol=1e-12, atol=1e-12)
+    np.testing.assert_array_equal(np.isnan(z_raio), np.isnan(z_kdtree))
+
+
+def test_idw_engine_invalido():
+    """Testa a validação do engine configurado."""
+    pontos, valores = gerar_amostras()
+    grid_x, grid_y = gerar_grid()
+
+    with pytest.raises(ValueError) as excinfo:
+        IDW(IDWConfig(engine="gpu")).interpolar(pontos, valores, grid_x, grid_y)
+    assert "inválido" in str(excinfo.value)
+
+    with pytest.raises(ValueError) as excinfo:
+        IDW(IDWConfig(engine="brute", n_neighbors=2)).interpolar(pontos, valores, grid_x, grid_y)
+    assert "não é compatível" in str(excinfo.value)
+
+    with pytest.raises(ValueError) as excinfo:
+        IDW(IDWConfig(engine="radius")).interpolar(pontos, valores, grid_x, grid_y)
+    assert "requer max_distance" in str(excinfo.value)
+
+
+def test_idw_ajustar_prever():
+    """Testa a separação entre ajuste e previsão em várias grades."""
+    pontos, valores = gerar_amostras(n_pontos=20)
+    grid_x, grid_y = gerar_grid(nx=20, ny=20)
+    config = IDWConfig(n_neighbors=5)
+
+    idw = IDW(config)
+    with pytest.raises(RuntimeError):
+        idw.prever(grid_x, grid_y)
+
+    idw.ajustar(pontos, valores)
+    z1 = idw.prever(grid_x, grid_y)
+    tree = idw._tree
+    z2 = idw.prever(grid_x[::2, ::2], grid_y[::2, ::2])
+
+    # A árvore é construída uma única vez e reaproveitada entre previsões
+    assert idw._tree is tree
+    np.testing.assert_array_equal(z1, IDW(config).interpolar(pontos, valores, grid_x, grid_y))
+    np.testing.assert_array_equal(z2, z1[::2, ::2])
+
+
+def test_idw_cache_arvores():
+    """Testa o reaproveitamento de árvores KD entre instâncias pelo cache LRU."""
+    from interpoladores.idw import _cache_arvores
+
+    _cache_arvores.limpar()
+    pontos, valores = gerar_amostras(n_pontos=20)
+    grid_x, grid_y = gerar_grid()
+    config = IDWConfig(n_neighbors=3, tree_cache_size=2)
+
+    idw1 = IDW(config)
+    idw1.interpolar(pontos, valores, grid_x, grid_y)
+    idw2 = IDW(config)
+    idw2.interpolar(pontos.copy(), valores * 2, grid_x, grid_y)
+    assert idw1._tree is idw2._tree
+
+    # Geometrias diferentes ocupam novas entradas, respeitando a capacidade
+    for deslocamento in (1.0, 2.0):
+        IDW(config).interpolar(pontos + deslocamento, valores, grid_x, grid_y)
+    assert len(_cache_arvores) == 2
+    _cache_arvores.limpar()
+
+
+@pytest.mark.parametrize("kwargs", [{"n_neighbors": 4}, {}, {"max_distance": 8.0}])
+def test_idw_paralelo_deterministico(kwargs):
+    """Testa se o processamento em várias threads reproduz o sequencial."""
+    pontos, valores = gerar_amostras(n_pontos=20)
+    grid_x, grid_y = gerar_grid(nx=80, ny=60)
+
+    z_seq = IDW(IDWConfig(**kwargs)).interpolar(pontos, valores, grid_x, grid_y)
+    idw = IDW(IDWConfig(n_jobs=3, **kwargs))
+    assert idw._tamanho_bloco(8, grid_x.size, 3) < grid_x.size
+    z_par = idw.interpolar(pontos, valores, grid_x, grid_y)
+
+    np.testing.assert_array_equal(z_seq, z_par)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"n_neighbors": 4},
+        {"n_neighbors": 16},
+        {"engine": "brute"},
+        {"max_distance": 8.0, "n_neighbors": 3},
+        {"max_distance": 12.0, "n_neighbors": 16},
+        {"max_distance": 8.0},
+    ],
+)
+@pytest.mark.parametrize("n_pontos", [20, 300])
+def test_idw_multiplos_atributos(kwargs, n_pontos):
+    """Testa a interpolação de vários atributos com uma única busca de vizinhos."""
+    pontos, valores = gerar_amostras(n_pontos=n_pontos)
+    grid_x, grid_y = gerar_grid(nx=25, ny=15)
+    atributos = np.column_stack((valores, valores**2, -3 * valores + 1))
+
+    config = IDWConfig(default_value=-1.0, **kwargs)
+    z = IDW(config).interpolar(pontos, atributos, grid_x, grid_y)
+
+    assert z.shape == (3,) + grid_x.shape
+    for m in range(atributos.shape[1]):
+        z_m = IDW(config).interpolar(pontos, atributos[:, m], grid_x, grid_y)
+        np.testing.assert_array_equal(z[m], z_m)
+
+    # Processamento em blocos paralelos mantém o resultado
+    config_blocos = IDWConfig(default_value=-1.0, max_memory_mb=0.01, n_jobs=2, **kwargs)
+    z_blocos = IDW(config_blocos).interpolar(pontos, atributos, grid_x, grid_y)
+    np.testing.assert_array_equal(z, z_blocos)
+
+
+@pytest.mark.parametrize(
+    "n_neighbors, esperado",
+    [
+        (
+            4,
+            [
+                [2.2544502974890377, 3.383218649779443, 11.051057883428363, 15.869057821737822],
+                [5.391193768227044, 7.691804154669364, 21.46206558331631, 29.258762110917125],
+                [6.593516846912353, 17.08966720911904, 24.829101297710615, 39.73825413374254],
+            ],
+        ),
+        (
+            16,
+            [
+                [5.528708224847966, 5.740653437217738, 11.013641868932634, 15.45942778316672],
+                [7.150367726159853, 8.170605154358926, 20.28320393159007, 21.984860054987973],
+                [6.748822065490994, 16.631532070087943, 20.07385871927668, 31.27880667895328],
+            ],
+        ),
+    ],
+)
+def test_idw_multiplos_atributos_igual_versao_original(n_neighbors, esperado):
+    """Testa que uma coluna multiatributo reproduz bit a bit a interpolação original."""
+    pontos, valores = gerar_amostras(n_pontos=20)
+    grid_x, grid_y = gerar_grid(nx=4, ny=3)
+    atributos = np.column_stack((valores, valores**2, -3 * valores + 1))
+    config = IDWConfig(n_neighbors=n_neighbors, default_value=-1.0)
+
+    z = IDW(config).interpolar(pontos, atributos, grid_x, grid_y)
+    z_unico = IDW(config).interpolar(pontos, atributos[:, 1], grid_x, grid_y)
+
+    # Resultado da implementação de um único atributo anterior ao suporte multiatributo
+    esperado = np.array(esperado)
+    np.testing.assert_array_equal(z[1], z_unico)
+    np.testing.assert_array_equal(z[1], esperado)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"n_neighbors": 4},
+        {"engine": "brute"},
+        {"max_distance": 8.0, "n_neighbors": 3},
+        {"max_distance": 8.0},
+    ],
+)
+def test_idw_operador_pesos(kwargs, tmp_path):
+    """Testa o operador esparso de pesos contra a interpolação direta."""
+    pontos, valores = gerar_amostras(n_pontos=20)
+    grid_x, grid_y = gerar_grid(nx=25, ny=15)
+    atributos = np.column_stack((valores, valores**2))
+
+    config = IDWConfig(default_value=-1.0, max_memory_mb=0.01, **kwargs)
+    operador = IDW(config).ajustar(pontos).operador_pesos(grid_x, grid_y)
+
+    assert operador.esparso
+    assert operador.pesos.shape == (grid_x.size, len(pontos))
+    z = IDW(config).interpolar(pontos, valores, grid_x, grid_y)
+    np.testing.assert_allclose(operador.aplicar(valores), z, rtol=1e-12)
+    z_multi = IDW(config).interpolar(pontos, atributos, grid_x, grid_y)
+    np.testing.assert_allclose(operador.aplicar(atributos), z_multi, rtol=1e-12)
+
+    # Persistência em disco preserva o operador
+    caminho = tmp_path / "pesos.npz"
+    operador.salvar(caminho)
+    carregado = OperadorPesos.carregar(caminho)
+    np.testing.assert_array_equal(carregado.aplicar(valores), operador.aplicar(valores))
+
+    # Ajuste sem valores não permite prever
+    with pytest.raises(RuntimeError):
+        IDW(config).ajustar(pontos).prever(grid_x, grid_y)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"n_neighbors": 4},
+        {"max_distance": 8.0, "n_neighbors": 3},
+        {"max_distance": 8.0},
+        {"engine": "brute"},
+    ],
+)
+def test_idw_atualizacao_incremental(kwargs):
+    """Testa a atualização incremental contra o recálculo integral."""
+    pontos, valores = gerar_amostras(n_pontos=30)
+    grid_x, grid_y = gerar_grid(nx=70, ny=45)
+    config = IDWConfig(default_value=-1.0, **kwargs)
+
+    idw = IDW(config).ajustar(pontos, valores)
+    z = idw.prever(grid_x, grid_y)
+
+    novos_pontos = np.array([[12.5, 30.0], [44.0, 3.0]])
+    novos_valores = np.array([150.0, -20.0])
+    z = idw.atualizar(
+        z, grid_x, grid_y, novos_pontos, novos_valores, indices=[5], valores_corrigidos=[99.0]
+    )
+
+    pontos_final = np.vstack((pontos, novos_pontos))
+    valores_final = np.concatenate((valores, novos_valores))
+    valores_final[5] = 99.0
+    z_integral = IDW(config).interpolar(pontos_final, valores_final, grid_x, grid_y)
+    np.testing.assert_array_equal(z, z_integral)
+
+    # O estado ajustado inclui as alterações
+    np.testing.assert_array_equal(idw.prever(grid_x, grid_y), z_integral)
+
+
+def test_idw_atualizacao_recalcula_apenas_vizinhanca():
+    """Testa que só as células ao alcance do ponto alterado são recalculadas."""
+    pontos, valores = gerar_amostras(n_pontos=30)
+    grid_x, grid_y = gerar_grid(nx=100, ny=100)
+    idw = IDW(IDWConfig(n_neighbors=4)).ajustar(pontos, valores)
+
+    afetadas = idw._celulas_afetadas(*coordenadas_grade(grid_x, grid_y), pontos[[0]])
+    assert 0 < afetadas.sum() < afetadas.size / 2
+
+    z = idw.prever(grid_x, grid_y)
+    z_atualizado = idw.atualizar(z, grid_x, grid_y, indices=[0], valores_corrigidos=[1e3])
+    assert np.all(z_atualizado[~afetadas.reshape(z.shape)] == z[~afetadas.reshape(z.shape)])
+    assert np.any(z_atualizado != z)
+
+    with pytest.raises(ValueError):
+        idw.atualizar(z, grid_x, grid_y, indices=[100], valores_corrigidos=[1.0])
+    with pytest.raises(ValueError):
+        idw.atualizar(z[:-1], grid_x, grid_y, indices=[0], valores_corrigidos=[1.0])
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"n_neighbors": 4},
+        {"engine": "brute"},
+        {"max_distance": 8.0},
+    ],
+)
+def test_idw_grade_regular(kwargs):
+    """Testa a GradeRegular contra o meshgrid equivalente."""
+    pontos, valores = gerar_amostras(n_pontos=20)
+    grade = GradeRegular.de_limites(0, 50, 0, 30, nx=37, ny=23)
+    grid_x, grid_y = grade.meshgrid()
+    config = IDWConfig(default_value=-1.0, max_memory_mb=0.01, **kwargs)
+
+    z_malha = IDW(config).interpolar(pontos, valores, grid_x, grid_y)
+    z_grade = IDW(config).interpolar(pontos, valores, grade)
+    assert z_grade.shape == grade.shape
+    np.testing.assert_array_equal(z_grade, z_malha)
+
+    operador = IDW(config).ajustar(pontos).operador_pesos(grade)
+    np.testing.assert_allclose(operador.aplicar(valores), z_malha, rtol=1e-12)
+
+    idw = IDW(config).ajustar(pontos, valores)
+    z = idw.atualizar(idw.prever(grade), grade, novos_pontos=[[10, 10]], novos_valores=[5.0])
+    z_integral = IDW(config).interpolar(
+        np.vstack((pontos, [[10, 10]])), np.append(valores, 5.0), grid_x, grid_y
+    )
+    np.testing.assert_array_equal(z, z_integral)
+
+    with pytest.raises(ValueError):
+        IDW(config).interpolar(pontos, valores, grade, grid_y)
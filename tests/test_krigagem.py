@@ -1,8 +1,11 @@
 import numpy as np  # noqa: F401
 import pytest
+from pykrige.ok import OrdinaryKriging
 
 from interpoladores.config import KrigagemConfig
 from interpoladores.krigagem import Krigagem
+from interpoladores.operador import OperadorPesos
+from utils.grid_utils import GradeRegular
 
 
 def gerar_grid(nx=5, ny=5, xmin=0, xmax=20, ymin=0, ymax=20):
@@ -187,3 +190,452 @@ def test_krigagem_reproducibilidade():
     zi2 = krig2.interpolar(gridx, gridy)
 
     np.testing.assert_allclose(zi1, zi2)
+
+
+def test_krigagem_grade_regular():
+    """Testa a Krigagem com GradeRegular contra os eixos equivalentes."""
+    x, y, z = gerar_amostras(n_pontos=12)
+    grade = GradeRegular.de_limites(0, 20, 0, 20, nx=5, ny=5)
+
+    z_eixos = Krigagem(x, y, z).interpolar(grade.eixo_x(), grade.eixo_y())
+    z_grade = Krigagem(x, y, z).interpolar(grade)
+    np.testing.assert_allclose(z_grade, z_eixos)
+
+    # Grades retangulares (nx != ny) também são aceitas
+    grade = GradeRegular.de_limites(0, 20, 0, 10, nx=6, ny=4)
+    z_grade = Krigagem(x, y, z).interpolar(grade)
+    assert z_grade.shape == grade.shape
+
+
+PARAMETROS_ESFERICO = {"psill": 0.5, "range": 12.0, "nugget": 0.01}
+
+
+@pytest.mark.parametrize("estatisticas", [False, True])
+def test_krigagem_local_todos_vizinhos_equivale_global(estatisticas):
+    """Testa a vizinhança com todos os pontos contra o sistema global do PyKrige."""
+    x, y, z = gerar_amostras(n_pontos=25)
+    gridx, gridy = gerar_grid(nx=9, ny=9)
+    base = dict(
+        variogram_model_parameters=PARAMETROS_ESFERICO,
+        anisotropy_angle=30.0,
+        anisotropy_ratio=2.0,
+        enable_statistics=estatisticas,
+    )
+
+    global_ = Krigagem(x, y, z, config=KrigagemConfig(**base)).interpolar(gridx, gridy)
+    local = Krigagem(x, y, z, config=KrigagemConfig(n_neighbors=100, **base)).interpolar(
+        gridx, gridy
+    )
+
+    if estatisticas:
+        np.testing.assert_allclose(local[0], global_[0], rtol=1e-8, atol=1e-10)
+        np.testing.assert_allclose(local[1], global_[1], rtol=1e-8, atol=1e-10)
+    else:
+        np.testing.assert_allclose(local, global_, rtol=1e-8, atol=1e-10)
+
+
+def test_krigagem_local_equivale_janela_movel_pykrige():
+    """Testa a busca elíptica de k vizinhos contra a janela móvel do PyKrige."""
+    x, y, z = gerar_amostras(n_pontos=40)
+    gridx, gridy = gerar_grid(nx=7, ny=7)
+    config = KrigagemConfig(
+        modelo_variograma="exponential",
+        variogram_model_parameters={"psill": 0.4, "range": 10.0, "nugget": 0.0},
+        anisotropy_angle=45.0,
+        anisotropy_ratio=1.5,
+        n_neighbors=8,
+        anisotropic_search=True,
+        enable_statistics=True,
+    )
+
+    z_local, ss_local = Krigagem(x, y, z, config=config).interpolar(gridx, gridy)
+
+    ok = OrdinaryKriging(
+        x,
+        y,
+        z,
+        variogram_model="exponential",
+        variogram_parameters=config.variogram_model_parameters,
+        anisotropy_angle=45.0,
+        anisotropy_scaling=1.5,
+    )
+    z_ref, ss_ref = ok.execute("grid", gridx, gridy, backend="loop", n_closest_points=8)
+    np.testing.assert_allclose(z_local, z_ref, rtol=1e-8, atol=1e-10)
+    np.testing.assert_allclose(ss_local, ss_ref, rtol=1e-8, atol=1e-10)
+
+
+def test_krigagem_local_raio_de_busca():
+    """Testa o raio de busca: células sem vizinhos recebem NaN."""
+    x, y, z = gerar_amostras(n_pontos=30)
+    gridx, gridy = gerar_grid(nx=8, ny=8, xmin=-30, xmax=20)
+    config = KrigagemConfig(variogram_model_parameters=PARAMETROS_ESFERICO, max_distance=6.0)
+
+    zi = Krigagem(x, y, z, config=config).interpolar(gridx, gridy)
+
+    assert zi.shape == (8, 8)
+    assert np.all(np.isnan(zi[:, gridx < -7]))
+    assert np.all(np.isfinite(zi[:, gridx > 2]))
+
+    # Raio maior que a extensão equivale à Krigagem global
+    config_amplo = KrigagemConfig(variogram_model_parameters=PARAMETROS_ESFERICO, max_distance=1e3)
+    config_global = KrigagemConfig(variogram_model_parameters=PARAMETROS_ESFERICO)
+    np.testing.assert_allclose(
+        Krigagem(x, y, z, config=config_amplo).interpolar(gridx, gridy),
+        Krigagem(x, y, z, config=config_global).interpolar(gridx, gridy),
+        rtol=1e-8,
+    )
+
+    with pytest.raises(ValueError):
+        Krigagem(x, y, z, config=KrigagemConfig(n_neighbors=0)).interpolar(gridx, gridy)
+
+
+def test_krigagem_ajustar_prever():
+    """Testa a separação entre ajuste do variograma e previsão."""
+    x, y, z = gerar_amostras(n_pontos=20)
+    gridx, gridy = gerar_grid(nx=6, ny=6)
+
+    krig = Krigagem(x, y, z)
+    with pytest.raises(RuntimeError):
+        krig.prever(gridx, gridy)
+
+    krig.ajustar()
+    assert krig.variograma.modelo == "spherical"
+    assert len(krig.variograma.parametros) == 3
+    ok = krig._ok
+
+    zi = krig.prever(gridx, gridy)
+    np.testing.assert_allclose(zi, Krigagem(x, y, z).interpolar(gridx, gridy))
+
+    # Novas grades reaproveitam o ajuste
+    krig.interpolar(*gerar_grid(nx=9, ny=9))
+    assert krig._ok is ok
+
+
+@pytest.mark.parametrize("extensao", [".json", ".npz"])
+@pytest.mark.parametrize("n_neighbors", [None, 6])
+@pytest.mark.parametrize("parametros", [None, {"psill": 0.5, "range": 12, "nugget": 0.1}])
+def test_krigagem_salvar_carregar(tmp_path, extensao, n_neighbors, parametros):
+    """Testa a persistência do modelo ajustado em JSON e npz."""
+    x, y, z = gerar_amostras(n_pontos=20)
+    gridx, gridy = gerar_grid(nx=6, ny=6)
+    config = KrigagemConfig(
+        modelo_variograma="exponential",
+        variogram_model_parameters=parametros,
+        anisotropy_angle=30.0,
+        anisotropy_ratio=1.5,
+        n_neighbors=n_neighbors,
+        enable_statistics=True,
+    )
+
+    krig = Krigagem(x, y, z, config=config).ajustar()
+    caminho = tmp_path / f"modelo{extensao}"
+    krig.salvar(str(caminho))
+
+    carregado = Krigagem.carregar(str(caminho))
+    assert carregado.config == config
+    assert carregado.variograma == krig.variograma
+
+    z_original, ss_original = krig.prever(gridx, gridy)
+    z_carregado, ss_carregado = carregado.prever(gridx, gridy)
+    np.testing.assert_allclose(z_carregado, z_original, rtol=1e-10)
+    np.testing.assert_allclose(ss_carregado, ss_original, rtol=1e-10)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"max_memory_mb": 0.02},
+        {"backend": "loop"},
+        {"backend": "loop", "max_memory_mb": 0.02},
+        {"backend": "C", "max_memory_mb": 0.02},
+        {"n_neighbors": 8, "max_memory_mb": 0.01},
+    ],
+)
+def test_krigagem_backend_e_memoria(kwargs):
+    """Testa backends e blocos limitados por memória contra a execução integral."""
+    x, y, z = gerar_amostras(n_pontos=30)
+    gridx, gridy = gerar_grid(nx=15, ny=15)
+    base = dict(variogram_model_parameters=PARAMETROS_ESFERICO, enable_statistics=True)
+
+    z_ref, ss_ref = Krigagem(x, y, z, config=KrigagemConfig(**base)).interpolar(gridx, gridy)
+    if "n_neighbors" in kwargs:
+        config_ref = KrigagemConfig(n_neighbors=kwargs["n_neighbors"], **base)
+        z_ref, ss_ref = Krigagem(x, y, z, config=config_ref).interpolar(gridx, gridy)
+
+    zi, ss = Krigagem(x, y, z, config=KrigagemConfig(**kwargs, **base)).interpolar(gridx, gridy)
+    assert zi.shape == (15, 15)
+    np.testing.assert_allclose(zi, z_ref, rtol=1e-8, atol=1e-10)
+    np.testing.assert_allclose(ss, ss_ref, rtol=1e-8, atol=1e-10)
+
+
+def test_krigagem_plano_execucao():
+    """Testa a política automática de backend e blocos."""
+    x, y, z = gerar_amostras(n_pontos=1000)
+
+    krig = Krigagem(x, y, z)
+    assert krig._plano_execucao(100) == ("vectorized", 100)
+
+    # Orçamento pequeno: blocos menores e, abaixo do mínimo, backend em laço
+    krig.config = KrigagemConfig(max_memory_mb=100)
+    backend, tamanho = krig._plano_execucao(10**6)
+    assert backend == "vectorized" and 256 <= tamanho < 10**6
+    krig.config = KrigagemConfig(max_memory_mb=20)
+    backend, tamanho = krig._plano_execucao(10**6)
+    assert backend == "loop" and tamanho < 10**6
+
+    krig.config = KrigagemConfig(backend="gpu")
+    with pytest.raises(ValueError):
+        krig._plano_execucao(100)
+
+
+@pytest.mark.parametrize("engine", ["pykrige", "numpy"])
+@pytest.mark.parametrize("n_neighbors", [None, 8])
+def test_krigagem_processos_equivale_sequencial(n_neighbors, engine):
+    """Testa a execução em vários processos contra o processo único."""
+    x, y, z = gerar_amostras(n_pontos=200)
+    gridx, gridy = gerar_grid(nx=25, ny=25)
+    base = dict(n_neighbors=n_neighbors, engine=engine, enable_statistics=True)
+
+    z_seq, ss_seq = Krigagem(x, y, z, config=KrigagemConfig(**base)).interpolar(gridx, gridy)
+    z_par, ss_par = Krigagem(x, y, z, config=KrigagemConfig(n_jobs=2, **base)).interpolar(
+        gridx, gridy
+    )
+
+    # As faixas são lotes de outro tamanho: iguais até o arredondamento, não bit a bit
+    np.testing.assert_allclose(z_par, z_seq, rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(ss_par, ss_seq, rtol=1e-8, atol=1e-12)
+
+
+@pytest.mark.parametrize("anisotropia", [(0.0, 1.0), (30.0, 2.0)])
+def test_krigagem_engine_numpy_equivale_pykrige(anisotropia):
+    """Testa o motor NumPy contra o PyKrige e o reaproveitamento da fatoração."""
+    x, y, z = gerar_amostras(n_pontos=40)
+    x[0], y[0] = 10.0, 10.0  # célula coincidente com uma amostra
+    gridx, gridy = gerar_grid(nx=21, ny=21)
+    base = dict(
+        modelo_variograma="spherical",
+        variogram_model_parameters=PARAMETROS_ESFERICO,
+        anisotropy_angle=anisotropia[0],
+        anisotropy_ratio=anisotropia[1],
+        enable_statistics=True,
+    )
+
+    z_ref, ss_ref = Krigagem(x, y, z, config=KrigagemConfig(**base)).interpolar(gridx, gridy)
+    krig = Krigagem(x, y, z, config=KrigagemConfig(engine="numpy", max_memory_mb=0.05, **base))
+    z_np, ss_np = krig.interpolar(gridx, gridy)
+
+    np.testing.assert_allclose(z_np, z_ref, rtol=1e-8, atol=1e-10)
+    np.testing.assert_allclose(ss_np, ss_ref, rtol=1e-8, atol=1e-10)
+
+    # A variância usa a fatoração, sem a inversa explícita
+    sistema = krig._sistema
+    assert sistema.inversa is None
+
+    # A segunda previsão reaproveita a fatoração; um novo ajuste a descarta
+    krig.prever(gridx[:5], gridy[:5])
+    assert krig._sistema is sistema
+    krig.ajustar()
+    assert krig._sistema is None
+
+
+def test_krigagem_engine_invalido():
+    """Testa a validação do motor da Krigagem global."""
+    x, y, z = gerar_amostras(n_pontos=10)
+    gridx, gridy = gerar_grid()
+    with pytest.raises(ValueError, match="Engine"):
+        Krigagem(x, y, z, config=KrigagemConfig(engine="fortran")).interpolar(gridx, gridy)
+
+
+def test_krigagem_meshgrid_equivale_eixos():
+    """Testa que meshgrids 2D são reduzidos aos eixos da grade."""
+    x, y, z = gerar_amostras(n_pontos=20)
+    gridx, gridy = gerar_grid(nx=8, ny=8)
+    krig = Krigagem(x, y, z, config=KrigagemConfig(modelo_variograma="linear"))
+
+    z_eixos = krig.interpolar(gridx, gridy)
+    z_malha = krig.interpolar(*np.meshgrid(gridx, gridy))
+
+    np.testing.assert_allclose(z_malha, z_eixos)
+    with pytest.raises(ValueError, match="meshgrid"):
+        krig.interpolar(*np.meshgrid(gridx, gridy)[::-1])
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"engine": "numpy"}, {"n_neighbors": 8}, {"engine": "numpy", "n_jobs": 2}]
+)
+def test_krigagem_saida(kwargs):
+    """Testa a seleção das saídas (estimativa, variância ou ambas)."""
+    x, y, z = gerar_amostras(n_pontos=30)
+    gridx, gridy = gerar_grid(nx=10, ny=10)
+    base = dict(modelo_variograma="exponential", **kwargs)
+
+    z_ref, ss_ref = Krigagem(x, y, z, config=KrigagemConfig(saida="ambos", **base)).interpolar(
+        gridx, gridy
+    )
+    z_est = Krigagem(x, y, z, config=KrigagemConfig(saida="estimativa", **base)).interpolar(
+        gridx, gridy
+    )
+    ss_var = Krigagem(x, y, z, config=KrigagemConfig(saida="variancia", **base)).interpolar(
+        gridx, gridy
+    )
+
+    np.testing.assert_allclose(z_est, z_ref)
+    np.testing.assert_allclose(ss_var, ss_ref)
+
+
+def test_krigagem_saida_estimativa_dispensa_inversa():
+    """Testa que o motor NumPy não calcula a inversa sem a variância."""
+    x, y, z = gerar_amostras(n_pontos=30)
+    gridx, gridy = gerar_grid()
+    krig = Krigagem(x, y, z, config=KrigagemConfig(engine="numpy", saida="estimativa"))
+    krig.interpolar(gridx, gridy)
+    assert krig._sistema.inversa is None
+
+    with pytest.raises(ValueError, match="Saída"):
+        Krigagem(x, y, z, config=KrigagemConfig(saida="desvio")).interpolar(gridx, gridy)
+
+
+@pytest.mark.parametrize("anisotropia", [(0.0, 1.0), (30.0, 2.0)])
+def test_krigagem_engine_sparse_equivale_numpy(anisotropia):
+    """Testa o motor esparso contra o motor NumPy, inclusive fora do alcance."""
+    rng = np.random.default_rng(7)
+    x, y = rng.random(150) * 100, rng.random(150) * 100
+    z = np.sin(x / 15) + np.cos(y / 20)
+    x[0], y[0] = 50.0, 50.0  # célula coincidente com uma amostra
+    eixo = np.linspace(-40, 140, 19)
+    base = dict(
+        variogram_model_parameters={"psill": 1.0, "range": 12.0, "nugget": 0.05},
+        anisotropy_angle=anisotropia[0],
+        anisotropy_ratio=anisotropia[1],
+        enable_statistics=True,
+    )
+
+    z_ref, ss_ref = Krigagem(x, y, z, config=KrigagemConfig(engine="numpy", **base)).interpolar(
+        eixo, eixo
+    )
+    krig = Krigagem(x, y, z, config=KrigagemConfig(engine="sparse", max_memory_mb=0.05, **base))
+    z_esp, ss_esp = krig.interpolar(eixo, eixo)
+
+    np.testing.assert_allclose(z_esp, z_ref, rtol=1e-8, atol=1e-10)
+    np.testing.assert_allclose(ss_esp, ss_ref, rtol=1e-8, atol=1e-10)
+
+    # A matriz esparsa tem apenas os pares dentro do alcance e é reaproveitada
+    sistema = krig._sistema_esparso
+    assert sistema.vizinhos_por_ponto < 0.2 * len(x)
+    krig.prever(eixo[:5], eixo[:5])
+    assert krig._sistema_esparso is sistema
+    krig.ajustar()
+    assert krig._sistema_esparso is None
+
+
+def test_krigagem_engine_sparse_exige_suporte_compacto():
+    """Testa que o motor esparso recusa variogramas sem suporte compacto."""
+    x, y, z = gerar_amostras(n_pontos=30)
+    gridx, gridy = gerar_grid()
+    config = KrigagemConfig(modelo_variograma="exponential", engine="sparse")
+    with pytest.raises(ValueError, match="suporte compacto"):
+        Krigagem(x, y, z, config=config).interpolar(gridx, gridy)
+
+    # Sem parâmetros fixos, o variograma é ajustado sem manter o objeto do PyKrige
+    krig = Krigagem(x, y, z, config=KrigagemConfig(engine="sparse")).ajustar()
+    assert krig._ok is None
+    assert np.all(np.isfinite(krig.prever(gridx, gridy)))
+
+
+def test_krigagem_adicionar_remover_amostras():
+    """Testa a atualização incremental do sistema contra um novo ajuste."""
+    rng = np.random.default_rng(2)
+    x, y = rng.random(60) * 100, rng.random(60) * 100
+    z = np.sin(x / 15) + np.cos(y / 20)
+    eixo = np.linspace(0, 100, 15)
+    config = KrigagemConfig(
+        variogram_model_parameters={"psill": 1.0, "range": 30.0, "nugget": 0.02},
+        anisotropy_angle=30.0,
+        anisotropy_ratio=1.5,
+        enable_statistics=True,
+        engine="numpy",
+    )
+
+    krig = Krigagem(x[:50], y[:50], z[:50], config=config).ajustar()
+    krig.prever(eixo, eixo)
+    krig.adicionar_amostras(x[50:55], y[50:55], z[50:55]).adicionar_amostras(x[55], y[55], z[55])
+    krig.adicionar_amostras(x[56:], y[56:], z[56:])
+    assert krig._sistema.lu is None
+
+    z_ref, ss_ref = Krigagem(x, y, z, config=config).interpolar(eixo, eixo)
+    z_inc, ss_inc = krig.prever(eixo, eixo)
+    np.testing.assert_allclose(z_inc, z_ref, rtol=1e-8, atol=1e-10)
+    np.testing.assert_allclose(ss_inc, ss_ref, rtol=1e-8, atol=1e-10)
+
+    mantidos = np.setdiff1d(np.arange(60), [3, 10, 59])
+    krig.remover_amostras([3, 10, 59])
+    ref = Krigagem(x[mantidos], y[mantidos], z[mantidos], config=config)
+    z_ref, ss_ref = ref.interpolar(eixo, eixo)
+    z_inc, ss_inc = krig.prever(eixo, eixo)
+    np.testing.assert_allclose(z_inc, z_ref, rtol=1e-8, atol=1e-10)
+    np.testing.assert_allclose(ss_inc, ss_ref, rtol=1e-8, atol=1e-10)
+    np.testing.assert_allclose(krig.validacao_cruzada()[0], ref.validacao_cruzada()[0])
+
+    with pytest.raises(ValueError, match="Índices"):
+        krig.remover_amostras(len(krig.x))
+    with pytest.raises(ValueError, match="Dimensões"):
+        krig.adicionar_amostras([1.0, 2.0], [1.0], [0.0])
+    with pytest.raises(RuntimeError, match="ajustar"):
+        Krigagem(x, y, z).adicionar_amostras(1.0, 1.0, 0.0)
+
+
+def test_krigagem_ranquear_candidatos():
+    """Testa a redução da variância de cada candidato contra novos ajustes."""
+    rng = np.random.default_rng(4)
+    x, y = rng.random(40) * 100, rng.random(40) * 100
+    z = np.sin(x / 15) + np.cos(y / 20)
+    eixo = np.linspace(0, 100, 12)
+    config = KrigagemConfig(
+        variogram_model_parameters={"psill": 1.0, "range": 30.0, "nugget": 0.02},
+        saida="variancia",
+    )
+    krig = Krigagem(x, y, z, config=config).ajustar()
+
+    x_cand, y_cand = rng.random(6) * 100, rng.random(6) * 100
+    x_cand[0], y_cand[0] = x[0], y[0]  # candidato sobre uma amostra existente
+    ordem, reducao = krig.ranquear_candidatos(x_cand, y_cand, eixo, eixo)
+
+    variancia = krig.prever(eixo, eixo).mean()
+    for c in range(1, 6):
+        ampliada = Krigagem(
+            np.append(x, x_cand[c]), np.append(y, y_cand[c]), np.append(z, 0.0), config=config
+        )
+        assert reducao[c] == pytest.approx(variancia - ampliada.interpolar(eixo, eixo).mean())
+    assert reducao[0] == 0.0
+    np.testing.assert_array_equal(ordem, np.argsort(-reducao))
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"engine": "numpy"}, {"n_neighbors": 6}, {"max_distance": 6.0}]
+)
+def test_krigagem_operador_pesos(kwargs, tmp_path):
+    """Testa o operador de pesos contra a Krigagem direta de várias campanhas."""
+    x, y, z = gerar_amostras(n_pontos=30)
+    gridx, gridy = gerar_grid(nx=12, ny=12)
+    campanhas = np.column_stack((z, z**2, np.sin(z)))
+    config = KrigagemConfig(
+        variogram_model_parameters=PARAMETROS_ESFERICO, max_memory_mb=0.01, **kwargs
+    )
+
+    operador = Krigagem(x, y, z, config=config).ajustar().operador_pesos(gridx, gridy)
+    assert operador.esparso == bool(kwargs.get("n_neighbors") or kwargs.get("max_distance"))
+    if kwargs.get("n_neighbors"):
+        assert operador.pesos.getnnz(axis=1).max() <= kwargs["n_neighbors"]
+
+    grades = operador.aplicar(campanhas)
+    for m in range(campanhas.shape[1]):
+        z_ref = Krigagem(x, y, campanhas[:, m], config=config).interpolar(gridx, gridy)
+        np.testing.assert_allclose(grades[m], z_ref, rtol=1e-8, atol=1e-10)
+
+    # Persistência em disco preserva o operador
+    caminho = tmp_path / "pesos_krigagem.npz"
+    operador.salvar(caminho)
+    np.testing.assert_array_equal(OperadorPesos.carregar(caminho).aplicar(z), operador.aplicar(z))
+
+    with pytest.raises(RuntimeError, match="ajustar"):
+        Krigagem(x, y, z, config=config).operador_pesos(gridx, gridy)
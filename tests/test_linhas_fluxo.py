@@ -0,0 +1,103 @@
+import numpy as np  # noqa: F401
+import pytest
+
+from interpoladores.linhas_fluxo import MOTIVOS_PARADA, tracar_linhas_fluxo
+from interpoladores.modelo_potenciometrico import ModeloPotenciometrico
+from utils.grid_utils import GradeRegular
+
+GRADE = GradeRegular.de_limites(-50, 50, -50, 50, nx=101, ny=101)
+
+
+def motivos(linhas):
+    """Retorna os nomes dos motivos de parada de cada linha."""
+    return [MOTIVOS_PARADA[m] for m in linhas.motivo]
+
+
+def test_fluxo_uniforme_borda_e_comprimento():
+    """Testa linhas retas até a borda, o comprimento máximo e a saída compacta."""
+    grid_x, grid_y = GRADE.meshgrid()
+    modelo = ModeloPotenciometrico(GRADE, None, 0.02 * grid_x + 0.01 * grid_y)
+
+    x0, y0 = np.array([0.0, 10.0, -20.0, 70.0]), np.array([0.0, 0.0, -10.0, 0.0])
+    linhas = modelo.tracar_linhas_fluxo(x0, y0)
+    assert len(linhas) == 4 and linhas.inicio[-1] == len(linhas.x)
+    assert motivos(linhas) == ["borda"] * 4
+
+    # Fluxo na direção (-2, -1): a linha termina exatamente na borda X = -50
+    x_final, y_final = linhas.pontos_finais()
+    np.testing.assert_allclose(x_final[:3], -50.0)
+    np.testing.assert_allclose(y_final[:3], y0[:3] - (x0[:3] + 50) / 2)
+    np.testing.assert_allclose(linhas.comprimento[:3], (x0[:3] + 50) * np.sqrt(5) / 2)
+    x_linha, y_linha = linhas.trajetoria(1)
+    assert x_linha[0] == 10.0 and np.all(np.diff(x_linha) < 0)
+    assert len(linhas.trajetoria(3)[0]) == 1 and linhas.comprimento[3] == 0
+
+    # A montante, com comprimento máximo e com número máximo de passos
+    linhas = modelo.tracar_linhas_fluxo([0.0], [0.0], comprimento_max=20.0, sentido="montante")
+    assert motivos(linhas) == ["comprimento"]
+    np.testing.assert_allclose(linhas.pontos_finais(), ([40 / np.sqrt(5)], [20 / np.sqrt(5)]))
+    linhas = modelo.tracar_linhas_fluxo([0.0], [0.0], passo=1.0, max_passos=3)
+    assert motivos(linhas) == ["passos"] and linhas.comprimento[0] == pytest.approx(3.0)
+
+
+@pytest.mark.parametrize("metodo", ["rk4", "rk45"])
+def test_fluxo_radial_e_rotacional(metodo):
+    """Testa a estagnação em um poço, o traçado a montante e a precisão em círculos."""
+    grid_x, grid_y = GRADE.meshgrid()
+    r = np.hypot(grid_x, grid_y)
+    rng = np.random.default_rng(0)
+    x0, y0 = rng.uniform(-45, 45, 500), rng.uniform(-45, 45, 500)
+
+    # Cone de rebaixamento centrado na origem: as linhas convergem para o poço
+    linhas = ModeloPotenciometrico(GRADE, None, np.log1p(r)).tracar_linhas_fluxo(
+        x0, y0, metodo=metodo
+    )
+    assert set(motivos(linhas)) == {"estagnacao"}
+    assert np.hypot(*linhas.pontos_finais()).max() < 0.5
+    np.testing.assert_allclose(linhas.comprimento, np.hypot(x0, y0), atol=0.5)
+
+    # A montante, a partir do poço, as linhas saem radialmente pela borda
+    linhas = ModeloPotenciometrico(GRADE, None, np.log1p(r)).tracar_linhas_fluxo(
+        [3.0], [4.0], sentido="montante", metodo=metodo
+    )
+    np.testing.assert_allclose(linhas.pontos_finais(), ([37.5], [50.0]), atol=0.5)
+
+    # Campo rotacional (-y, x): bilinear exato e linhas circulares em torno da origem
+    raio = np.hypot(x0, y0)
+    dentro = (raio > 5) & (raio < 45)
+    linhas = tracar_linhas_fluxo(
+        -grid_y, grid_x, GRADE, x0[dentro], y0[dentro], max_passos=300, metodo=metodo
+    )
+    assert set(motivos(linhas)) == {"passos"}
+    raio_pontos = np.repeat(raio[dentro], np.diff(linhas.inicio))
+    np.testing.assert_allclose(np.hypot(linhas.x, linhas.y), raio_pontos, atol=1e-4)
+
+
+def test_linhas_fluxo_campo_mapeado_e_entrada_invalida(tmp_path):
+    """Testa o campo em memmap, o meshgrid equivalente e a validação das entradas."""
+    grid_x, grid_y = GRADE.meshgrid()
+    z = 0.01 * grid_x**2 - 0.02 * grid_y
+    saida = tuple(
+        np.lib.format.open_memmap(tmp_path / f"fluxo_{c}.npy", "w+", np.float32, z.shape)
+        for c in "xy"
+    )
+    fx, fy = ModeloPotenciometrico(GRADE, None, z).calcular_fluxo(saida=saida)
+
+    mapeadas = tracar_linhas_fluxo(fx, fy, GRADE, [5.0, -5.0], [0.0, 10.0], metodo="rk45")
+    malha = ModeloPotenciometrico(grid_x, grid_y, z).tracar_linhas_fluxo(
+        [5.0, -5.0], [0.0, 10.0], metodo="rk45"
+    )
+    assert motivos(mapeadas) == motivos(malha) == ["borda", "borda"]
+    np.testing.assert_allclose(mapeadas.pontos_finais(), malha.pontos_finais(), atol=1e-3)
+
+    with pytest.raises(ValueError, match="Dimensões"):
+        tracar_linhas_fluxo(fx[:-1], fy, GRADE, [0.0], [0.0])
+    with pytest.raises(ValueError, match="sentido"):
+        tracar_linhas_fluxo(fx, fy, GRADE, [0.0], [0.0], sentido="lateral")
+    with pytest.raises(ValueError, match="Método"):
+        tracar_linhas_fluxo(fx, fy, GRADE, [0.0], [0.0], metodo="euler")
+    with pytest.raises(ValueError, match="passo"):
+        tracar_linhas_fluxo(fx, fy, GRADE, [0.0], [0.0], passo=0.0)
+    with pytest.raises(ValueError, match="2 x 2"):
+        grade = GradeRegular(0.0, 0.0, 1.0, 1.0, nx=5, ny=1)
+        tracar_linhas_fluxo(np.zeros((1, 5)), np.zeros((1, 5)), grade, [0.0], [0.0])
@@ -7,6 +7,7 @@ from interpoladores.modelo_potenciometrico import (
     calcular_gradiente_superficie,
     plotar_vetores_fluxo,
 )
+from utils.grid_utils import GradeRegular
 
 
 def gerar_grid(nx=5, ny=5, xmin=0, xmax=10, ymin=0, ymax=10):
@@ -167,3 +168,62 @@ def test_ortogonalidade_fluxo_equipotenciais():
         (flow_x**2 + flow_y**2) * (grad_x**2 + grad_y**2)
     )
     np.testing.assert_allclose(produto_escalar, -1.0, atol=1e-6)
+
+
+def test_modelo_potenciometrico_grade_regular():
+    """Testa o modelo com GradeRegular contra o meshgrid equivalente."""
+    grade = GradeRegular.de_limites(0, 10, 0, 5, nx=11, ny=6)
+    grid_x, grid_y = grade.meshgrid()
+    z = 3 * grid_x - 2 * grid_y
+
+    fx, fy = ModeloPotenciometrico(grade, None, z).calcular_fluxo()
+    fx_malha, fy_malha = ModeloPotenciometrico(grid_x, grid_y, z).calcular_fluxo()
+
+    np.testing.assert_allclose(fx, fx_malha)
+    np.testing.assert_allclose(fy, fy_malha)
+    np.testing.assert_allclose(fx, -3.0)
+
+    with pytest.raises(ValueError):
+        ModeloPotenciometrico(grade, None, z[:-1])
+    with pytest.raises(ValueError):
+        ModeloPotenciometrico(grade, grid_y, z)
+
+
+def test_fluxo_em_faixas_igual_grade_inteira(tmp_path):
+    """Testa o cálculo em faixas contra np.gradient na grade inteira, com saídas externas."""
+    grade = GradeRegular.de_limites(0, 30, 0, 20, nx=31, ny=23)
+    grid_x, grid_y = grade.meshgrid()
+    z = np.sin(grid_x / 4) * np.cos(grid_y / 3) + 0.01 * grid_x * grid_y
+    esperado_y, esperado_x = np.gradient(z, grade.dy, grade.dx)
+
+    # Orçamento de poucas linhas por faixa, incluindo faixas de uma única linha
+    for linhas in (1, 2, 5, 23):
+        memoria_mb = linhas * 3 * 31 * 8 / 1024**2
+        modelo = ModeloPotenciometrico(grade, None, z, max_memory_mb=memoria_mb)
+        grad_x, grad_y = modelo.calcular_gradiente()
+        np.testing.assert_array_equal(grad_x, esperado_x)
+        np.testing.assert_array_equal(grad_y, esperado_y)
+        flow_x, flow_y = modelo.calcular_fluxo()
+        np.testing.assert_array_equal(flow_x, -esperado_x)
+        np.testing.assert_array_equal(flow_y, -esperado_y)
+
+    # Saídas float32, em arrays fornecidos e mapeados em disco
+    modelo = ModeloPotenciometrico(grade, None, z, max_memory_mb=2 * 3 * 31 * 8 / 1024**2)
+    fx32, fy32 = modelo.calcular_fluxo(dtype=np.float32)
+    assert fx32.dtype == fy32.dtype == np.float32
+    np.testing.assert_array_equal(fx32, (-esperado_x).astype(np.float32))
+
+    saida = tuple(
+        np.lib.format.open_memmap(tmp_path / f"fluxo_{c}.npy", "w+", np.float32, z.shape)
+        for c in "xy"
+    )
+    flow_x, flow_y = modelo.calcular_fluxo(saida=saida)
+    assert flow_x is saida[0] and flow_y is saida[1]
+    saida[0].flush()
+    np.testing.assert_array_equal(np.load(tmp_path / "fluxo_x.npy"), fx32)
+    np.testing.assert_array_equal(flow_y, fy32)
+
+    with pytest.raises(ValueError, match="saida"):
+        modelo.calcular_gradiente(saida=(np.empty((23, 31)), np.empty((22, 31))))
+    with pytest.raises(ValueError, match="max_memory_mb"):
+        ModeloPotenciometrico(grade, None, z, max_memory_mb=0)
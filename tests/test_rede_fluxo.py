@@ -0,0 +1,125 @@
+import heapq
+
+import numpy as np  # noqa: F401
+import pytest
+
+from interpoladores.modelo_potenciometrico import ModeloPotenciometrico
+from interpoladores.rede_fluxo import calcular_rede_fluxo
+from utils.grid_utils import GradeRegular
+
+
+def priority_flood(z, saidas):
+    """Preenche as depressões pelo priority-flood clássico (fila de prioridade)."""
+    preenchida = z.copy()
+    visitadas = saidas | ~np.isfinite(z)
+    fila = [(z[i, j], i, j) for i, j in zip(*np.nonzero(saidas))]
+    heapq.heapify(fila)
+    while fila:
+        nivel, i, j = heapq.heappop(fila)
+        for a in range(max(i - 1, 0), min(i + 2, z.shape[0])):
+            for b in range(max(j - 1, 0), min(j + 2, z.shape[1])):
+                if not visitadas[a, b]:
+                    visitadas[a, b] = True
+                    preenchida[a, b] = max(z[a, b], nivel)
+                    heapq.heappush(fila, (preenchida[a, b], a, b))
+    return preenchida
+
+
+def saida_total(rede, acumulado):
+    """Soma o fluxo que deixa a rede (receptores -1 e poços)."""
+    fluxo = acumulado.ravel()[:, np.newaxis] * rede.proporcoes
+    return np.nansum(fluxo[rede.receptores < 0]) + np.sum(acumulado.ravel()[rede.celulas_pocos])
+
+
+@pytest.mark.parametrize("metodo", ["d8", "dinf"])
+def test_preenchimento_igual_priority_flood(metodo):
+    """Testa o preenchimento contra o priority-flood e a conservação na acumulação."""
+    rng = np.random.default_rng(1)
+    z = rng.random((30, 40))
+    z[5:9, 5:9] = np.nan
+    grade = GradeRegular(0.0, 0.0, 2.0, 1.0, nx=40, ny=30)
+
+    rede = calcular_rede_fluxo(z, grade, metodo=metodo, x_pocos=[40.0], y_pocos=[15.0])
+    saidas = np.zeros(z.shape, dtype=bool)
+    saidas[[0, -1]], saidas[:, [0, -1]] = True, True
+    saidas[4:10, 4:10] = True
+    saidas[15, 20] = True
+    saidas &= np.isfinite(z)
+    np.testing.assert_array_equal(rede.z_preenchida, priority_flood(z, saidas))
+    assert rede.z_preenchida[15, 20] == z[15, 20]
+
+    acumulado = rede.acumulacao()
+    assert np.all(np.isnan(acumulado[5:9, 5:9])) and np.nanmin(acumulado) >= 1.0
+    assert saida_total(rede, acumulado) == pytest.approx(np.isfinite(z).sum())
+    np.testing.assert_allclose(rede.proporcoes.sum(axis=1)[rede.receptores[:, 0] >= 0], 1.0)
+
+
+def test_direcoes_em_plano_e_depressao():
+    """Testa as direções em um plano inclinado e o escoamento de uma depressão."""
+    grade = GradeRegular(0.0, 0.0, 1.0, 1.0, nx=12, ny=8)
+    grid_x, grid_y = grade.meshgrid()
+
+    # Plano que desce para oeste: a acumulação cresce ao longo de cada linha
+    rede = calcular_rede_fluxo(grid_x, grade)
+    np.testing.assert_array_equal(rede.acumulacao()[3], np.arange(12, 0, -1))
+
+    # D-infinito reparte o fluxo de um plano com direção entre dois vizinhos
+    rede = calcular_rede_fluxo(grid_x + np.tan(np.pi / 8) * grid_y, grade, metodo="dinf")
+    np.testing.assert_allclose(rede.proporcoes[3 * 12 + 5], [0.5, 0.5])
+
+    # Bacia fechada por um anel alto com um único ponto de transbordamento em (4, 0)
+    z = 0.1 * np.hypot(grid_x - 5, grid_y - 4)
+    z[[0, -1]], z[:, [0, -1]] = 10.0, 10.0
+    z[4, 0] = 3.0
+    rede = calcular_rede_fluxo(z, grade)
+    np.testing.assert_array_equal(rede.z_preenchida[1:-1, 1:-1], 3.0)
+    assert rede.acumulacao()[4, 0] == z.size
+
+    # Sem preenchimento, o mínimo local é um sumidouro
+    rede = calcular_rede_fluxo(z, grade, preencher_depressoes=False)
+    assert rede.receptores[4 * 12 + 5, 0] == -1
+    assert rede.acumulacao()[4, 5] > 1
+
+
+@pytest.mark.parametrize("metodo", ["d8", "dinf"])
+def test_zonas_captura_pocos(metodo):
+    """Testa as zonas de captura de dois poços em um fluxo regional."""
+    grade = GradeRegular.de_limites(0, 100, 0, 60, nx=101, ny=61)
+    grid_x, grid_y = grade.meshgrid()
+    z = 0.05 * grid_x
+    for xp, yp in ((30.0, 20.0), (70.0, 40.0)):
+        z = z + 0.5 * np.log(np.hypot(grid_x - xp, grid_y - yp) + 1.0)
+    modelo = ModeloPotenciometrico(grade, None, z)
+
+    rede = modelo.rede_fluxo(metodo=metodo, x_pocos=[30.0, 70.0], y_pocos=[20.0, 40.0])
+    zonas = rede.zonas_captura()
+    assert zonas.dtype == np.int32
+    assert zonas[20, 30] == 0 and zonas[40, 70] == 1
+    assert zonas[20, 35] == 0 and zonas[40, 75] == 1 and zonas[0, 0] == -1
+    assert np.count_nonzero(zonas == 0) > 100 and np.count_nonzero(zonas == 1) > 100
+
+    # Na rede D8, o fluxo acumulado em cada poço é a área da sua zona de captura
+    if metodo == "d8":
+        acumulado = rede.acumulacao()
+        assert acumulado[20, 30] == np.count_nonzero(zonas == 0)
+        assert acumulado[40, 70] == np.count_nonzero(zonas == 1)
+    recarga = rede.acumulacao(np.full(z.shape, 0.5))
+    assert saida_total(rede, recarga) == pytest.approx(0.5 * z.size)
+
+
+def test_rede_fluxo_entrada_invalida():
+    """Testa a validação das entradas da rede de fluxo."""
+    grade = GradeRegular(0.0, 0.0, 1.0, 1.0, nx=5, ny=4)
+    z = np.arange(20.0).reshape(4, 5)
+    with pytest.raises(ValueError, match="Dimensões"):
+        calcular_rede_fluxo(z[:-1], grade)
+    with pytest.raises(ValueError, match="Método"):
+        calcular_rede_fluxo(z, grade, metodo="mfd")
+    with pytest.raises(ValueError, match="fora da grade"):
+        calcular_rede_fluxo(z, grade, x_pocos=[10.0], y_pocos=[1.0])
+    with pytest.raises(ValueError, match="sem dado"):
+        z_nan = z.copy()
+        z_nan[1, 1] = np.nan
+        calcular_rede_fluxo(z_nan, grade, x_pocos=[1.0], y_pocos=[1.0])
+    with pytest.raises(ValueError, match="pesos"):
+        calcular_rede_fluxo(z, grade).acumulacao(np.ones((2, 2)))
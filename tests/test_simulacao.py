@@ -0,0 +1,149 @@
+import numpy as np  # noqa: F401
+import pytest
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import cdist
+
+from interpoladores.config import KrigagemConfig
+from interpoladores.simulacao import SimulacaoGaussiana, TransformacaoNormal
+from utils.grid_utils import GradeRegular
+
+PARAMETROS_ESCORES = {"psill": 0.9, "range": 30.0, "nugget": 0.1}
+
+
+def gerar_amostras(n_pontos=80, seed=0):
+    """Gera amostras positivas e assimétricas sobre os nós de uma grade 0-100."""
+    rng = np.random.default_rng(seed)
+    x = rng.integers(0, 21, n_pontos) * 5.0
+    y = rng.integers(0, 21, n_pontos) * 5.0
+    _, unicos = np.unique(np.column_stack((x, y)), axis=0, return_index=True)
+    x, y = x[unicos], y[unicos]
+    z = np.exp(np.sin(x / 15) + np.cos(y / 20) + 0.2 * rng.standard_normal(len(x)))
+    return x, y, z
+
+
+def test_transformacao_normal():
+    """Testa a transformação em escores normais, empates e caudas."""
+    z = np.array([3.0, 1.0, 2.0, 2.0, 10.0])
+    transformacao = TransformacaoNormal.ajustar(z)
+    escores = transformacao.direta(z)
+
+    assert escores[1] < escores[2] == escores[3] < escores[0] < escores[4]
+    np.testing.assert_allclose(transformacao.inversa(escores), z)
+    assert transformacao.inversa(np.array([-9.0, 9.0])).tolist() == [1.0, 10.0]
+
+    com_caudas = TransformacaoNormal.ajustar(z, zmin=0.0, zmax=20.0)
+    np.testing.assert_allclose(com_caudas.inversa(com_caudas.direta(z)), z)
+    assert com_caudas.inversa(np.array([-5.0, 5.0])).tolist() == [0.0, 20.0]
+    with pytest.raises(ValueError, match="zmin"):
+        TransformacaoNormal.ajustar(z, zmin=1.5)
+
+
+def test_simulacao_condicionada_e_reprodutivel(tmp_path):
+    """Testa o condicionamento às amostras e a reprodutibilidade entre processos."""
+    x, y, z = gerar_amostras()
+    grade = GradeRegular.de_limites(0, 100, 0, 100, nx=21, ny=21)
+    config = KrigagemConfig(variogram_model_parameters=PARAMETROS_ESCORES, n_neighbors=12)
+    sgs = SimulacaoGaussiana(x, y, z, config=config).ajustar()
+
+    realizacoes = sgs.simular(grade, n_realizacoes=5, seed=3)
+    assert realizacoes.shape == (5, 21, 21)
+
+    # As amostras estão sobre nós da grade: todas as realizações as reproduzem
+    linhas, colunas = (y / 5).astype(int), (x / 5).astype(int)
+    for realizacao in realizacoes:
+        np.testing.assert_allclose(realizacao[linhas, colunas], z)
+    assert realizacoes.min() >= z.min() and realizacoes.max() <= z.max()
+    assert not np.allclose(realizacoes[0], realizacoes[1])
+
+    # A mesma semente gera as mesmas realizações, com qualquer divisão em lotes
+    paralelo = sgs.simular(grade, n_realizacoes=5, seed=3, n_jobs=2)
+    np.testing.assert_array_equal(paralelo, realizacoes)
+    caminho = tmp_path / "realizacoes.npy"
+    mapeadas = sgs.simular(grade, n_realizacoes=5, seed=3, arquivo_saida=str(caminho))
+    assert isinstance(mapeadas, np.memmap)
+    np.testing.assert_array_equal(np.load(caminho), realizacoes)
+
+
+@pytest.mark.parametrize("repetida", [False, True])
+@pytest.mark.parametrize("parametros", [None, {"psill": 1.0, "range": 30.0, "nugget": 0.0}])
+def test_simulacao_amostras_sobre_nos_sem_pepita(parametros, repetida):
+    """Testa amostras sobre nós e repetidas com o variograma ajustado ou sem pepita."""
+    x, y, z = gerar_amostras()
+    n_amostras = len(x)
+    if repetida:
+        # Amostra repetida fora dos nós, vizinha de várias células
+        x, y, z = np.append(x, [2.5, 2.5]), np.append(y, [2.5, 2.5]), np.append(z, [1.0, 1.0])
+    grade = GradeRegular.de_limites(0, 100, 0, 100, nx=21, ny=21)
+    config = KrigagemConfig(variogram_model_parameters=parametros, n_neighbors=12)
+    sgs = SimulacaoGaussiana(x, y, z, config=config).ajustar()
+
+    realizacoes = sgs.simular(grade, n_realizacoes=2, seed=0)
+
+    assert np.all(np.isfinite(realizacoes))
+    linhas, colunas = (y[:n_amostras] / 5).astype(int), (x[:n_amostras] / 5).astype(int)
+    for realizacao in realizacoes:
+        np.testing.assert_allclose(realizacao[linhas, colunas], z[:n_amostras])
+
+
+def test_simulacao_reproduz_variograma():
+    """Testa a média, a variância e o variograma das realizações não condicionadas."""
+    x, y, z = np.array([0.0, 100.0, 0.0]), np.array([0.0, 0.0, 100.0]), np.array([-1.0, 0, 1])
+    grid_x, grid_y = np.meshgrid(np.linspace(0, 100, 41), np.linspace(0, 100, 41))
+    config = KrigagemConfig(variogram_model_parameters=PARAMETROS_ESCORES, n_neighbors=16)
+    sgs = SimulacaoGaussiana(x, y, z, config=config, zmin=-10.0, zmax=10.0).ajustar()
+
+    escores = sgs.transformacao.direta(sgs.simular(grid_x, grid_y, n_realizacoes=30, seed=1))
+    assert abs(escores.mean()) < 0.15
+    assert escores.std() == pytest.approx(1.0, abs=0.1)
+
+    for passo in (2, 6):
+        semivariancia = 0.5 * np.mean((escores[:, :, passo:] - escores[:, :, :-passo]) ** 2)
+        esperado = sgs.variograma.gamma(np.array([passo * 2.5]))[0]
+        assert semivariancia == pytest.approx(esperado, rel=0.15)
+
+
+@pytest.mark.parametrize("raio", [np.inf, 12.0])
+def test_simulacao_vizinhos_equivalem_busca_direta(raio, monkeypatch):
+    """Testa a busca nas árvores de prefixos do caminho contra as distâncias diretas."""
+    import interpoladores.simulacao as simulacao
+
+    # Busca direta curta para que a maior parte do caminho use as árvores
+    monkeypatch.setattr(simulacao, "_CELULAS_BUSCA_DIRETA", 64)
+    rng = np.random.default_rng(5)
+    grid_x, grid_y = np.meshgrid(np.arange(50.0), np.arange(40.0))
+    celulas = np.column_stack((grid_x.ravel(), grid_y.ravel()))[rng.permutation(2000)]
+    amostras = rng.random((10, 2)) * 50
+    n_amostras, k, etapa = len(amostras), 8, 32
+
+    arvore_amostras, arvore_celulas = cKDTree(amostras), None
+    for inicio in range(0, len(celulas), etapa):
+        fim = min(inicio + etapa, len(celulas))
+        arvore_celulas = simulacao._arvore_celulas(arvore_celulas, celulas, fim)
+        distancias, indices = simulacao._vizinhos_etapa(
+            arvore_amostras, arvore_celulas, celulas, n_amostras, inicio, fim, k, raio
+        )
+
+        # Referência: todas as amostras e as células anteriores no caminho
+        d = cdist(celulas[inicio:fim], np.vstack((amostras, celulas[:fim])))
+        anteriores = np.arange(fim) < np.arange(inicio, fim)[:, np.newaxis]
+        d[:, n_amostras:] = np.where(anteriores, d[:, n_amostras:], np.inf)
+        d[d > raio] = np.inf
+        np.testing.assert_array_equal(np.sort(distancias, axis=1), np.sort(d, axis=1)[:, :k])
+        validos = np.isfinite(distancias)
+        np.testing.assert_array_equal(
+            np.take_along_axis(d, indices, axis=1)[validos], distancias[validos]
+        )
+
+
+def test_simulacao_entrada_invalida():
+    """Testa a validação do modelo de variograma, do ajuste e das realizações."""
+    x, y, z = gerar_amostras(n_pontos=30)
+    grade = GradeRegular.de_limites(0, 100, 0, 100, nx=5, ny=5)
+    with pytest.raises(ValueError, match="patamar"):
+        SimulacaoGaussiana(x, y, z, config=KrigagemConfig(modelo_variograma="linear")).ajustar()
+    with pytest.raises(RuntimeError, match="ajustar"):
+        SimulacaoGaussiana(x, y, z).simular(grade)
+    with pytest.raises(ValueError, match="n_realizacoes"):
+        SimulacaoGaussiana(x, y, z).ajustar().simular(grade, n_realizacoes=0)
+    with pytest.raises(ValueError, match="Dimensões"):
+        SimulacaoGaussiana(x, y, z[:-1])
@@ -0,0 +1,172 @@
+import numpy as np  # noqa: F401
+import pytest
+
+from interpoladores.config import IDWConfig, KrigagemConfig
+from interpoladores.idw import IDW
+from interpoladores.krigagem import Krigagem
+from interpoladores.validacao_cruzada import (
+    selecionar_modelo_variograma,
+    validacao_cruzada_idw,
+    validacao_cruzada_krigagem,
+)
+
+
+def gerar_amostras(n_pontos=40):
+    """Gera pontos aleatórios com uma superfície suave."""
+    np.random.seed(7)
+    pontos = np.random.rand(n_pontos, 2) * 50
+    valores = np.sin(pontos[:, 0] / 10) + 0.05 * pontos[:, 1]
+    return pontos, valores
+
+
+def loo_direto(pontos, valores, config):
+    """Calcula o RMSE leave-one-out com uma interpolação IDW por ponto."""
+    erros = []
+    for i in range(len(pontos)):
+        outros = np.arange(len(pontos)) != i
+        grid_x, grid_y = np.array([[pontos[i, 0]]]), np.array([[pontos[i, 1]]])
+        try:
+            z = IDW(config).interpolar(pontos[outros], valores[outros], grid_x, grid_y)
+        except ValueError:
+            # Ponto sem vizinhos dentro de max_distance: fora da validação
+            continue
+        erros.append(z[0, 0] - valores[i])
+    return np.sqrt(np.mean(np.square(erros)))
+
+
+@pytest.mark.parametrize("max_distance", [None, 12.0])
+def test_validacao_cruzada_equivale_loo_direto(max_distance):
+    """Testa os erros vetorizados contra interpolações leave-one-out individuais."""
+    pontos, valores = gerar_amostras()
+    powers = [1.0, 2.0, 3.5]
+    n_neighbors = [3, 8, None]
+
+    resultado = validacao_cruzada_idw(
+        pontos, valores, powers, n_neighbors, config=IDWConfig(max_distance=max_distance)
+    )
+
+    assert resultado.rmse.shape == (3, 3)
+    assert resultado.mae.shape == (3, 3)
+    for i, power in enumerate(powers):
+        for j, k in enumerate(n_neighbors):
+            config = IDWConfig(power=power, n_neighbors=k, max_distance=max_distance)
+            rmse = loo_direto(pontos, valores, config)
+            np.testing.assert_allclose(resultado.rmse[i, j], rmse, rtol=1e-10)
+
+
+def test_validacao_cruzada_melhor_config():
+    """Testa a escolha da melhor configuração e a cópia da configuração base."""
+    pontos, valores = gerar_amostras()
+    base = IDWConfig(default_value=-1.0, max_memory_mb=10.0)
+
+    resultado = validacao_cruzada_idw(pontos, valores, [1, 2, 3], [4, 8], config=base)
+    i, j = np.unravel_index(np.argmin(resultado.rmse), resultado.rmse.shape)
+    assert resultado.melhor_config.power == resultado.powers[i]
+    assert resultado.melhor_config.n_neighbors == resultado.n_neighbors[j]
+    assert resultado.melhor_config.default_value == -1.0
+    assert resultado.melhor_config.max_memory_mb == 10.0
+
+    resultado_mae = validacao_cruzada_idw(pontos, valores, [1, 2, 3], [4, 8], criterio="mae")
+    i, j = np.unravel_index(np.argmin(resultado_mae.mae), resultado_mae.mae.shape)
+    assert resultado_mae.melhor_config.power == resultado_mae.powers[i]
+
+
+def test_validacao_cruzada_pontos_repetidos():
+    """Testa pontos com coordenadas repetidas (o próprio ponto pode não ser o primeiro)."""
+    pontos, valores = gerar_amostras(n_pontos=10)
+    pontos = np.vstack((pontos, pontos[:3]))
+    valores = np.concatenate((valores, valores[:3] + 1.0))
+
+    resultado = validacao_cruzada_idw(pontos, valores, [2.0], [3])
+    assert np.all(np.isfinite(resultado.rmse))
+    assert resultado.n_validos[0, 0] == len(pontos)
+
+
+def test_validacao_cruzada_entrada_invalida():
+    """Testa a validação das entradas."""
+    pontos, valores = gerar_amostras(n_pontos=10)
+
+    with pytest.raises(ValueError):
+        validacao_cruzada_idw(pontos, valores[:-1])
+    with pytest.raises(ValueError):
+        validacao_cruzada_idw(pontos, valores, criterio="r2")
+    with pytest.raises(ValueError):
+        validacao_cruzada_idw(pontos, valores, n_neighbors=[0])
+    with pytest.raises(ValueError, match="Nenhum ponto tem vizinhos"):
+        validacao_cruzada_idw(pontos, valores, config=IDWConfig(max_distance=1e-6))
+
+
+def test_validacao_cruzada_krigagem_equivale_reajustes():
+    """Testa o atalho de Dubrule contra Krigagens com um ponto removido."""
+    pontos, valores = gerar_amostras(n_pontos=30)
+    x, y = pontos[:, 0], pontos[:, 1]
+    config = KrigagemConfig(
+        modelo_variograma="exponential",
+        variogram_model_parameters={"psill": 0.5, "range": 20.0, "nugget": 0.01},
+        enable_statistics=True,
+    )
+
+    resultado = validacao_cruzada_krigagem(x, y, valores, config)
+
+    for i in (0, 11, 29):
+        outros = np.arange(len(x)) != i
+        krig = Krigagem(x[outros], y[outros], valores[outros], config=config)
+        z, ss = krig.interpolar(np.array([x[i]]), np.array([y[i]]))
+        assert resultado.residuos[i] == pytest.approx(valores[i] - z[0, 0], rel=1e-7)
+        assert resultado.variancias[i] == pytest.approx(ss[0, 0], rel=1e-7)
+
+    np.testing.assert_allclose(
+        resultado.erros_padronizados, resultado.residuos / np.sqrt(resultado.variancias)
+    )
+    assert resultado.rmse == pytest.approx(np.sqrt(np.mean(resultado.residuos**2)))
+
+
+def test_selecionar_modelo_variograma():
+    """Testa a ordenação dos modelos, a melhor configuração e a execução paralela."""
+    pontos, valores = gerar_amostras(n_pontos=40)
+    x, y = pontos[:, 0], pontos[:, 1]
+    modelos = ["spherical", "exponential", "linear", "inexistente"]
+
+    selecao = selecionar_modelo_variograma(x, y, valores, modelos=modelos)
+
+    # O modelo inválido é descartado e os demais são ordenados pelo critério
+    assert sorted(selecao.modelos) == ["exponential", "linear", "spherical"]
+    desvios = [abs(r.erro_quadratico_padronizado - 1) for r in selecao.resultados]
+    assert desvios == sorted(desvios)
+    melhor = selecao.resultados[0].variograma
+    assert selecao.melhor_config.modelo_variograma == melhor.modelo
+    assert selecao.melhor_config.variogram_model_parameters == melhor.como_dict()
+    krig = Krigagem(x, y, valores, config=selecao.melhor_config).ajustar()
+    assert krig.variograma.parametros == pytest.approx(melhor.parametros)
+
+    por_rmse = selecionar_modelo_variograma(x, y, valores, modelos=modelos[:3], criterio="rmse")
+    rmses = [r.rmse for r in por_rmse.resultados]
+    assert rmses == sorted(rmses)
+
+    paralelo = selecionar_modelo_variograma(x, y, valores, modelos=modelos, n_jobs=2)
+    assert paralelo.modelos == selecao.modelos
+
+
+def test_selecionar_modelo_variograma_limita_processos(monkeypatch):
+    """Testa que n_jobs <= 0 não abre mais processos que candidatos."""
+    import interpoladores.validacao_cruzada as validacao_cruzada
+
+    def pool_proibido(*args, **kwargs):
+        raise AssertionError("um único candidato não deve abrir processos")
+
+    monkeypatch.setattr(validacao_cruzada, "ProcessPoolExecutor", pool_proibido)
+    pontos, valores = gerar_amostras()
+    x, y = pontos[:, 0], pontos[:, 1]
+
+    selecao = selecionar_modelo_variograma(x, y, valores, modelos=["spherical"], n_jobs=-1)
+    assert selecao.modelos == ["spherical"]
+
+
+def test_selecionar_modelo_variograma_entrada_invalida():
+    """Testa a validação das entradas da seleção de variograma."""
+    pontos, valores = gerar_amostras()
+    x, y = pontos[:, 0], pontos[:, 1]
+    with pytest.raises(ValueError, match="Critério"):
+        selecionar_modelo_variograma(x, y, valores, criterio="r2")
+    with pytest.raises(ValueError, match="Nenhum modelo"):
+        selecionar_modelo_variograma(x, y, valores, modelos=["inexistente"])
@@ -0,0 +1,125 @@
+import numpy as np  # noqa: F401
+import pytest
+from scipy.spatial.distance import pdist
+
+from interpoladores.config import KrigagemConfig
+from interpoladores.krigagem import Krigagem, VariogramaAjustado
+from interpoladores.variograma import VariogramaExperimental, calcular_variograma_experimental
+
+
+def gerar_amostras(n_pontos=300, seed=3):
+    """Gera pontos aleatórios com uma superfície suave e ruído."""
+    rng = np.random.default_rng(seed)
+    x, y = rng.random(n_pontos) * 100, rng.random(n_pontos) * 100
+    z = np.sin(x / 15) + np.cos(y / 20) + 0.05 * rng.standard_normal(n_pontos)
+    return x, y, z
+
+
+def variograma_direto(x, y, z, nlags, max_lag):
+    """Calcula o variograma experimental com todos os pares (pdist)."""
+    pontos = np.column_stack((x, y))
+    d = pdist(pontos)
+    g = 0.5 * pdist(z[:, np.newaxis], metric="sqeuclidean")
+    manter = d <= max_lag
+    classes = np.minimum((d[manter] * nlags / max_lag).astype(int), nlags - 1)
+    n = np.bincount(classes, minlength=nlags)
+    return (
+        np.bincount(classes, weights=d[manter], minlength=nlags) / n,
+        np.bincount(classes, weights=g[manter], minlength=nlags) / n,
+        n,
+    )
+
+
+def test_variograma_equivale_todos_os_pares(monkeypatch):
+    """Testa a busca de pares em blocos contra o cálculo com todos os pares."""
+    import interpoladores.variograma as variograma
+
+    # Blocos pequenos para exercitar a acumulação entre blocos
+    monkeypatch.setattr(variograma, "_PARES_POR_BLOCO", 500)
+    x, y, z = gerar_amostras()
+
+    experimental = calcular_variograma_experimental(x, y, z, nlags=8, max_lag=40.0)
+    lags, semivariancias, n_pares = variograma_direto(x, y, z, 8, 40.0)
+
+    np.testing.assert_array_equal(experimental.n_pares, n_pares)
+    np.testing.assert_allclose(experimental.lags, lags)
+    np.testing.assert_allclose(experimental.semivariancias, semivariancias)
+    assert experimental.direcoes is None
+
+
+def test_variograma_pares_aleatorios():
+    """Testa a subamostragem aleatória de pares."""
+    x, y, z = gerar_amostras(n_pontos=600)
+    completo = calcular_variograma_experimental(x, y, z, nlags=6, max_lag=50.0)
+
+    amostrado = calcular_variograma_experimental(
+        x, y, z, nlags=6, max_lag=50.0, max_pares=60000, seed=1
+    )
+    repetido = calcular_variograma_experimental(
+        x, y, z, nlags=6, max_lag=50.0, max_pares=60000, seed=1
+    )
+
+    assert amostrado.n_pares.sum() <= 60000
+    np.testing.assert_array_equal(amostrado.semivariancias, repetido.semivariancias)
+    np.testing.assert_allclose(amostrado.semivariancias, completo.semivariancias, rtol=0.1)
+
+
+def test_variograma_direcional_e_anisotropia():
+    """Testa os variogramas direcionais e a anisotropia na configuração da Krigagem."""
+    rng = np.random.default_rng(5)
+    x, y = rng.random(800) * 100, rng.random(800) * 100
+    # Variação rápida ao longo de X e lenta ao longo de Y: maior alcance em 90°
+    z = np.sin(x / 6) + np.sin(y / 30)
+
+    experimental = calcular_variograma_experimental(
+        x, y, z, nlags=10, max_lag=30.0, direcoes=[0, 90], tolerancia_angular=15
+    )
+
+    assert experimental.semivariancias.shape == (2, 10)
+    assert experimental.semivariancias[0, 2] > experimental.semivariancias[1, 2]
+
+    config = experimental.config_krigagem("gaussian")
+    assert config.anisotropy_angle == 90.0
+    assert config.anisotropy_ratio > 1.0
+
+    with pytest.raises(ValueError, match="direcao"):
+        experimental.ajustar("gaussian")
+    with pytest.raises(ValueError, match="alcance"):
+        experimental.config_krigagem("linear")
+
+
+def test_variograma_ajuste_alimenta_krigagem():
+    """Testa o ajuste do modelo e o uso dos parâmetros pela Krigagem."""
+    # Semivariâncias de um modelo conhecido: o ajuste recupera os parâmetros
+    modelo = VariogramaAjustado("spherical", [0.8, 30.0, 0.05])
+    lags = np.linspace(2.5, 57.5, 12)
+    conhecido = VariogramaExperimental(lags, modelo.gamma(lags), np.full(12, 100))
+    assert conhecido.ajustar("spherical").parametros == pytest.approx(modelo.parametros, rel=1e-4)
+
+    # Os parâmetros ajustados são usados sem o variograma experimental do PyKrige
+    x, y, z = gerar_amostras(n_pontos=400)
+    experimental = calcular_variograma_experimental(x, y, z, nlags=12, max_lag=60.0)
+    variograma = experimental.ajustar("spherical")
+    config = experimental.config_krigagem("spherical", KrigagemConfig(enable_statistics=True))
+    krig = Krigagem(x, y, z, config=config).ajustar()
+    assert krig._ok is None
+    assert krig.variograma == VariogramaAjustado("spherical", variograma.parametros)
+
+    eixo = np.linspace(0, 100, 6)
+    z_interp, ss = krig.prever(eixo, eixo)
+    assert np.all(np.isfinite(z_interp)) and np.all(ss >= 0)
+
+
+def test_variograma_entrada_invalida():
+    """Testa a validação das entradas do variograma experimental."""
+    x, y, z = gerar_amostras(n_pontos=20)
+    with pytest.raises(ValueError):
+        calcular_variograma_experimental(x, y, z[:-1])
+    with pytest.raises(ValueError, match="nlags"):
+        calcular_variograma_experimental(x, y, z, nlags=0)
+    with pytest.raises(ValueError, match="max_lag"):
+        calcular_variograma_experimental(x, y, z, max_lag=-1.0)
+    with pytest.raises(ValueError, match="tolerancia"):
+        calcular_variograma_experimental(x, y, z, direcoes=[0], tolerancia_angular=120)
+    with pytest.raises(ValueError, match="Modelo"):
+        calcular_variograma_experimental(x, y, z).ajustar("cubico")
@@ -4,15 +4,183 @@ Módulo utilitário para geração de grades espaciais.
 Fornece funções auxiliares para criar grades regulares de coordenadas,
 úteis para interpolação e visualização de superfícies.
 
+Classes:
+    - GradeRegular: Descrição compacta (origem, resolução, formato) de uma grade regular.
+
 Funções:
     - criar_grade: Cria uma grade regular 2D a partir dos limites e resolução.
+    - criar_grade_regular: Cria o meshgrid de uma grade com nx x ny células.
+    - coordenadas_grade: Resolve uma grade (GradeRegular ou meshgrid) em formato e
+      gerador de coordenadas por bloco de células.
 
 Dependências:
     - numpy
 """
 
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple, Union
+
 import numpy as np  # noqa: F401
 
+# Seleção de células de uma grade achatada: fatia, índices ou máscara booleana
+Celulas = Union[slice, np.ndarray]
+
+
+@dataclass(frozen=True)
+class GradeRegular:
+    """
+    Grade regular descrita por origem, resolução e formato.
+
+    A célula (i, j) (linha i, coluna j) tem coordenadas (x0 + j * dx, y0 + i * dy),
+    na mesma ordem de `np.meshgrid(eixo_x, eixo_y)`. As coordenadas são geradas sob
+    demanda por bloco de células, sem materializar o meshgrid completo: uma grade
+    de 10k x 10k ocupa alguns bytes em vez de 2 x 800 MB.
+
+    Args:
+        x0 (float): Coordenada X da primeira coluna.
+        y0 (float): Coordenada Y da primeira linha.
+        dx (float): Espaçamento entre colunas.
+        dy (float): Espaçamento entre linhas.
+        nx (int): Número de colunas.
+        ny (int): Número de linhas.
+
+    Example:
+        >>> grade = GradeRegular(x0=0.0, y0=0.0, dx=10.0, dy=10.0, nx=1000, ny=800)
+        >>> grade.shape
+        (800, 1000)
+        >>> z = IDW(config).interpolar(pontos, valores, grade)
+    """
+
+    x0: float
+    y0: float
+    dx: float
+    dy: float
+    nx: int
+    ny: int
+
+    def __post_init__(self):
+        """
+        Validação dos parâmetros após inicialização.
+        """
+        if self.nx < 1 or self.ny < 1:
+            raise ValueError(f"Grade deve ter nx, ny >= 1, mas tem nx={self.nx}, ny={self.ny}")
+        if self.dx == 0 or self.dy == 0:
+            raise ValueError(
+                f"Espaçamentos devem ser não nulos, mas são dx={self.dx}, dy={self.dy}"
+            )
+
+    @classmethod
+    def de_limites(
+        cls, xmin: float, xmax: float, ymin: float, ymax: float, nx: int, ny: int
+    ) -> "GradeRegular":
+        """
+        Cria a grade com nx x ny células cobrindo os limites (inclusive), como `np.linspace`.
+
+        Args:
+            xmin (float): Valor mínimo no eixo X.
+            xmax (float): Valor máximo no eixo X.
+            ymin (float): Valor mínimo no eixo Y.
+            ymax (float): Valor máximo no eixo Y.
+            nx (int): Número de colunas.
+            ny (int): Número de linhas.
+
+        Returns:
+            GradeRegular: Grade regular correspondente.
+        """
+        dx = (xmax - xmin) / (nx - 1) if nx > 1 else 1.0
+        dy = (ymax - ymin) / (ny - 1) if ny > 1 else 1.0
+        return cls(float(xmin), float(ymin), float(dx), float(dy), int(nx), int(ny))
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Formato (ny, nx) da grade, igual ao do meshgrid correspondente."""
+        return (self.ny, self.nx)
+
+    @property
+    def size(self) -> int:
+        """Número total de células."""
+        return self.nx * self.ny
+
+    def eixo_x(self) -> np.ndarray:
+        """Coordenadas X das colunas, shape (nx,)."""
+        return self.x0 + self.dx * np.arange(self.nx)
+
+    def eixo_y(self) -> np.ndarray:
+        """Coordenadas Y das linhas, shape (ny,)."""
+        return self.y0 + self.dy * np.arange(self.ny)
+
+    def meshgrid(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Materializa o meshgrid da grade (caminho de compatibilidade).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Arrays (ny, nx) com as coordenadas X e Y.
+        """
+        return np.meshgrid(self.eixo_x(), self.eixo_y())
+
+    def coordenadas(self, celulas: Celulas = slice(None)) -> np.ndarray:
+        """
+        Gera as coordenadas de um conjunto de células da grade achatada.
+
+        Args:
+            celulas (slice or np.ndarray, optional): Fatia, índices ou máscara booleana
+                sobre as células em ordem achatada (linha a linha). Default é a grade toda.
+
+        Returns:
+            np.ndarray: Array (B, 2) com as coordenadas (x, y) das células.
+        """
+        if isinstance(celulas, slice):
+            indices = np.arange(*celulas.indices(self.size))
+        else:
+            indices = np.asarray(celulas)
+            if indices.dtype == bool:
+                indices = np.flatnonzero(indices)
+        linha, coluna = np.divmod(indices, self.nx)
+        return np.column_stack((self.x0 + self.dx * coluna, self.y0 + self.dy * linha))
+
+
+def coordenadas_grade(
+    grid_x: Union[np.ndarray, GradeRegular], grid_y: Optional[np.ndarray] = None
+) -> Tuple[Tuple[int, ...], Callable[[Celulas], np.ndarray]]:
+    """
+    Resolve uma grade em formato e gerador de coordenadas por bloco de células.
+
+    Aceita uma `GradeRegular` (com `grid_y` None) ou o par de meshgrids; neste caso
+    as coordenadas de cada bloco são lidas das visões achatadas dos meshgrids, sem
+    empilhar a grade inteira.
+
+    Args:
+        grid_x (np.ndarray or GradeRegular): Meshgrid das coordenadas X ou grade regular.
+        grid_y (np.ndarray, optional): Meshgrid das coordenadas Y. Default é None.
+
+    Returns:
+        Tuple[Tuple[int, ...], Callable]:
+            - shape: Formato da grade.
+            - coordenadas: Função `coordenadas(celulas)` que retorna o array (B, 2)
+              com as coordenadas de uma fatia, índices ou máscara de células.
+
+    Raises:
+        ValueError: Se as grades X e Y tiverem formatos diferentes, ou se `grid_y`
+            for informado junto com uma GradeRegular.
+    """
+    if isinstance(grid_x, GradeRegular):
+        if grid_y is not None:
+            raise ValueError("grid_y deve ser None quando grid_x é uma GradeRegular")
+        return grid_x.shape, grid_x.coordenadas
+
+    if grid_y is None or np.shape(grid_x) != np.shape(grid_y):
+        raise ValueError(
+            f"Grades X e Y devem ter o mesmo formato, mas têm formatos "
+            f"{np.shape(grid_x)} e {np.shape(grid_y)}"
+        )
+    x = np.ravel(grid_x)
+    y = np.ravel(grid_y)
+
+    def coordenadas(celulas: Celulas = slice(None)) -> np.ndarray:
+        return np.column_stack((x[celulas], y[celulas]))
+
+    return np.shape(grid_x), coordenadas
+
 
 def criar_grade(xmin: float, xmax: float, ymin: float, ymax: float, resolucao: float):
     """
@@ -38,3 +206,26 @@ def criar_grade(xmin: float, xmax: float, ymin: float, ymax: float, resolucao: f
     gridx = np.arange(xmin, xmax, resolucao)
     gridy = np.arange(ymin, ymax, resolucao)
     return gridx, gridy
+
+
+def criar_grade_regular(
+    xmin: float, xmax: float, ymin: float, ymax: float, nx: int, ny: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cria o meshgrid de uma grade com nx x ny células cobrindo os limites (inclusive).
+
+    Para grades grandes, prefira passar `GradeRegular.de_limites(...)` diretamente
+    aos interpoladores, que geram as coordenadas sob demanda.
+
+    Args:
+        xmin (float): Valor mínimo no eixo X.
+        xmax (float): Valor máximo no eixo X.
+        ymin (float): Valor mínimo no eixo Y.
+        ymax (float): Valor máximo no eixo Y.
+        nx (int): Número de colunas.
+        ny (int): Número de linhas.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Meshgrids (ny, nx) das coordenadas X e Y.
+    """
+    return GradeRegular.de_limites(xmin, xmax, ymin, ymax, nx, ny).meshgrid()